@@ -1,111 +1,87 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import os
-
-# 定义分类关键词（这些行是分类标题）
-CATEGORY_KEYWORDS = [
-    '数据结构和算法',
-    '开发语言',
-    '前端框架',
-    '性能优化',
-    'debug能力',
-    '前端监控',
-    '跨端经验',
-    '工程化/架构设计',
-    '网络协议',
-    'web安全'
-]
+import argparse
+import re
+import time
+
+from classification import load_categories
+from corpus import load_corpus
+from incremental import incremental_match_questions
+from matcher import match_corpus
+from parallel import parallel_match_questions
+from profiling import PROFILER, add_profile_argument, count_matcher_hits
+from records import add_format_arguments, hit_record, write_records
+from suffix_array import load_suffix_array, match_questions as sa_match_questions
+from synonyms import canonical
+from watch import watch
 
 # 读取分类文档
 def parse_classification_doc():
-    with open('分类整理文档', 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+    return load_categories()
 
-    categories = {}
-    current_category = None
-
-    for line in lines:
-        line = line.strip()
-
-        if not line:
-            continue
-
-        # 检查是否是分类标题
-        is_category = any(keyword in line for keyword in CATEGORY_KEYWORDS)
-
-        if is_category:
-            # 提取分类名称（去掉可能的括号说明）
-            category_name = line.split('(')[0].split('（')[0].strip()
-            current_category = category_name
-            categories[current_category] = []
-        elif current_category:
-            # 这是一个问题
-            categories[current_category].append(line)
-
-    return categories
-
-# 读取所有MD文件
-def read_md_files():
-    md_files = {}
-    exclude = ['README.md', '图片问题完整清单.md', '质量检查报告.md']
-    files = [f for f in os.listdir('.') if f.endswith('.md') and f not in exclude]
-
-    for filename in files:
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-            md_files[filename] = content
-
-    return md_files
-
-# 智能匹配问题
-def check_question_in_content(question, content):
-    # 清理问题文本
-    q = question.strip()
+# 生成问题的候选匹配关键串（规整后的文本）：[(匹配方式, 关键串), ...]
+def labelled_keys(question):
+    # 规整问题文本（全角标点已折叠为半角）
+    q = canonical(question).strip()
 
     # 移除问号
-    q_no_mark = q.replace('?', '').replace('？', '')
+    q_no_mark = q.replace('?', '')
 
     # 移除括号说明
-    import re
-    q_clean = re.sub(r'[（(].*?[)）]', '', q_no_mark).strip()
+    q_clean = re.sub(r'\(.*?\)', '', q_no_mark).strip()
 
     # 1. 完整匹配
-    if q in content or q_no_mark in content or q_clean in content:
-        return True
+    keys = [('完整', q), ('去问号', q_no_mark), ('去括号', q_clean)]
 
     # 2. 关键词匹配（取前15-20个字符）
     if len(q_clean) > 15:
-        key = q_clean[:20]
-        if key in content:
-            return True
+        keys.append(('前20字', q_clean[:20]))
+        keys.append(('前15字', q_clean[:15]))
 
-        key = q_clean[:15]
-        if key in content:
-            return True
-
-    # 3. 提取核心关键词（逗号或顿号前的部分）
-    core_parts = re.split(r'[，,、]', q_clean)
+    # 3. 提取核心关键词（逗号或顿号前的部分，顿号已折叠为逗号）
+    core_parts = q_clean.split(',')
     if core_parts:
         core = core_parts[0].strip()
-        if len(core) > 5 and core in content:
-            return True
+        if len(core) > 5:
+            keys.append(('核心词', core))
+
+    return keys
+
+def question_keys(question):
+    return [key for _, key in labelled_keys(question)]
 
-    return False
+# 智能匹配问题
+def check_question_in_content(question, content):
+    content = canonical(content)
+    return any(key in content for key in question_keys(question))
+
+# 按选择的方式匹配所有问题，返回 (结果, 增量模式的 engine)
+def match_all(all_questions, md_files, incremental=False, engine=None, jobs=1, suffix_array=False):
+    if incremental:
+        # 增量模式：只重新扫描变化的文件和新增的关键串
+        return incremental_match_questions(all_questions, md_files, question_keys, 'accurate_check', engine=engine)
+    if jobs != 1:
+        # 并行模式：语料按文件切分给多个进程扫描
+        return parallel_match_questions(all_questions, md_files, question_keys, jobs), None
+    if suffix_array:
+        # 后缀数组模式：每个关键串两次二分查找，不扫描全文
+        return sa_match_questions(all_questions, load_suffix_array(md_files), question_keys), None
+    return match_corpus(all_questions, md_files, question_keys), None
 
 # 主函数
-def main():
+def main(incremental=False, engine=None, jobs=1, corpus=None, suffix_array=False):
     print("=" * 100)
     print(" " * 35 + "📋 QPON面试题库覆盖检查")
     print("=" * 100)
     print()
 
     # 解析分类文档
-    categories = parse_classification_doc()
+    with PROFILER.phase('parse_categories'):
+        categories = parse_classification_doc()
 
-    # 读取MD文件
-    md_files = read_md_files()
-    all_content = '\n'.join(md_files.values())
+    # 读取MD文件（可以传入已加载的语料）
+    md_files = corpus if corpus is not None else load_corpus()
 
     # 统计
     total_questions = sum(len(qs) for qs in categories.values())
@@ -118,92 +94,162 @@ def main():
     print(f"{'分类':<25} {'问题数':>8} {'已覆盖':>8} {'未覆盖':>8} {'覆盖率':>10} {'状态':>8}")
     print("-" * 100)
 
-    for category, questions in categories.items():
-        covered = 0
-        uncovered = []
-
-        for q in questions:
-            if check_question_in_content(q, all_content):
-                covered += 1
-            else:
-                uncovered.append(q)
-
-        total = len(questions)
-        rate = (covered / total * 100) if total > 0 else 0
-        covered_count += covered
-
-        # 状态图标
-        if rate == 100:
-            status = "✅ 完美"
-        elif rate >= 80:
-            status = "🟢 优秀"
-        elif rate >= 60:
-            status = "🟡 良好"
-        elif rate >= 40:
-            status = "🟠 一般"
+    with PROFILER.phase('match'):
+        # 所有问题的关键串一次性编译，只扫描一遍语料
+        all_questions = [q for qs in categories.values() for q in qs]
+        results, engine = match_all(all_questions, md_files, incremental, engine, jobs, suffix_array)
+    hits = dict(zip(all_questions, results))
+    count_matcher_hits(all_questions, results, labelled_keys)
+
+    with PROFILER.phase('report_render'):
+        for category, questions in categories.items():
+            with PROFILER.timed('category_ms', category):
+                covered = 0
+                uncovered = []
+
+                for q in questions:
+                    if hits[q]:
+                        covered += 1
+                    else:
+                        uncovered.append(q)
+
+                total = len(questions)
+                rate = (covered / total * 100) if total > 0 else 0
+                covered_count += covered
+
+                # 状态图标
+                if rate == 100:
+                    status = "✅ 完美"
+                elif rate >= 80:
+                    status = "🟢 优秀"
+                elif rate >= 60:
+                    status = "🟡 良好"
+                elif rate >= 40:
+                    status = "🟠 一般"
+                else:
+                    status = "🔴 较差"
+
+                print(f"{category:<25} {total:>8} {covered:>8} {len(uncovered):>8} {rate:>9.1f}% {status:>8}")
+
+                if uncovered:
+                    uncovered_by_category[category] = uncovered
+
+        # 总计
+        print("-" * 100)
+        total_rate = (covered_count / total_questions * 100) if total_questions > 0 else 0
+        print(f"{'总计':<25} {total_questions:>8} {covered_count:>8} {total_questions-covered_count:>8} {total_rate:>9.1f}%")
+        print()
+
+        # 未覆盖问题详情
+        if uncovered_by_category:
+            print("=" * 100)
+            print("❌ 未覆盖问题详细列表")
+            print("=" * 100)
+
+            for category, questions in uncovered_by_category.items():
+                print(f"\n【{category}】 共{len(questions)}个未覆盖:")
+                print("-" * 100)
+                for i, q in enumerate(questions, 1):
+                    # 限制显示长度
+                    display = q if len(q) <= 85 else q[:85] + "..."
+                    print(f"  {i:2d}. {display}")
+
+        # MD文件列表
+        print()
+        print("=" * 100)
+        print("📁 已生成的MD文件:")
+        print("=" * 100)
+        for fname in sorted(md_files.keys()):
+            stats = md_files[fname].stats
+            size = stats['chars']
+            lines = stats['lines']
+            h2_count = stats['questions']
+            print(f"  ✓ {fname:<45} {size:>7}字符  {lines:>5}行  {h2_count:>3}题")
+
+        # 总结
+        print()
+        print("=" * 100)
+        print("📈 总结:")
+        print("=" * 100)
+        print(f"  分类数量: {len(categories)}")
+        print(f"  问题总数: {total_questions}")
+        print(f"  已覆盖数: {covered_count} ({total_rate:.1f}%)")
+        print(f"  未覆盖数: {total_questions - covered_count} ({100-total_rate:.1f}%)")
+        print(f"  MD文件数: {len(md_files)}")
+        if incremental:
+            print(f"  增量模式: {len(engine.changed_files)} 个文件有变化, {len(engine.new_keys)} 个新关键串")
+        print()
+
+        if total_rate >= 95:
+            print("  🎉 覆盖率极高！几乎所有问题都已生成标准答案。")
+        elif total_rate >= 80:
+            print("  👍 覆盖率优秀！大部分问题已生成标准答案。")
+        elif total_rate >= 60:
+            print("  😊 覆盖率良好！还有少部分问题需要补充。")
+        elif total_rate >= 40:
+            print("  😐 覆盖率一般，建议继续补充问题答案。")
         else:
-            status = "🔴 较差"
-
-        print(f"{category:<25} {total:>8} {covered:>8} {len(uncovered):>8} {rate:>9.1f}% {status:>8}")
+            print("  😟 覆盖率较低，需要大量补充问题答案。")
 
-        if uncovered:
-            uncovered_by_category[category] = uncovered
-
-    # 总计
-    print("-" * 100)
-    total_rate = (covered_count / total_questions * 100) if total_questions > 0 else 0
-    print(f"{'总计':<25} {total_questions:>8} {covered_count:>8} {total_questions-covered_count:>8} {total_rate:>9.1f}%")
-    print()
-
-    # 未覆盖问题详情
-    if uncovered_by_category:
-        print("=" * 100)
-        print("❌ 未覆盖问题详细列表")
         print("=" * 100)
+    return engine if incremental else None
 
-        for category, questions in uncovered_by_category.items():
-            print(f"\n【{category}】 共{len(questions)}个未覆盖:")
-            print("-" * 100)
-            for i, q in enumerate(questions, 1):
-                # 限制显示长度
-                display = q if len(q) <= 85 else q[:85] + "..."
-                print(f"  {i:2d}. {display}")
+# 逐个问题产出检查记录（--format jsonl/csv）
+def iter_records(jobs=1, corpus=None, incremental=False, suffix_array=False):
+    with PROFILER.phase('parse_categories'):
+        categories = parse_classification_doc()
+    md_files = corpus if corpus is not None else load_corpus()
 
-    # MD文件列表
-    print()
-    print("=" * 100)
-    print("📁 已生成的MD文件:")
-    print("=" * 100)
-    for fname in sorted(md_files.keys()):
-        size = len(md_files[fname])
-        lines = md_files[fname].count('\n')
-        h2_count = md_files[fname].count('## ')
-        print(f"  ✓ {fname:<45} {size:>7}字符  {lines:>5}行  {h2_count:>3}题")
+    with PROFILER.phase('match'):
+        all_questions = [q for qs in categories.values() for q in qs]
+        results, _ = match_all(all_questions, md_files, incremental, jobs=jobs, suffix_array=suffix_array)
 
-    # 总结
-    print()
-    print("=" * 100)
-    print("📈 总结:")
-    print("=" * 100)
-    print(f"  分类数量: {len(categories)}")
-    print(f"  问题总数: {total_questions}")
-    print(f"  已覆盖数: {covered_count} ({total_rate:.1f}%)")
-    print(f"  未覆盖数: {total_questions - covered_count} ({100-total_rate:.1f}%)")
-    print(f"  MD文件数: {len(md_files)}")
-    print()
+    results = iter(results)
+    question_id = 0
+    for category, questions in categories.items():
+        for q in questions:
+            question_id += 1
+            yield hit_record('accurate_check', question_id, category, q, next(results), labelled_keys(q), md_files)
 
-    if total_rate >= 95:
-        print("  🎉 覆盖率极高！几乎所有问题都已生成标准答案。")
-    elif total_rate >= 80:
-        print("  👍 覆盖率优秀！大部分问题已生成标准答案。")
-    elif total_rate >= 60:
-        print("  😊 覆盖率良好！还有少部分问题需要补充。")
-    elif total_rate >= 40:
-        print("  😐 覆盖率一般，建议继续补充问题答案。")
-    else:
-        print("  😟 覆盖率较低，需要大量补充问题答案。")
+# 监听模式：保存文件后重新输出覆盖报告，语料缓存和命中表常驻内存
+def watch_main(polling=False):
+    state = {'engine': None}
 
-    print("=" * 100)
+    def render(changed=()):
+        started = time.perf_counter()
+        print("\033[2J\033[H", end="")
+        state['engine'] = main(incremental=True, engine=state['engine'])
+        elapsed = (time.perf_counter() - started) * 1000
+        if changed:
+            print(f"🔄 变化的文件: {', '.join(sorted(changed))}")
+        print(f"👀 正在监听文件变化（Ctrl+C 退出），本次耗时 {elapsed:.0f} ms")
+
+    render()
+    watch(render, polling=polling)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    # 匹配方式只能选一种（监听模式总是增量匹配）
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--incremental', action='store_true', help='只重新检查变化的文件和新增的问题')
+    mode.add_argument('--watch', action='store_true', help='监听MD文件变化，保存后自动重新输出报告')
+    mode.add_argument('--jobs', '-j', type=int, default=1, help='并行进程数，0 表示使用全部CPU核心')
+    mode.add_argument('--suffix-array', action='store_true', help='用持久化的后缀数组查找关键串，代替扫描全文')
+    parser.add_argument('--polling', action='store_true', help='监听模式下使用轮询代替 inotify')
+    add_format_arguments(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    if args.watch and args.format != 'text':
+        parser.error('--watch 只能输出文本报告')
+    if args.polling and not args.watch:
+        parser.error('--polling 需要和 --watch 一起使用')
+    if args.profile:
+        PROFILER.enable('accurate_check')
+    if args.format != 'text':
+        write_records(iter_records(jobs=args.jobs, incremental=args.incremental, suffix_array=args.suffix_array),
+                      args.format, args.output)
+    elif args.watch:
+        watch_main(polling=args.polling)
+    else:
+        main(incremental=args.incremental, jobs=args.jobs, suffix_array=args.suffix_array)
+    PROFILER.dump(args.profile)
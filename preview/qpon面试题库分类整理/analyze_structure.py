@@ -1,9 +1,19 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import os
+import argparse
 import re
 
+from corpus import load_corpus
+from incremental import incremental_match_questions
+from matcher import match_corpus
+from ngram_index import DEFAULT_MIN_SCORE, NgramIndex
+from parallel import parallel_match_questions
+from profiling import PROFILER, add_profile_argument, count_matcher_hits
+from records import add_format_arguments, hit_record, position_record, write_records
+from suffix_array import load_suffix_array, match_questions as sa_match_questions
+from synonyms import canonical
+
 # 手动定义分类结构（基于文档内容）
 def get_manual_categories():
     return {
@@ -162,57 +172,61 @@ def get_manual_categories():
         ]
     }
 
-# 读取所有MD文件内容
-def read_md_files():
-    md_files = {}
-    files = [f for f in os.listdir('.') if f.endswith('.md') and f not in ['README.md', '图片问题完整清单.md', '质量检查报告.md']]
-
-    for filename in files:
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-            md_files[filename] = content
-
-    return md_files
-
-# 检查问题是否在MD文件中（更智能的匹配）
-def check_question_coverage(question, md_content):
-    # 清理问题文本
-    clean_q = question.replace('?', '').replace('？', '').strip()
+# 生成问题的候选匹配关键串（更智能的匹配，规整后的文本）：[(匹配方式, 关键串), ...]
+def labelled_keys(question):
+    # 规整并清理问题文本（全角标点已折叠为半角）
+    clean_q = canonical(question).replace('?', '').strip()
 
     # 移除括号中的说明
-    clean_q = re.sub(r'[（(].*?[)）]', '', clean_q).strip()
+    clean_q = re.sub(r'\(.*?\)', '', clean_q).strip()
 
     # 完整匹配
-    if clean_q in md_content:
-        return True
+    keys = [('完整', clean_q)]
 
     # 提取关键词（前20个字符）
     if len(clean_q) > 10:
-        keywords = clean_q[:20]
-        if keywords in md_content:
-            return True
+        keys.append(('前20字', clean_q[:20]))
 
     # 对于特别长的问题，检查核心关键词
     if len(clean_q) > 30:
-        core_keywords = clean_q.split('，')[0].split(',')[0][:15]
-        if core_keywords in md_content:
-            return True
+        keys.append(('核心词', clean_q.split(',')[0][:15]))
+
+    return keys
 
-    return False
+def question_keys(question):
+    return [key for _, key in labelled_keys(question)]
+
+# 检查问题是否在MD文件中
+def check_question_coverage(question, md_content):
+    md_content = canonical(md_content)
+    return any(key in md_content for key in question_keys(question))
+
+# 按选择的方式匹配所有问题，返回 (结果, 增量模式的 engine)
+def match_all(all_questions, md_files, incremental=False, jobs=1, suffix_array=False):
+    if incremental:
+        # 增量模式：只重新扫描变化的文件和新增的关键串
+        return incremental_match_questions(all_questions, md_files, question_keys, 'analyze_structure')
+    if jobs != 1:
+        # 并行模式：语料按文件切分给多个进程扫描
+        return parallel_match_questions(all_questions, md_files, question_keys, jobs), None
+    if suffix_array:
+        # 后缀数组模式：每个关键串两次二分查找，不扫描全文
+        return sa_match_questions(all_questions, load_suffix_array(md_files), question_keys), None
+    return match_corpus(all_questions, md_files, question_keys), None
 
 # 主函数
-def main():
+def main(incremental=False, jobs=1, fuzzy=None, suffix_array=False):
     print("=" * 90)
     print("📋 QPON面试题库分类覆盖情况检查报告")
     print("=" * 90)
     print()
 
     # 获取分类结构
-    categories = get_manual_categories()
+    with PROFILER.phase('parse_categories'):
+        categories = get_manual_categories()
 
     # 读取所有MD文件
-    md_files = read_md_files()
-    all_md_content = '\n'.join(md_files.values())
+    md_files = load_corpus()
 
     # 统计数据
     total_questions = sum(len(questions) for questions in categories.values())
@@ -225,91 +239,169 @@ def main():
     print(f"{'分类名称':<20} {'总数':>6} {'已覆盖':>8} {'未覆盖':>8} {'覆盖率':>10} {'状态':>6}")
     print("-" * 90)
 
-    for category, questions in categories.items():
-        if not questions:
-            continue
+    with PROFILER.phase('match'):
+        # 所有问题的关键串一次性编译，只扫描一遍语料
+        all_questions = [q for questions in categories.values() for q in questions]
+        results, engine = match_all(all_questions, md_files, incremental, jobs, suffix_array)
+    hits = dict(zip(all_questions, results))
+    count_matcher_hits(all_questions, results, labelled_keys)
 
-        category_covered = 0
-        category_uncovered = []
+    # 模糊模式：精确匹配不到的问题再用 n-gram 索引查找（fuzzy 为最低得分）
+    fuzzy_hits = {}
+    if fuzzy:
+        with PROFILER.phase('match'):
+            index = NgramIndex.from_corpus(md_files)
+            for question in all_questions:
+                if not hits[question]:
+                    best = index.best(question, fuzzy)
+                    if best:
+                        fuzzy_hits[question] = best
 
-        for question in questions:
-            if check_question_coverage(question, all_md_content):
-                category_covered += 1
-                covered_count += 1
-            else:
-                category_uncovered.append(question)
+    with PROFILER.phase('report_render'):
+        for category, questions in categories.items():
+            if not questions:
+                continue
 
-        total = len(questions)
-        coverage_rate = (category_covered / total * 100) if total > 0 else 0
+            with PROFILER.timed('category_ms', category):
+                category_covered = 0
+                category_uncovered = []
 
-        if coverage_rate == 100:
-            status = "✅"
-        elif coverage_rate >= 70:
-            status = "⚠️"
-        else:
-            status = "❌"
+                for question in questions:
+                    if hits[question] or question in fuzzy_hits:
+                        category_covered += 1
+                        covered_count += 1
+                    else:
+                        category_uncovered.append(question)
 
-        print(f"{category:<20} {total:>6} {category_covered:>8} {len(category_uncovered):>8} {coverage_rate:>9.1f}% {status:>6}")
+                total = len(questions)
+                coverage_rate = (category_covered / total * 100) if total > 0 else 0
 
-        if category_uncovered:
-            uncovered_questions[category] = category_uncovered
+                if coverage_rate == 100:
+                    status = "✅"
+                elif coverage_rate >= 70:
+                    status = "⚠️"
+                else:
+                    status = "❌"
 
-    # 总体统计
-    print("-" * 90)
-    coverage_rate = (covered_count/total_questions*100) if total_questions > 0 else 0
-    print(f"{'总计':<20} {total_questions:>6} {covered_count:>8} {total_questions - covered_count:>8} {coverage_rate:>9.1f}%")
-    print()
+                print(f"{category:<20} {total:>6} {category_covered:>8} {len(category_uncovered):>8} {coverage_rate:>9.1f}% {status:>6}")
+
+                if category_uncovered:
+                    uncovered_questions[category] = category_uncovered
 
-    # 详细未覆盖问题列表
-    if uncovered_questions:
+        # 总体统计
+        print("-" * 90)
+        coverage_rate = (covered_count/total_questions*100) if total_questions > 0 else 0
+        print(f"{'总计':<20} {total_questions:>6} {covered_count:>8} {total_questions - covered_count:>8} {coverage_rate:>9.1f}%")
+        print()
+
+        # 详细未覆盖问题列表
+        if uncovered_questions:
+            print("=" * 90)
+            print("❌ 未覆盖问题详情:")
+            print("=" * 90)
+            total_uncovered = 0
+            for category, questions in uncovered_questions.items():
+                total_uncovered += len(questions)
+                print(f"\n【{category}】 - {len(questions)}个未覆盖问题")
+                print("-" * 90)
+                for i, question in enumerate(questions, 1):
+                    # 截断太长的问题
+                    display_q = question if len(question) <= 70 else question[:70] + "..."
+                    print(f"  {i:2d}. {display_q}")
+
+            print()
+            print("=" * 90)
+            print(f"总计未覆盖问题: {total_uncovered} 个")
+            print("=" * 90)
+
+        # 模糊匹配命中的问题
+        if fuzzy_hits:
+            print()
+            print("=" * 90)
+            print(f"🔍 模糊匹配命中（得分 >= {fuzzy:.2f}）: {len(fuzzy_hits)} 个")
+            print("=" * 90)
+            for i, (question, (score, passage)) in enumerate(fuzzy_hits.items(), 1):
+                display_q = question if len(question) <= 50 else question[:50] + "..."
+                print(f"  {i:2d}. {display_q}")
+                print(f"      ≈ {passage.name} / {passage.title} ({score:.2f})")
+
+        # 文件对应关系
+        print()
         print("=" * 90)
-        print("❌ 未覆盖问题详情:")
+        print("📁 已生成的MD文件列表:")
         print("=" * 90)
-        total_uncovered = 0
-        for category, questions in uncovered_questions.items():
-            total_uncovered += len(questions)
-            print(f"\n【{category}】 - {len(questions)}个未覆盖问题")
-            print("-" * 90)
-            for i, question in enumerate(questions, 1):
-                # 截断太长的问题
-                display_q = question if len(question) <= 70 else question[:70] + "..."
-                print(f"  {i:2d}. {display_q}")
+        for filename in sorted(md_files.keys()):
+            stats = md_files[filename].stats
+            size = stats['chars']
+            # 问题数量（基于标题索引中的二级标题）
+            question_count = stats['questions']
+            print(f"  ✓ {filename:<40} ({size:>6} 字符, {question_count:>3}个问题)")
 
         print()
         print("=" * 90)
-        print(f"总计未覆盖问题: {total_uncovered} 个")
+        print("💡 总结:")
         print("=" * 90)
+        print(f"  ✓ 总分类数: {len(categories)}")
+        print(f"  ✓ 总问题数: {total_questions}")
+        print(f"  ✓ 已覆盖: {covered_count} ({coverage_rate:.1f}%)")
+        print(f"  ✓ 未覆盖: {total_questions - covered_count} ({(total_questions-covered_count)/total_questions*100:.1f}%)")
+        print(f"  ✓ MD文件数: {len(md_files)}")
+        if incremental:
+            print(f"  ✓ 增量模式: {len(engine.changed_files)} 个文件有变化, {len(engine.new_keys)} 个新关键串")
+        print()
 
-    # 文件对应关系
-    print()
-    print("=" * 90)
-    print("📁 已生成的MD文件列表:")
-    print("=" * 90)
-    for filename in sorted(md_files.keys()):
-        size = len(md_files[filename])
-        # 计算大概的问题数量（基于标题标记 ##）
-        question_count = md_files[filename].count('## ')
-        print(f"  ✓ {filename:<40} ({size:>6} 字符, 约{question_count:>3}个问题)")
+        if coverage_rate >= 90:
+            print("  🎉 覆盖率优秀！大部分问题已生成标准答案。")
+        elif coverage_rate >= 70:
+            print("  👍 覆盖率良好！还有部分问题需要补充。")
+        else:
+            print("  ⚠️  覆盖率较低，建议补充缺失的问题答案。")
 
-    print()
-    print("=" * 90)
-    print("💡 总结:")
-    print("=" * 90)
-    print(f"  ✓ 总分类数: {len(categories)}")
-    print(f"  ✓ 总问题数: {total_questions}")
-    print(f"  ✓ 已覆盖: {covered_count} ({coverage_rate:.1f}%)")
-    print(f"  ✓ 未覆盖: {total_questions - covered_count} ({(total_questions-covered_count)/total_questions*100:.1f}%)")
-    print(f"  ✓ MD文件数: {len(md_files)}")
-    print()
+        print("=" * 90)
 
-    if coverage_rate >= 90:
-        print("  🎉 覆盖率优秀！大部分问题已生成标准答案。")
-    elif coverage_rate >= 70:
-        print("  👍 覆盖率良好！还有部分问题需要补充。")
-    else:
-        print("  ⚠️  覆盖率较低，建议补充缺失的问题答案。")
+# 逐个问题产出检查记录（--format jsonl/csv），fuzzy 时精确匹配不到的问题再模糊查找
+def iter_records(jobs=1, fuzzy=None, corpus=None, incremental=False, suffix_array=False):
+    with PROFILER.phase('parse_categories'):
+        categories = get_manual_categories()
+    md_files = corpus if corpus is not None else load_corpus()
 
-    print("=" * 90)
+    with PROFILER.phase('match'):
+        all_questions = [q for questions in categories.values() for q in questions]
+        results, _ = match_all(all_questions, md_files, incremental, jobs, suffix_array)
+    index = NgramIndex.from_corpus(md_files) if fuzzy else None
+
+    results = iter(results)
+    question_id = 0
+    for category, questions in categories.items():
+        for question in questions:
+            question_id += 1
+            hits = next(results)
+            best = index.best(question, fuzzy) if index is not None and not hits else None
+            if best:
+                score, passage = best
+                yield position_record('analyze_structure', question_id, category, question, md_files,
+                                      passage.char_start, score, '模糊')
+            else:
+                yield hit_record('analyze_structure', question_id, category, question, hits,
+                                 labelled_keys(question), md_files)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    # 匹配方式只能选一种
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--incremental', action='store_true', help='只重新检查变化的文件和新增的问题')
+    mode.add_argument('--jobs', '-j', type=int, default=1, help='并行进程数，0 表示使用全部CPU核心')
+    mode.add_argument('--suffix-array', action='store_true', help='用持久化的后缀数组查找关键串，代替扫描全文')
+    parser.add_argument('--fuzzy', nargs='?', type=float, const=DEFAULT_MIN_SCORE, metavar='MIN_SCORE',
+                        help=f'精确匹配不到时用字符 n-gram 索引模糊查找（默认最低得分 {DEFAULT_MIN_SCORE}）')
+    add_format_arguments(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    if args.profile:
+        PROFILER.enable('analyze_structure')
+    if args.format != 'text':
+        write_records(iter_records(jobs=args.jobs, fuzzy=args.fuzzy, incremental=args.incremental,
+                                   suffix_array=args.suffix_array), args.format, args.output)
+    else:
+        main(incremental=args.incremental, jobs=args.jobs, fuzzy=args.fuzzy, suffix_array=args.suffix_array)
+    PROFILER.dump(args.profile)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+各检查脚本的性能基准
+
+按指定规模（默认 1k / 10k / 100k 个问题）生成合成题库：与 分类整理文档.md 相同布局
+（`### 分组` 下的 `#### 问题`，部分分类直接用 `### 问题`）的中英文混合问题、
+带多级标题的章节MD文件、`#### N. 分类 (NN)` / `- ✅` 格式的质量检查报告
+和图片问题清单，放在临时目录中，然后分阶段计时：
+  analyze_structure  加载 / 匹配 / 报告
+  accurate_check     解析 / 加载 / 匹配 / 报告
+  compare_questions  解析 / 匹配 / 报告
+  check_coverage     解析 / 加载 / 匹配 / 报告
+“报告”阶段是完整运行一次脚本的 main()（输出被丢弃）。
+
+用法: python3 benchmark.py [--sizes 1000,10000] [--json 结果.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import accurate_check
+import analyze_structure
+import check_coverage
+import compare_questions
+from classification import load_categories
+from corpus import load_corpus
+from matcher import match_corpus
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+CATEGORIES = [
+    '数据结构和算法', 'JS事件循环和异步', '开发语言基础', 'Vue框架', 'React框架', '前端框架架构',
+    'Webpack构建工具', '性能优化', 'HTTP和网络', 'Node.js和工程化', 'Web安全', '前端框架细节',
+    '浏览器原理', 'Debug能力', '前端监控', '跨端经验',
+]
+
+TERMS = [
+    'Vue', 'React', 'Webpack', 'Promise', 'async/await', 'HTTP2', 'HTTPS', 'CSS', 'BFC', 'Node.js',
+    'TypeScript', 'Vite', 'Babel', 'loader', 'plugin', 'HMR', 'SSR', 'Fiber', 'Hooks', 'Redux',
+    'Vuex', 'keep-alive', 'v-model', 'nextTick', 'localStorage', 'cookie', 'XSS', 'CSRF', 'CORS',
+    'Service Worker', '闭包', '原型链', '事件循环', '虚拟DOM', 'diff算法', '响应式', '防抖', '节流',
+    '深拷贝', '柯里化', '垃圾回收', '跨域', '懒加载', '首屏渲染', '性能监控', '错误上报', '灰度发布',
+    '微前端', '小程序', '热更新', '路由', '状态管理', '组件通信', '生命周期', '高阶组件', '受控组件',
+    '事件代理', '浏览器缓存', '重绘回流', '长列表',
+]
+
+TEMPLATES = [
+    '{a}和{b}的区别是什么？',
+    '如何实现{a}？',
+    '介绍{a}的原理（考察{b}）',
+    '{a}在项目中有哪些应用场景，{b}如何配合使用？',
+    'What is {a} and how does it work with {b}?',
+    '说一下{a}',
+    '{a}的实现原理，{b}、{a}各自的优缺点',
+    '在{a}中遇到过哪些{b}相关的问题？用过哪些优化手段？',
+]
+
+PARAGRAPH = ('这里是答案正文，介绍了{a}的背景、实现细节以及和{b}的对比。'
+             'In practice {a} is often combined with {b} for better performance.\n')
+
+
+# 生成第 i 个问题
+def make_question(rng, i):
+    a, b = rng.sample(TERMS, 2)
+    return rng.choice(TEMPLATES).format(a=a, b=b) + f' {i}'
+
+
+# 在 directory 下生成规模为 size 的合成题库，返回 {分类: [问题, ...]}
+def generate_bank(directory, size, seed=0):
+    rng = random.Random(seed)
+    categories = {name: [] for name in CATEGORIES}
+    for i in range(size):
+        categories[CATEGORIES[i % len(CATEGORIES)]].append(make_question(rng, i))
+
+    # 分类整理文档.md：目录、分类、分组和问题、附录，与真实文档的布局相同
+    with open(os.path.join(directory, '分类整理文档.md'), 'w', encoding='utf-8') as f:
+        f.write('# 合成题库分类整理文档\n\n## 目录\n\n')
+        for ci, category in enumerate(categories, 1):
+            f.write(f'{ci}. [{category}](#{ci:02d}-{category})\n')
+        f.write('\n---\n\n')
+        for ci, (category, questions) in enumerate(categories.items(), 1):
+            f.write(f'## {ci:02d}. {category}\n\n> {category}相关的能力要求\n\n')
+            if ci % 4 == 1:
+                # 没有分组：### 直接是问题
+                for qi, question in enumerate(questions, 1):
+                    f.write(f'### {ci}.{qi} {question}\n- **考察要点**: {rng.choice(TERMS)}\n\n')
+                continue
+            gi = qi = 0
+            for question in questions:
+                if qi == 0 or qi >= group_size:
+                    gi += 1
+                    qi = 0
+                    group_size = rng.randint(1, 6)
+                    f.write(f'### {ci}.{gi} {rng.choice(TERMS)}\n\n')
+                qi += 1
+                f.write(f'#### {ci}.{gi}.{qi} {question}\n- **考察要点**: {rng.choice(TERMS)}\n\n')
+        f.write('---\n\n## 附录\n\n### 问题统计\n\n')
+        for category, questions in categories.items():
+            f.write(f'- **{category}**: {len(questions)}个问题\n')
+
+    # 章节文件：约 70% 的问题写成二级标题，下面带多级子标题和代码块
+    for ci, (category, questions) in enumerate(categories.items(), 1):
+        with open(os.path.join(directory, f'{ci:02d}-{category}.md'), 'w', encoding='utf-8') as f:
+            f.write(f'# {category}\n\n')
+            for qi, question in enumerate(questions, 1):
+                if rng.random() >= 0.7:
+                    continue
+                a, b = rng.sample(TERMS, 2)
+                f.write(f'## {qi}. {question}\n\n### 解答\n\n')
+                f.write(PARAGRAPH.format(a=a, b=b))
+                f.write(f'\n#### {a}示例\n\n```js\n# not a heading\nconst x = "{b}";\n```\n\n')
+
+    # 质量检查报告.md：约 60% 的问题标记为已完成
+    with open(os.path.join(directory, '质量检查报告.md'), 'w', encoding='utf-8') as f:
+        f.write('# 合成题库质量检查报告\n\n## 一、完成度检查\n\n')
+        for ci, (category, questions) in enumerate(categories.items(), 1):
+            f.write(f'#### {ci}. {category} ({ci:02d})\n')
+            for question in questions:
+                if rng.random() < 0.6:
+                    f.write(f'- ✅ {question}\n')
+            f.write('\n')
+        f.write('\n---\n')
+
+    # 图片问题完整清单.md
+    with open(os.path.join(directory, '图片问题完整清单.md'), 'w', encoding='utf-8') as f:
+        f.write('# 合成图片问题清单\n\n')
+        for i, question in enumerate((q for qs in categories.values() for q in qs), 1):
+            f.write(f'{i}. {question}\n')
+
+    return categories
+
+
+class Timer:
+    """按阶段记录耗时（秒）"""
+
+    def __init__(self):
+        self.results = {}
+
+    @contextlib.contextmanager
+    def phase(self, checker, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.results.setdefault(checker, {})[name] = time.perf_counter() - started
+
+
+# 完整运行一次脚本的 main()，丢弃输出
+def run_quietly(func):
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+
+
+def bench_size(size, seed=0):
+    timer = Timer()
+    directory = tempfile.mkdtemp(prefix=f'qbank-bench-{size}-')
+    cwd = os.getcwd()
+    try:
+        categories = generate_bank(directory, size, seed)
+        os.chdir(directory)
+        all_questions = [q for qs in categories.values() for q in qs]
+
+        # analyze_structure（分类结构替换为合成题库）
+        with timer.phase('analyze_structure', 'load'):
+            corpus = load_corpus(use_cache=False)
+            corpus.folded
+        with timer.phase('analyze_structure', 'match'):
+            match_corpus(all_questions, corpus, analyze_structure.question_keys)
+        original = analyze_structure.get_manual_categories
+        analyze_structure.get_manual_categories = lambda: categories
+        try:
+            with timer.phase('analyze_structure', 'report'):
+                run_quietly(analyze_structure.main)
+        finally:
+            analyze_structure.get_manual_categories = original
+
+        # accurate_check
+        with timer.phase('accurate_check', 'parse'):
+            parsed = load_categories()
+        parsed_count = sum(len(qs) for qs in parsed.values())
+        if parsed_count != len(all_questions):
+            raise RuntimeError(f'分类整理文档解析出 {parsed_count} 个问题，应为 {len(all_questions)} 个')
+        with timer.phase('accurate_check', 'load'):
+            corpus = load_corpus()
+            corpus.folded
+        with timer.phase('accurate_check', 'match'):
+            questions = [q for qs in parsed.values() for q in qs]
+            match_corpus(questions, corpus, accurate_check.question_keys)
+        with timer.phase('accurate_check', 'report'):
+            run_quietly(accurate_check.main)
+
+        # compare_questions
+        with timer.phase('compare_questions', 'parse'):
+            doc_categories, _ = compare_questions.parse_classification_doc()
+            completed = compare_questions.parse_quality_report()
+        with timer.phase('compare_questions', 'match'):
+            index = compare_questions.CompletedIndex(completed)
+            for questions in doc_categories.values():
+                for q in questions:
+                    index.match(q['question'])
+        with timer.phase('compare_questions', 'report'):
+            run_quietly(compare_questions.main)
+
+        # check_coverage
+        with timer.phase('check_coverage', 'parse'):
+            checklist = check_coverage.read_checklist()
+        with timer.phase('check_coverage', 'load'):
+            corpus = load_corpus()
+        with timer.phase('check_coverage', 'match'):
+            check_coverage.check_checklist(checklist, corpus)
+        with timer.phase('check_coverage', 'report'):
+            run_quietly(check_coverage.main)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory, ignore_errors=True)
+    return timer.results
+
+
+def print_results(size, results):
+    print(f"\n📏 规模: {size} 个问题")
+    print("-" * 80)
+    print(f"{'脚本':<20} {'parse':>10} {'load':>10} {'match':>10} {'report':>10}")
+    print("-" * 80)
+    for checker, phases in results.items():
+        cells = [f"{phases[p] * 1000:>8.1f}ms" if p in phases else f"{'-':>10}"
+                 for p in ('parse', 'load', 'match', 'report')]
+        print(f"{checker:<20} {' '.join(cells)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='检查脚本性能基准')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help='题库规模，逗号分隔')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--json', help='把结果另存为 JSON 文件')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("⏱️  检查脚本性能基准")
+    print("=" * 80)
+
+    all_results = {}
+    for size in (int(s) for s in args.sizes.split(',')):
+        results = bench_size(size, args.seed)
+        all_results[size] = results
+        print_results(size, results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(all_results, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 结果已保存到: {args.json}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
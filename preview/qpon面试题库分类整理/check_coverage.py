@@ -1,238 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
 import re
-import os
-
-# 从清单中提取所有问题
-checklist_file = '图片问题完整清单.md'
-with open(checklist_file, 'r', encoding='utf-8') as f:
-    content = f.read()
-
-# 提取所有问题编号和标题
-checklist_questions = {}
-for match in re.finditer(r'^(\d+)\.\s+(.+)$', content, re.MULTILINE):
-    num = int(match.group(1))
-    title = match.group(2).strip()
-    checklist_questions[num] = title
-
-print(f"📋 清单中的问题总数: {len(checklist_questions)}")
-print(f"📊 问题编号范围: {min(checklist_questions.keys())} - {max(checklist_questions.keys())}")
-
-# 检查已整理文件中包含的问题关键词
-md_files = [f for f in os.listdir('.') if f.endswith('.md')
-            and f not in ['README.md', '图片问题完整清单.md', '质量检查报告.md', 'check_coverage.py']]
-
-# 读取所有整理文件的内容
-all_content = ""
-file_contents = {}
-for f in md_files:
-    with open(f, 'r', encoding='utf-8') as file:
-        file_content = file.read()
-        all_content += file_content + "\n"
-        file_contents[f] = file_content
-
-# 检查每个问题是否被覆盖
-print("\n" + "="*80)
-print("🔍 问题覆盖情况检查")
-print("="*80)
-
-covered = []
-not_covered = []
-partially_covered = []
-
-for num in sorted(checklist_questions.keys()):
-    title = checklist_questions[num]
-
-    # 提取关键词
-    keywords = []
-
-    # 根据题目内容提取关键词
-    if 'async' in title.lower() or 'await' in title.lower():
-        keywords = ['async', 'await']
-    elif 'promise' in title.lower():
-        keywords = ['Promise', 'promise']
-    elif 'webpack' in title.lower():
-        keywords = ['Webpack', 'webpack']
-    elif 'vue' in title.lower():
-        keywords = ['Vue', 'vue']
-    elif 'react' in title.lower():
-        keywords = ['React', 'react']
-    elif 'bfc' in title.lower():
-        keywords = ['BFC', 'bfc']
-    elif 'for' in title.lower() and 'foreach' in title.lower():
-        keywords = ['forEach', 'for循环']
-    elif 'import' in title.lower() and 'require' in title.lower():
-        keywords = ['import', 'require']
-    elif '快速排序' in title:
-        keywords = ['快速排序', 'quickSort']
-    elif '数组打平' in title:
-        keywords = ['数组打平', 'flat', '扁平化']
-    elif '链表' in title:
-        keywords = ['链表', 'linked']
-    elif 'http' in title.lower() or 'https' in title.lower():
-        keywords = ['HTTP', 'HTTPS']
-    elif '性能优化' in title:
-        keywords = ['性能优化', '性能']
-    elif '监控' in title:
-        keywords = ['监控']
-    elif 'node' in title.lower():
-        keywords = ['Node', 'node']
-    elif 'xss' in title.lower():
-        keywords = ['XSS', 'xss']
-    elif 'csrf' in title.lower():
-        keywords = ['CSRF', 'csrf']
-    elif '跨域' in title:
-        keywords = ['跨域', 'CORS']
-    elif 'babel' in title.lower():
-        keywords = ['Babel', 'babel']
-    elif 'loader' in title.lower():
-        keywords = ['loader', 'Loader']
-    elif 'plugin' in title.lower():
-        keywords = ['plugin', 'Plugin']
-    elif 'hmr' in title.lower():
-        keywords = ['HMR', 'hmr', '热更新']
-    elif '响应式' in title:
-        keywords = ['响应式', 'reactive']
-    elif 'mixin' in title.lower():
-        keywords = ['mixin', 'Mixin']
-    elif 'computed' in title.lower():
-        keywords = ['computed']
-    elif 'watch' in title.lower():
-        keywords = ['watch']
-    elif 'v-model' in title.lower():
-        keywords = ['v-model']
-    elif 'v-if' in title.lower() or 'v-show' in title.lower():
-        keywords = ['v-if', 'v-show']
-    elif 'keep-alive' in title.lower():
-        keywords = ['keep-alive', 'keepAlive']
-    elif 'router' in title.lower():
-        keywords = ['router', 'Router', '路由']
-    elif 'vuex' in title.lower():
-        keywords = ['Vuex', 'vuex']
-    elif 'ssr' in title.lower():
-        keywords = ['SSR', 'ssr', '服务端渲染']
-    elif 'vdom' in title.lower() or '虚拟dom' in title.lower():
-        keywords = ['虚拟DOM', 'VDom', 'VDOM', 'Virtual DOM']
-    elif 'diff' in title.lower():
-        keywords = ['diff', 'Diff']
-    elif 'fiber' in title.lower():
-        keywords = ['Fiber', 'fiber']
-    elif 'hooks' in title.lower():
-        keywords = ['Hooks', 'hooks', 'useState', 'useEffect']
-    elif 'context' in title.lower():
-        keywords = ['Context', 'context']
-    elif 'refs' in title.lower() or 'ref' in title.lower():
-        keywords = ['ref', 'refs', 'useRef']
-    elif '高阶组件' in title:
-        keywords = ['高阶组件', 'HOC']
-    elif '受控组件' in title:
-        keywords = ['受控组件', '非受控组件']
-    elif 'pure component' in title.lower():
-        keywords = ['PureComponent', 'Pure Component']
-    elif '生命周期' in title:
-        keywords = ['生命周期', 'lifecycle']
-    elif 'immutable' in title.lower():
-        keywords = ['Immutable', 'immutable']
-    elif '防抖' in title or '节流' in title:
-        keywords = ['防抖', '节流', 'debounce', 'throttle']
-    elif 'devtools' in title.lower():
-        keywords = ['devtools', 'DevTools', '开发者工具']
-    elif 'coredump' in title.lower():
-        keywords = ['coredump', 'core dump']
-    elif 'pm2' in title.lower():
-        keywords = ['PM2', 'pm2']
-    elif 'rn' in title.lower() or 'react native' in title.lower():
-        keywords = ['React Native', 'RN']
-    elif '小程序' in title:
-        keywords = ['小程序']
-    elif 'taro' in title.lower():
-        keywords = ['Taro', 'taro']
-    elif 'flutter' in title.lower():
-        keywords = ['Flutter', 'flutter']
-    elif 'position' in title.lower():
-        keywords = ['position']
-    elif 'sticky' in title.lower():
-        keywords = ['sticky']
-    elif 'bind' in title.lower() or 'call' in title.lower() or 'apply' in title.lower():
-        keywords = ['bind', 'call', 'apply']
-    elif 'localstorage' in title.lower() or 'cookie' in title.lower():
-        keywords = ['localStorage', 'cookie']
-    elif 'viewport' in title.lower():
-        keywords = ['viewport']
-    elif 'rem' in title.lower() or 'em' in title.lower():
-        keywords = ['rem', 'em', 'vw']
-    elif '选择器' in title:
-        keywords = ['选择器', 'selector']
-    elif '浮动' in title:
-        keywords = ['浮动', 'float', '清除浮动']
-    elif '事件代理' in title or '事件委托' in title:
-        keywords = ['事件代理', '事件委托', 'delegation']
-    elif '1px' in title:
-        keywords = ['1px', 'retina']
-    elif 'sass' in title.lower() or 'less' in title.lower():
-        keywords = ['sass', 'less', 'scss']
-    else:
-        # 默认使用标题中的关键词
-        keywords = [word for word in re.findall(r'\w+', title) if len(word) > 2]
-
-    # 检查关键词是否在内容中
-    found_in_files = []
-    if keywords:
-        for keyword in keywords:
-            for filename, file_content in file_contents.items():
-                if keyword in file_content:
-                    found_in_files.append(filename)
-                    break
-
-    if found_in_files:
-        covered.append((num, title, list(set(found_in_files))))
-    else:
-        not_covered.append((num, title))
-
-print(f"\n✅ 已覆盖: {len(covered)} 个问题 ({len(covered)/len(checklist_questions)*100:.1f}%)")
-print(f"❌ 未覆盖: {len(not_covered)} 个问题 ({len(not_covered)/len(checklist_questions)*100:.1f}%)")
-
-print("\n" + "="*80)
-print("❌ 未覆盖的问题列表")
-print("="*80)
-for num, title in sorted(not_covered):
-    print(f"{num}. {title}")
-
-print("\n" + "="*80)
-print("📝 建议")
-print("="*80)
-
-# 按类别分组未覆盖的问题
-categories = {
-    'devtools和调试': [],
-    '跨端开发': [],
-    '监控相关': [],
-    '工程化': [],
-    '其他': []
-}
-
-for num, title in not_covered:
-    if any(k in title.lower() for k in ['devtools', 'debug', '调试', 'coredump']):
-        categories['devtools和调试'].append((num, title))
-    elif any(k in title.lower() for k in ['rn', 'react native', '小程序', 'taro', 'flutter', '跨端']):
-        categories['跨端开发'].append((num, title))
-    elif any(k in title.lower() for k in ['监控', 'monitor', 'pm2']):
-        categories['监控相关'].append((num, title))
-    elif any(k in title.lower() for k in ['webpack', 'babel', '工程', '构建']):
-        categories['工程化'].append((num, title))
+
+from classification import CHECKLIST_FILE
+from corpus import load_corpus
+from edit_distance import DEFAULT_MAX_RATIO, approximate_match, build_heading_index
+from matcher import AhoCorasick
+from ngram_index import normalize
+from profiling import PROFILER, add_profile_argument
+from records import add_format_arguments, coverage_record, position_record, write_records
+from synonyms import canonical
+from textnorm import fold
+from tokenizer import load_tokenizer
+
+# 关键词规则表：按顺序匹配规整后（synonyms.canonical）的题目，第一条满足的规则决定关键词
+# 条件写法：'a|b' 表示包含任意一个，'a&b' 表示同时包含
+# 同义词表（qbank.json 的 synonyms）中的别名会先改写成规范写法，这里不必再列出
+KEYWORD_RULES = [
+    ('async|await', ['async', 'await']),
+    ('promise', ['Promise', 'promise']),
+    ('webpack', ['Webpack', 'webpack']),
+    ('vue', ['Vue', 'vue']),
+    ('react', ['React', 'react']),
+    ('bfc', ['BFC', 'bfc']),
+    ('for&foreach', ['forEach', 'for循环']),
+    ('import&require', ['import', 'require']),
+    ('快速排序', ['快速排序']),
+    ('数组扁平化', ['数组扁平化', 'flat', '扁平化']),
+    ('链表', ['链表', 'linked']),
+    ('http|https', ['HTTP', 'HTTPS']),
+    ('性能优化', ['性能优化', '性能']),
+    ('监控', ['监控']),
+    ('node', ['Node', 'node']),
+    ('xss', ['XSS', 'xss']),
+    ('csrf', ['CSRF', 'csrf']),
+    ('跨域', ['跨域', 'CORS']),
+    ('babel', ['Babel', 'babel']),
+    ('loader', ['loader', 'Loader']),
+    ('plugin', ['plugin', 'Plugin']),
+    ('热更新', ['热更新']),
+    ('响应式', ['响应式', 'reactive']),
+    ('mixin', ['mixin', 'Mixin']),
+    ('computed', ['computed']),
+    ('watch', ['watch']),
+    ('v-model', ['v-model']),
+    ('v-if|v-show', ['v-if', 'v-show']),
+    ('keep-alive', ['keep-alive', 'keepAlive']),
+    ('router', ['router', 'Router', '路由']),
+    ('vuex', ['Vuex', 'vuex']),
+    ('服务端渲染', ['服务端渲染']),
+    ('虚拟dom', ['虚拟DOM']),
+    ('diff', ['diff', 'Diff']),
+    ('fiber', ['Fiber', 'fiber']),
+    ('hooks', ['Hooks', 'hooks', 'useState', 'useEffect']),
+    ('context', ['Context', 'context']),
+    ('refs|ref', ['ref', 'refs', 'useRef']),
+    ('高阶组件', ['高阶组件']),
+    ('受控组件', ['受控组件', '非受控组件']),
+    ('pure component', ['PureComponent', 'Pure Component']),
+    ('生命周期', ['生命周期']),
+    ('immutable', ['Immutable', 'immutable']),
+    ('防抖|节流', ['防抖', '节流']),
+    ('开发者工具', ['开发者工具']),
+    ('coredump', ['coredump', 'core dump']),
+    ('pm2', ['PM2', 'pm2']),
+    ('react native', ['React Native']),
+    ('小程序', ['小程序']),
+    ('taro', ['Taro', 'taro']),
+    ('flutter', ['Flutter', 'flutter']),
+    ('position', ['position']),
+    ('sticky', ['sticky']),
+    ('bind|call|apply', ['bind', 'call', 'apply']),
+    ('localstorage|cookie', ['localStorage', 'cookie']),
+    ('viewport', ['viewport']),
+    ('rem|em', ['rem', 'em', 'vw']),
+    ('选择器', ['选择器', 'selector']),
+    ('浮动', ['浮动', 'float', '清除浮动']),
+    ('事件委托', ['事件委托', 'delegation']),
+    ('1px', ['1px', 'retina']),
+    ('sass|less', ['sass', 'less', 'scss']),
+]
+
+
+# 编译规则表：所有条件词放进一个自动机，并记录 条件词 -> 引用它的规则
+def compile_rules(rules=KEYWORD_RULES):
+    automaton = AhoCorasick()
+    conditions = []       # 每条规则：[[条件词编号, ...](任意一个), ...](同时满足)
+    term_rules = {}       # 条件词编号 -> 规则下标
+    for index, (when, _) in enumerate(rules):
+        groups = []
+        for group in when.split('&'):
+            pids = [automaton.add(canonical(term)) for term in group.split('|')]
+            for pid in pids:
+                term_rules.setdefault(pid, set()).add(index)
+            groups.append(pids)
+        conditions.append(groups)
+    automaton.build()
+    return automaton, conditions, term_rules
+
+
+# 找出题目命中的规则下标，没有命中返回 None
+def match_rule(title, compiled):
+    automaton, conditions, term_rules = compiled
+    present = automaton.first_positions(canonical(title))
+
+    # 只检查出现过的条件词所涉及的规则，取顺序最靠前的一条
+    candidates = set()
+    for pid in present:
+        candidates |= term_rules[pid]
+    for index in sorted(candidates):
+        if all(any(pid in present for pid in group) for group in conditions[index]):
+            return index
+    return None
+
+# 根据题目内容提取关键词（规整后的文本，大小写不同的写法合并为一个）
+# 出现任意一个关键词即算覆盖；没有命中规则时用分词得到的关键词（包括词典外的词）
+def extract_keywords(title, compiled, tokenizer, rules=KEYWORD_RULES):
+    index = match_rule(title, compiled)
+    if index is not None:
+        return list(dict.fromkeys(canonical(keyword) for keyword in rules[index][1]))
+
+    # 默认使用标题分词后的关键词
+    return tokenizer.keywords(title)
+
+
+# 一次扫描规整后的语料，得到 关键词 -> 在全文（原文）中第一次出现的位置
+def build_positions(keywords, corpus):
+    automaton = AhoCorasick(keywords)
+    folded = corpus.folded
+    positions = {}
+    for pos, pid in automaton.iter(folded.text):
+        keyword = automaton.patterns[pid]
+        if keyword in positions:
+            continue
+        original = folded.to_original(pos)
+        md_file, _ = corpus.locate(original)
+        # 跨文件分隔符的命中不算
+        if pos + len(keyword) <= folded.to_folded(md_file.char_end):
+            positions[keyword] = original
+            if len(positions) == len(automaton.patterns):
+                break
+    return positions
+
+
+# 关键词 -> 第一个包含它的文件
+def build_postings(keywords, corpus):
+    return {keyword: corpus.locate(pos)[0].name for keyword, pos in build_positions(keywords, corpus).items()}
+
+
+# 每道题的关键词，以及命中的规则下标（没有命中为 None）
+def checklist_keywords(checklist_questions, corpus, tokenizer=None):
+    compiled = compile_rules()
+    if tokenizer is None:
+        tokenizer = load_tokenizer(corpus)
+    rule_of = {num: match_rule(title, compiled) for num, title in checklist_questions.items()}
+    question_keywords = {num: extract_keywords(title, compiled, tokenizer)
+                         for num, title in checklist_questions.items()}
+    return question_keywords, rule_of
+
+
+# 从清单中提取所有问题编号和标题
+def read_checklist(path=CHECKLIST_FILE):
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    checklist_questions = {}
+    for match in re.finditer(r'^(\d+)\.\s+(.+)$', content, re.MULTILINE):
+        num = int(match.group(1))
+        title = match.group(2).strip()
+        checklist_questions[num] = title
+    return checklist_questions
+
+
+# 检查每个问题是否被覆盖，返回 (已覆盖, 未覆盖)
+def check_checklist(checklist_questions, corpus, tokenizer=None):
+    question_keywords, rule_of = checklist_keywords(checklist_questions, corpus, tokenizer)
+    postings = build_postings({k for keywords in question_keywords.values() for k in keywords}, corpus)
+
+    covered = []
+    not_covered = []
+    for num in sorted(checklist_questions.keys()):
+        title = checklist_questions[num]
+        index = rule_of[num]
+        found_in_files = [postings[k] for k in question_keywords[num] if k in postings]
+        if found_in_files:
+            covered.append((num, title, list(set(found_in_files))))
+            if PROFILER.enabled:
+                PROFILER.count('matcher_hits', KEYWORD_RULES[index][0] if index is not None else '分词')
+        else:
+            not_covered.append((num, title))
+    return covered, not_covered
+
+
+# 对未覆盖的题目做近似匹配（容忍OCR错字），返回 {编号: (距离, 标题所在的 Passage)}
+def approximate_checklist(not_covered, corpus, max_ratio=DEFAULT_MAX_RATIO):
+    index = build_heading_index(corpus)
+    matches = {}
+    for num, title in not_covered:
+        found = approximate_match(title, index, max_ratio)
+        if found:
+            matches[num] = found
+    return matches
+
+
+# 逐个题目产出检查记录（--format jsonl/csv）
+def iter_records(approx=None, corpus=None):
+    with PROFILER.phase('parse_categories'):
+        checklist_questions = read_checklist()
+    if corpus is None:
+        corpus = load_corpus()
+
+    with PROFILER.phase('match'):
+        question_keywords, rule_of = checklist_keywords(checklist_questions, corpus)
+        positions = build_positions({k for keywords in question_keywords.values() for k in keywords}, corpus)
+    index = build_heading_index(corpus) if approx else None
+
+    for num in sorted(checklist_questions):
+        title = checklist_questions[num]
+        rule = rule_of[num]
+        found = [k for k in question_keywords[num] if k in positions]
+        position = positions[found[0]] if found else None
+        if position is not None:
+            matcher = KEYWORD_RULES[rule][0] if rule is not None else '分词'
+            yield position_record('check_coverage', num, None, title, corpus, position, 1.0, matcher)
+            continue
+        match = approximate_match(title, index, approx) if index is not None else None
+        if match:
+            distance, passage = match
+            score = 1 - distance / max(len(normalize(title)), 1)
+            yield position_record('check_coverage', num, None, title, corpus, passage.char_start, score, '近似')
+        else:
+            yield coverage_record('check_coverage', num, None, title)
+
+
+def main(approx=None, corpus=None):
+    with PROFILER.phase('parse_categories'):
+        checklist_questions = read_checklist()
+
+    print(f"📋 清单中的问题总数: {len(checklist_questions)}")
+    print(f"📊 问题编号范围: {min(checklist_questions.keys())} - {max(checklist_questions.keys())}")
+
+    # 读取所有整理文件的内容（整体缓冲区，可以传入已加载的语料）
+    if corpus is None:
+        corpus = load_corpus()
+
+    # 检查每个问题是否被覆盖
+    print("\n" + "="*80)
+    print("🔍 问题覆盖情况检查")
+    print("="*80)
+
+    with PROFILER.phase('match'):
+        covered, not_covered = check_checklist(checklist_questions, corpus)
+
+        # 近似匹配命中的题目也算覆盖
+        approx_matches = {}
+        if approx:
+            approx_matches = approximate_checklist(not_covered, corpus, approx)
+            covered += [(num, title, [approx_matches[num][1].name]) for num, title in not_covered if num in approx_matches]
+            not_covered = [(num, title) for num, title in not_covered if num not in approx_matches]
+
+    with PROFILER.phase('report_render'):
+        print(f"\n✅ 已覆盖: {len(covered)} 个问题 ({len(covered)/len(checklist_questions)*100:.1f}%)")
+        print(f"❌ 未覆盖: {len(not_covered)} 个问题 ({len(not_covered)/len(checklist_questions)*100:.1f}%)")
+
+        if approx_matches:
+            print("\n" + "="*80)
+            print(f"🔍 近似匹配的问题（编辑距离 <= 题目长度 × {approx}）")
+            print("="*80)
+            for num in sorted(approx_matches):
+                distance, passage = approx_matches[num]
+                print(f"{num}. {checklist_questions[num]}")
+                print(f"    ≈ {passage.name} / {passage.title} (距离 {distance})")
+
+        print("\n" + "="*80)
+        print("❌ 未覆盖的问题列表")
+        print("="*80)
+        for num, title in sorted(not_covered):
+            print(f"{num}. {title}")
+
+        print("\n" + "="*80)
+        print("📝 建议")
+        print("="*80)
+
+        # 按类别分组未覆盖的问题
+        categories = {
+            'devtools和调试': [],
+            '跨端开发': [],
+            '监控相关': [],
+            '工程化': [],
+            '其他': []
+        }
+
+        for num, title in not_covered:
+            lower_title = fold(title)
+            if any(k in lower_title for k in ['devtools', 'debug', '调试', 'coredump']):
+                categories['devtools和调试'].append((num, title))
+            elif any(k in lower_title for k in ['rn', 'react native', '小程序', 'taro', 'flutter', '跨端']):
+                categories['跨端开发'].append((num, title))
+            elif any(k in lower_title for k in ['监控', 'monitor', 'pm2']):
+                categories['监控相关'].append((num, title))
+            elif any(k in lower_title for k in ['webpack', 'babel', '工程', '构建']):
+                categories['工程化'].append((num, title))
+            else:
+                categories['其他'].append((num, title))
+
+        for category, questions in categories.items():
+            if questions:
+                print(f"\n【{category}】 {len(questions)}个问题")
+                for num, title in questions[:5]:  # 只显示前5个
+                    print(f"  {num}. {title}")
+                if len(questions) > 5:
+                    print(f"  ... 还有 {len(questions)-5} 个问题")
+
+        print("\n" + "="*80)
+        print("💡 总结")
+        print("="*80)
+        print(f"总问题数: {len(checklist_questions)}")
+        print(f"已覆盖: {len(covered)} ({len(covered)/len(checklist_questions)*100:.1f}%)")
+        print(f"未覆盖: {len(not_covered)} ({len(not_covered)/len(checklist_questions)*100:.1f}%)")
+        print(f"\n需要补充的主要领域: {', '.join([k for k, v in categories.items() if v])}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--approx', nargs='?', type=float, const=DEFAULT_MAX_RATIO, metavar='MAX_RATIO',
+                        help=f'对未覆盖的题目按编辑距离近似匹配标题，容忍OCR错字（默认距离上限为题目长度 × {DEFAULT_MAX_RATIO}）')
+    add_format_arguments(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    if args.profile:
+        PROFILER.enable('check_coverage')
+    if args.format != 'text':
+        write_records(iter_records(approx=args.approx), args.format, args.output)
     else:
-        categories['其他'].append((num, title))
-
-for category, questions in categories.items():
-    if questions:
-        print(f"\n【{category}】 {len(questions)}个问题")
-        for num, title in questions[:5]:  # 只显示前5个
-            print(f"  {num}. {title}")
-        if len(questions) > 5:
-            print(f"  ... 还有 {len(questions)-5} 个问题")
-
-print("\n" + "="*80)
-print("💡 总结")
-print("="*80)
-print(f"总问题数: {len(checklist_questions)}")
-print(f"已覆盖: {len(covered)} ({len(covered)/len(checklist_questions)*100:.1f}%)")
-print(f"未覆盖: {len(not_covered)} ({len(not_covered)/len(checklist_questions)*100:.1f}%)")
-print(f"\n需要补充的主要领域: {', '.join([k for k, v in categories.items() if v])}")
+        main(approx=args.approx)
+    PROFILER.dump(args.profile)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+分类整理文档的统一解析器
+
+逐行流式读取，自动识别三种格式：
+  - markdown：`## 01. 分类`，其下带编号的标题（`### 3.5 分组` / `#### 3.5.4 问题`）中
+    最深的一层是问题：有带编号的子标题的是分组，不算问题（分类整理文档.md）
+  - 行号导出：`NNN→内容`（从编辑器导出的 分类整理文档）
+  - 纯文本：每行一个分类或问题，分类行包含 CATEGORY_KEYWORDS 中的关键词
+只保留当前分类名（markdown 中再加上最近一个还不确定是不是分组的标题），内存占用与文件大小无关。
+"""
+
+import os
+import re
+from collections import namedtuple
+
+DOC_CANDIDATES = ['分类整理文档.md', '分类整理文档']
+# 另一份问题来源：图片问题清单（check_coverage.py 检查）
+CHECKLIST_FILE = '图片问题完整清单.md'
+
+# 纯文本格式中的分类标题关键词
+CATEGORY_KEYWORDS = [
+    '数据结构和算法',
+    '开发语言',
+    '前端框架',
+    '性能优化',
+    'debug能力',
+    '前端监控',
+    '跨端经验',
+    '工程化/架构设计',
+    '网络协议',
+    'web安全'
+]
+
+FORMAT_MARKDOWN = 'markdown'
+FORMAT_ARROW = 'arrow'
+FORMAT_PLAIN = 'plain'
+
+MD_CATEGORY_RE = re.compile(r'^##\s+(\d+)\.\s*(.+?)\s*$')
+MD_QUESTION_RE = re.compile(r'^(#{3,6})\s+(\d+(?:\.\d+)*)\.?\s+(.+?)\s*$')
+ARROW_RE = re.compile(r'^\s*(\d+)→(.*)$')
+
+# kind: 'category' 或 'question'；lineno 为文件中的行号（从1开始）
+# number: markdown 中的编号（"01" / "1.1"），行号导出中的原始行号，纯文本为 None
+Record = namedtuple('Record', ['kind', 'lineno', 'category', 'text', 'number'])
+
+
+# 找到分类整理文档（优先 .md）
+def find_classification_doc(directory='.'):
+    for name in DOC_CANDIDATES:
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            return path
+    return os.path.join(directory, DOC_CANDIDATES[0])
+
+
+# 根据第一条非空行判断格式
+def detect_format(line):
+    if ARROW_RE.match(line):
+        return FORMAT_ARROW
+    if line.lstrip().startswith('#'):
+        return FORMAT_MARKDOWN
+    return FORMAT_PLAIN
+
+
+# 去掉分类名中的括号说明
+def strip_category_note(text):
+    return text.split('(')[0].split('（')[0].strip()
+
+
+# 行号导出格式中判断是否是分类标题：
+# 没有问号，并且以已知分类关键词开头；还没有遇到分类时，退回到
+# “内容较短或带括号说明”的判断，兼容不在关键词表里的分类
+def is_arrow_category(content, has_category=True):
+    if '?' in content or '？' in content:
+        return False
+    if content.startswith(tuple(CATEGORY_KEYWORDS)):
+        return True
+    if has_category:
+        return False
+    has_parenthesis = '(' in content or '（' in content
+    return len(content) < 30 or (has_parenthesis and len(content) <= 50)
+
+
+# markdown 中带编号的标题要看到下一个带编号的标题才知道是不是分组：
+# state['pending'] 为 (标题级别, Record)，下一个标题更深时它是分组，丢弃；否则它是问题
+def _flush_pending(state):
+    pending = state.pop('pending', None)
+    if pending is not None:
+        yield pending[1]
+
+
+def _parse_markdown(lineno, line, state):
+    match = MD_CATEGORY_RE.match(line)
+    if match:
+        yield from _flush_pending(state)
+        state['category'] = strip_category_note(match.group(2))
+        yield Record('category', lineno, state['category'], match.group(2), match.group(1))
+        return
+
+    match = MD_QUESTION_RE.match(line)
+    if match and state['category']:
+        level = len(match.group(1))
+        pending = state.get('pending')
+        if pending is not None and level > pending[0]:
+            del state['pending']
+        else:
+            yield from _flush_pending(state)
+        state['pending'] = (level, Record('question', lineno, state['category'], match.group(3), match.group(2)))
+        return
+
+    # 其他二级标题（如“目录”“附录”）结束当前分类
+    if line.startswith('## '):
+        yield from _flush_pending(state)
+        state['category'] = None
+
+
+def _parse_arrow(lineno, line, state):
+    match = ARROW_RE.match(line)
+    if not match:
+        return
+    number, content = match.group(1), match.group(2).strip()
+    if not content:
+        return
+
+    if is_arrow_category(content, state['category'] is not None):
+        state['category'] = strip_category_note(content)
+        yield Record('category', lineno, state['category'], content, number)
+    elif state['category']:
+        yield Record('question', lineno, state['category'], content, number)
+
+
+def _parse_plain(lineno, line, state):
+    if any(keyword in line for keyword in CATEGORY_KEYWORDS) and len(line) < 100:
+        state['category'] = strip_category_note(line)
+        yield Record('category', lineno, state['category'], line, None)
+    elif state['category']:
+        yield Record('question', lineno, state['category'], line, None)
+
+
+PARSERS = {
+    FORMAT_MARKDOWN: _parse_markdown,
+    FORMAT_ARROW: _parse_arrow,
+    FORMAT_PLAIN: _parse_plain,
+}
+
+
+# 流式解析
+def iter_records(lines, fmt=None):
+    """逐行解析，产出分类和问题记录；fmt 为 None 时按第一条非空行自动识别"""
+    parse = PARSERS[fmt] if fmt else None
+    state = {'category': None}
+
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if parse is None:
+            parse = PARSERS[detect_format(line)]
+        yield from parse(lineno, line, state)
+    yield from _flush_pending(state)
+
+
+def iter_classification(path=None, fmt=None):
+    """流式读取分类整理文档，产出 Record"""
+    with open(path or find_classification_doc(), 'r', encoding='utf-8') as f:
+        yield from iter_records(f, fmt)
+
+
+# 读取为 {分类: [问题, ...]}
+def load_categories(path=None, fmt=None):
+    categories = {}
+    for record in iter_classification(path, fmt):
+        if record.kind == 'category':
+            categories.setdefault(record.category, [])
+        else:
+            categories[record.category].append(record.text)
+    return categories
@@ -5,54 +5,32 @@
 对比分类整理文档和质量检查报告，找出缺失的问题
 """
 
+import argparse
 import re
+from bisect import bisect_right
+
+from classification import iter_classification
+from matcher import AhoCorasick
+from ngram_index import DEFAULT_MIN_SCORE, NgramIndex
+from parallel import parallel_map
+from profiling import PROFILER, add_profile_argument
+from records import add_format_arguments, coverage_record, write_records
+from synonyms import canonical
 
 # 解析分类整理文档
 def parse_classification_doc():
     """解析分类整理文档，提取所有分类和问题"""
-    with open('分类整理文档.md', 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    # 定义分类关键词
-    category_keywords = [
-        '数据结构和算法',
-        '开发语言',
-        '前端框架',
-        '性能优化',
-        'debug能力',
-        '前端监控',
-        '跨端经验',
-        '工程化/架构设计',
-        '网络协议',
-        'web安全'
-    ]
-
     categories = {}
-    current_category = None
     question_count = 0
 
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        # 检查是否是分类标题
-        is_category = False
-        for keyword in category_keywords:
-            if keyword in line and len(line) < 100:
-                is_category = True
-                # 提取分类名（去掉括号说明）
-                category_name = line.split('(')[0].split('（')[0].strip()
-                current_category = category_name
-                categories[current_category] = []
-                break
-
-        if not is_category and current_category:
-            # 这是一个问题
+    for record in iter_classification():
+        if record.kind == 'category':
+            categories.setdefault(record.category, [])
+        else:
             question_count += 1
-            categories[current_category].append({
+            categories[record.category].append({
                 'id': question_count,
-                'question': line
+                'question': record.text
             })
 
     return categories, question_count
@@ -94,47 +72,173 @@ def parse_quality_report():
 
     return completed_questions
 
-# 智能匹配问题
-def match_question(target_q, completed_questions):
-    """智能匹配问题是否已完成"""
-    # 清理目标问题
-    target_clean = target_q.strip()
-    # 移除问号
-    target_clean = target_clean.replace('?', '').replace('？', '')
-    # 移除括号说明
-    target_clean = re.sub(r'[（(].*?[)）]', '', target_clean).strip()
-
-    # 尝试匹配
-    for completed in completed_questions:
-        completed_q = completed['question']
-        # 移除问号
-        completed_clean = completed_q.replace('?', '').replace('？', '')
-        # 移除括号说明
-        completed_clean = re.sub(r'[（(].*?[)）]', '', completed_clean).strip()
+# 清理问题文本：规整（全角标点折叠为半角、大小写不敏感）后移除问号和括号说明
+def clean_question(question):
+    cleaned = canonical(question).strip().replace('?', '')
+    return re.sub(r'\(.*?\)', '', cleaned).strip()
+
+# 已完成问题索引
+class CompletedIndex:
+    """
+    已完成问题只规整一次，建立完整匹配表、前15字符前缀表和包含关系结构，
+    匹配结果按规整后的目标问题缓存，生成报告时直接复用。
+    指定 fuzzy（最低 Jaccard 得分）时，以上规则都匹配不到的问题再用 n-gram 索引模糊查找，
+    命中结果带 fuzzy_score 字段。所有命中结果都带 matcher 字段，记录结果来自哪条规则。
+    """
+
+    def __init__(self, completed_questions, fuzzy=None):
+        self.completed = completed_questions
+        self.cleans = [clean_question(c['question']) for c in completed_questions]
+
+        # 1. 完整匹配：规整文本 -> 最小下标
+        self.exact = {}
+        # 4. 前15字符前缀（仅长度大于10的问题）-> 最小下标
+        self.prefix = {}
+        # 3. 已完成问题（及其前缀）包含在目标问题中：一个自动机扫描目标问题
+        self.full_automaton = AhoCorasick()
+        self.full_owner = {}
+        self.prefix_automaton = AhoCorasick()
+        self.prefix_owner = {}
+
+        for i, c in enumerate(self.cleans):
+            self.exact.setdefault(c, i)
+            self.full_owner.setdefault(self.full_automaton.add(c), i)
+            if len(c) > 10:
+                key = c[:15]
+                self.prefix.setdefault(key, i)
+                self.prefix_owner.setdefault(self.prefix_automaton.add(key), i)
+
+        # 2. 目标问题包含在已完成问题中：在拼接串里查找，首个命中即最小下标
+        self.joined = '\0'.join(self.cleans)
+        self.starts = []
+        pos = 0
+        for c in self.cleans:
+            self.starts.append(pos)
+            pos += len(c) + 1
+        self.long_mask = [len(c) > 10 for c in self.cleans]
+
+        # 5. 模糊匹配：已完成问题的字符 n-gram 索引
+        self.fuzzy = fuzzy
+        self.fuzzy_index = None
+        if fuzzy:
+            self.fuzzy_index = NgramIndex()
+            for i, c in enumerate(self.cleans):
+                self.fuzzy_index.add(c, i)
+
+        self.cache = {}
+
+    def _owner_of(self, pos):
+        return bisect_right(self.starts, pos) - 1
+
+    def _first_containing(self, text, long_only=False):
+        """返回包含 text 的最小下标（long_only 时只看长度大于10的问题）"""
+        if not self.cleans:
+            return None
+        pos = self.joined.find(text)
+        while pos != -1:
+            i = self._owner_of(pos)
+            if not long_only or self.long_mask[i]:
+                return i
+            pos = self.joined.find(text, self.starts[i] + len(self.cleans[i]) + 1)
+        return None
+
+    def match(self, target_q):
+        """智能匹配问题是否已完成，返回 (是否匹配, 匹配到的已完成问题)"""
+        target_clean = clean_question(target_q)
+        if target_clean in self.cache:
+            return self.cache[target_clean]
+
+        candidates = []
+        ends = []       # 各条规则结束时的候选个数，用来找出最终结果来自哪条规则
 
         # 1. 完整匹配
-        if target_clean == completed_clean:
-            return True, completed
+        if target_clean in self.exact:
+            candidates.append(self.exact[target_clean])
+            PROFILER.count('matcher_hits', '完整匹配')
+        ends.append(('完整匹配', len(candidates)))
 
         # 2. 目标问题包含在已完成问题中
-        if target_clean in completed_clean:
-            return True, completed
+        i = self._first_containing(target_clean)
+        if i is not None:
+            candidates.append(i)
+            PROFILER.count('matcher_hits', '被包含')
+        ends.append(('被包含', len(candidates)))
 
         # 3. 已完成问题包含在目标问题中
-        if completed_clean in target_clean:
-            return True, completed
+        owners = [self.full_owner[pid] for pid in self.full_automaton.first_positions(target_clean)]
+        if owners:
+            candidates.extend(owners)
+            PROFILER.count('matcher_hits', '包含')
+        ends.append(('包含', len(candidates)))
 
         # 4. 提取核心关键词（前15个字符）
-        if len(target_clean) > 10 and len(completed_clean) > 10:
+        if len(target_clean) > 10:
             target_key = target_clean[:15]
-            completed_key = completed_clean[:15]
-            if target_key == completed_key or target_key in completed_clean or completed_key in target_clean:
-                return True, completed
+            before = len(candidates)
+            if target_key in self.prefix:
+                candidates.append(self.prefix[target_key])
+            i = self._first_containing(target_key, long_only=True)
+            if i is not None:
+                candidates.append(i)
+            for pid in self.prefix_automaton.first_positions(target_clean):
+                candidates.append(self.prefix_owner[pid])
+            if len(candidates) > before:
+                PROFILER.count('matcher_hits', '前15字')
+        ends.append(('前15字', len(candidates)))
+
+        # 5. 模糊匹配
+        best = None
+        if not candidates and self.fuzzy_index is not None:
+            best = self.fuzzy_index.best(target_clean, self.fuzzy, metric='jaccard')
+
+        if candidates:
+            first = candidates.index(min(candidates))
+            matcher = next(label for label, end in ends if first < end)
+            result = (True, dict(self.completed[candidates[first]], matcher=matcher))
+        elif best:
+            score, i = best
+            PROFILER.count('matcher_hits', '模糊')
+            result = (True, dict(self.completed[i], fuzzy_score=score, matcher='模糊'))
+        else:
+            result = (False, None)
+        self.cache[target_clean] = result
+        return result
+
+    def match_all(self, questions, jobs=None):
+        """在进程池中匹配一批问题并写入缓存，之后 match() 直接返回缓存的结果"""
+        questions = list(questions)
+        for q, result in zip(questions, parallel_map(self.match, questions, jobs)):
+            self.cache[clean_question(q)] = result
+
+# 智能匹配问题
+def match_question(target_q, completed_questions):
+    """智能匹配问题是否已完成"""
+    if not isinstance(completed_questions, CompletedIndex):
+        completed_questions = CompletedIndex(completed_questions)
+    return completed_questions.match(target_q)
+
+# 逐个问题产出检查记录（--format jsonl/csv）
+# 对比的对象是质量检查报告：file 为报告中的文件编号，section 为匹配到的已完成问题
+def iter_records(jobs=1, fuzzy=None):
+    with PROFILER.phase('parse_categories'):
+        all_categories, _ = parse_classification_doc()
+    with PROFILER.phase('parse_report'):
+        completed_index = CompletedIndex(parse_quality_report(), fuzzy)
+    if jobs != 1:
+        completed_index.match_all((q['question'] for qs in all_categories.values() for q in qs), jobs)
 
-    return False, None
+    for category, questions in all_categories.items():
+        for q_info in questions:
+            matched, match_info = completed_index.match(q_info['question'])
+            if matched:
+                yield coverage_record('compare_questions', q_info['id'], category, q_info['question'], True,
+                                      match_info['file_num'], match_info['question'], None,
+                                      round(match_info.get('fuzzy_score', 1.0), 4), match_info['matcher'])
+            else:
+                yield coverage_record('compare_questions', q_info['id'], category, q_info['question'])
 
 # 主函数
-def main():
+def main(jobs=1, fuzzy=None):
     print("=" * 100)
     print(" " * 35 + "📋 问题覆盖度对比分析")
     print("=" * 100)
@@ -142,14 +246,16 @@ def main():
 
     # 1. 解析分类整理文档
     print("📖 正在解析分类整理文档...")
-    all_categories, total_questions = parse_classification_doc()
+    with PROFILER.phase('parse_categories'):
+        all_categories, total_questions = parse_classification_doc()
     print(f"   ✓ 找到 {len(all_categories)} 个分类")
     print(f"   ✓ 找到 {total_questions} 个问题")
     print()
 
     # 2. 解析质量检查报告
     print("📊 正在解析质量检查报告...")
-    completed_questions = parse_quality_report()
+    with PROFILER.phase('parse_report'):
+        completed_questions = parse_quality_report()
     print(f"   ✓ 找到 {len(completed_questions)} 个已完成问题")
     print()
 
@@ -161,133 +267,163 @@ def main():
 
     all_missing = []
     all_covered = []
+    with PROFILER.phase('match'):
+        completed_index = CompletedIndex(completed_questions, fuzzy)
+        if jobs != 1:
+            # 并行模式：先按问题切分给多个进程算出全部匹配结果
+            completed_index.match_all((q['question'] for qs in all_categories.values() for q in qs), jobs)
+    category_stats = {}
 
     for category, questions in all_categories.items():
-        print(f"\n【{category}】")
-        print("-" * 100)
-
-        covered = []
-        missing = []
-
-        for q_info in questions:
-            q_id = q_info['id']
-            q_text = q_info['question']
-
-            matched, match_info = match_question(q_text, completed_questions)
-
-            if matched:
-                covered.append({
-                    'id': q_id,
-                    'question': q_text,
-                    'matched_in': match_info
-                })
-                all_covered.append({
-                    'category': category,
-                    'id': q_id,
-                    'question': q_text,
-                    'matched_in': match_info
-                })
-            else:
-                missing.append({
-                    'id': q_id,
-                    'question': q_text
-                })
-                all_missing.append({
-                    'category': category,
-                    'id': q_id,
-                    'question': q_text
-                })
-
-        total = len(questions)
-        covered_count = len(covered)
-        missing_count = len(missing)
-        rate = (covered_count / total * 100) if total > 0 else 0
-
-        if rate == 100:
-            status = "✅ 完美"
-        elif rate >= 80:
-            status = "🟢 优秀"
-        elif rate >= 60:
-            status = "🟡 良好"
-        elif rate >= 40:
-            status = "🟠 一般"
-        else:
-            status = "🔴 较差"
-
-        print(f"问题总数: {total} | 已覆盖: {covered_count} | 未覆盖: {missing_count} | 覆盖率: {rate:.1f}% {status}")
-
-        if missing:
-            print(f"\n❌ 缺失的问题 ({missing_count}个):")
-            for m in missing:
-                # 截断过长的问题
-                q_display = m['question'] if len(m['question']) <= 80 else m['question'][:80] + "..."
-                print(f"  {m['id']:3d}. {q_display}")
-
-    # 4. 总结
-    print()
-    print("=" * 100)
-    print("📈 总体统计")
-    print("=" * 100)
-    print(f"问题总数: {total_questions}")
-    print(f"已覆盖: {len(all_covered)} ({len(all_covered)/total_questions*100:.1f}%)")
-    print(f"未覆盖: {len(all_missing)} ({len(all_missing)/total_questions*100:.1f}%)")
-    print()
+        with PROFILER.timed('category_ms', category):
+            print(f"\n【{category}】")
+            print("-" * 100)
 
-    # 5. 详细缺失问题列表
-    if all_missing:
+            covered = []
+            missing = []
+
+            with PROFILER.phase('match'):
+                for q_info in questions:
+                    q_id = q_info['id']
+                    q_text = q_info['question']
+
+                    matched, match_info = completed_index.match(q_text)
+
+                    if matched:
+                        covered.append({
+                            'id': q_id,
+                            'question': q_text,
+                            'matched_in': match_info
+                        })
+                        all_covered.append({
+                            'category': category,
+                            'id': q_id,
+                            'question': q_text,
+                            'matched_in': match_info
+                        })
+                    else:
+                        missing.append({
+                            'id': q_id,
+                            'question': q_text
+                        })
+                        all_missing.append({
+                            'category': category,
+                            'id': q_id,
+                            'question': q_text
+                        })
+
+            with PROFILER.phase('report_render'):
+                total = len(questions)
+                covered_count = len(covered)
+                missing_count = len(missing)
+                rate = (covered_count / total * 100) if total > 0 else 0
+                category_stats[category] = (total, covered_count, missing_count, rate)
+
+                if rate == 100:
+                    status = "✅ 完美"
+                elif rate >= 80:
+                    status = "🟢 优秀"
+                elif rate >= 60:
+                    status = "🟡 良好"
+                elif rate >= 40:
+                    status = "🟠 一般"
+                else:
+                    status = "🔴 较差"
+
+                print(f"问题总数: {total} | 已覆盖: {covered_count} | 未覆盖: {missing_count} | 覆盖率: {rate:.1f}% {status}")
+
+                if missing:
+                    print(f"\n❌ 缺失的问题 ({missing_count}个):")
+                    for m in missing:
+                        # 截断过长的问题
+                        q_display = m['question'] if len(m['question']) <= 80 else m['question'][:80] + "..."
+                        print(f"  {m['id']:3d}. {q_display}")
+
+                fuzzy_matched = [c for c in covered if 'fuzzy_score' in c['matched_in']]
+                if fuzzy_matched:
+                    print(f"\n🔍 模糊匹配的问题 ({len(fuzzy_matched)}个):")
+                    for c in fuzzy_matched:
+                        q_display = c['question'] if len(c['question']) <= 80 else c['question'][:80] + "..."
+                        print(f"  {c['id']:3d}. {q_display}")
+                        print(f"       ≈ {c['matched_in']['question']} ({c['matched_in']['fuzzy_score']:.2f})")
+
+    with PROFILER.phase('report_render'):
+        # 4. 总结
+        print()
         print("=" * 100)
-        print("❌ 所有缺失问题详细列表")
+        print("📈 总体统计")
         print("=" * 100)
+        print(f"问题总数: {total_questions}")
+        print(f"已覆盖: {len(all_covered)} ({len(all_covered)/total_questions*100:.1f}%)")
+        print(f"未覆盖: {len(all_missing)} ({len(all_missing)/total_questions*100:.1f}%)")
+        print()
+
+        # 5. 详细缺失问题列表
+        if all_missing:
+            print("=" * 100)
+            print("❌ 所有缺失问题详细列表")
+            print("=" * 100)
+
+            # 按分类分组
+            missing_by_category = {}
+            for m in all_missing:
+                cat = m['category']
+                if cat not in missing_by_category:
+                    missing_by_category[cat] = []
+                missing_by_category[cat].append(m)
+
+            for category, items in missing_by_category.items():
+                print(f"\n【{category}】 共{len(items)}个缺失:")
+                print("-" * 100)
+                for item in items:
+                    print(f"  {item['id']:3d}. {item['question']}")
+
+        # 6. 生成Markdown格式的报告
+        print()
+        print("=" * 100)
+        print("📝 生成缺失问题报告...")
 
-        # 按分类分组
-        missing_by_category = {}
-        for m in all_missing:
-            cat = m['category']
-            if cat not in missing_by_category:
-                missing_by_category[cat] = []
-            missing_by_category[cat].append(m)
-
-        for category, items in missing_by_category.items():
-            print(f"\n【{category}】 共{len(items)}个缺失:")
-            print("-" * 100)
-            for item in items:
-                print(f"  {item['id']:3d}. {item['question']}")
-
-    # 6. 生成Markdown格式的报告
-    print()
-    print("=" * 100)
-    print("📝 生成缺失问题报告...")
-
-    with open('缺失问题报告.md', 'w', encoding='utf-8') as f:
-        f.write("# QPON面试题库缺失问题报告\n\n")
-        f.write(f"生成时间: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+    with PROFILER.phase('report_write'):
+        with open('缺失问题报告.md', 'w', encoding='utf-8') as f:
+            f.write("# QPON面试题库缺失问题报告\n\n")
+            f.write(f"生成时间: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
 
-        f.write("## 统计概览\n\n")
-        f.write(f"- **问题总数**: {total_questions}\n")
-        f.write(f"- **已覆盖**: {len(all_covered)} ({len(all_covered)/total_questions*100:.1f}%)\n")
-        f.write(f"- **未覆盖**: {len(all_missing)} ({len(all_missing)/total_questions*100:.1f}%)\n\n")
+            f.write("## 统计概览\n\n")
+            f.write(f"- **问题总数**: {total_questions}\n")
+            f.write(f"- **已覆盖**: {len(all_covered)} ({len(all_covered)/total_questions*100:.1f}%)\n")
+            f.write(f"- **未覆盖**: {len(all_missing)} ({len(all_missing)/total_questions*100:.1f}%)\n\n")
 
-        f.write("## 分类覆盖情况\n\n")
-        f.write("| 分类 | 总数 | 已覆盖 | 未覆盖 | 覆盖率 |\n")
-        f.write("|------|------|--------|--------|--------|\n")
+            f.write("## 分类覆盖情况\n\n")
+            f.write("| 分类 | 总数 | 已覆盖 | 未覆盖 | 覆盖率 |\n")
+            f.write("|------|------|--------|--------|--------|\n")
 
-        for category, questions in all_categories.items():
-            total = len(questions)
-            covered_count = sum(1 for q in questions if match_question(q['question'], completed_questions)[0])
-            missing_count = total - covered_count
-            rate = (covered_count / total * 100) if total > 0 else 0
-            f.write(f"| {category} | {total} | {covered_count} | {missing_count} | {rate:.1f}% |\n")
+            # 复用第一遍的匹配结果
+            for category, (total, covered_count, missing_count, rate) in category_stats.items():
+                f.write(f"| {category} | {total} | {covered_count} | {missing_count} | {rate:.1f}% |\n")
 
-        f.write("\n## 缺失问题详细列表\n\n")
+            f.write("\n## 缺失问题详细列表\n\n")
 
-        for category, items in missing_by_category.items():
-            f.write(f"### {category} ({len(items)}个)\n\n")
-            for item in items:
-                f.write(f"{item['id']}. {item['question']}\n")
-            f.write("\n")
+            for category, items in missing_by_category.items():
+                f.write(f"### {category} ({len(items)}个)\n\n")
+                for item in items:
+                    f.write(f"{item['id']}. {item['question']}\n")
+                f.write("\n")
 
     print("   ✓ 报告已保存到: 缺失问题报告.md")
     print("=" * 100)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='并行进程数，0 表示使用全部CPU核心')
+    parser.add_argument('--fuzzy', nargs='?', type=float, const=DEFAULT_MIN_SCORE, metavar='MIN_SCORE',
+                        help=f'规则匹配不到时用字符 n-gram 索引模糊查找（默认最低得分 {DEFAULT_MIN_SCORE}）')
+    add_format_arguments(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    if args.profile:
+        PROFILER.enable('compare_questions')
+    if args.format != 'text':
+        write_records(iter_records(jobs=args.jobs, fuzzy=args.fuzzy), args.format, args.output)
+    else:
+        main(jobs=args.jobs, fuzzy=args.fuzzy)
+    PROFILER.dump(args.profile)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+题库语料加载，供各检查脚本共用
+
+所有MD文件规整后（统一换行符、去掉BOM）按文件名顺序以 '\\n' 拼接，存放在
+一块连续的 UTF-8 缓冲区里，另有偏移数组把位置映射回文件和章节。缓冲区和
+标题索引、文件统计一起缓存在 .qbank_cache/ 下：
+  - 按 文件大小+mtime 判断文件是否变化；mtime 变了但 git blob SHA 没变的文件
+    （如 git checkout 之后）同样直接复用缓存，不再解码和解析
+  - 没有文件变化时直接 mmap 缓存的缓冲区，不再拷贝
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping
+
+from discovery import load_config
+from headings import HeadingIndex
+from profiling import PROFILER
+from synonyms import default_synonyms
+from textnorm import FoldedText
+
+# 不参与覆盖检查的MD文件（配置中的 exclude_names）
+EXCLUDE = load_config()['exclude_names']
+
+CACHE_DIR = '.qbank_cache'
+CACHE_VERSION = 4
+
+SEPARATOR = '\n'
+
+
+# 列出目录下参与检查的MD文件
+def list_md_files(directory='.', exclude=EXCLUDE):
+    return sorted(f for f in os.listdir(directory) if f.endswith('.md') and f not in exclude)
+
+
+# 计算与 `git hash-object` 一致的 blob SHA
+def git_blob_sha(data):
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+# 统一换行符、去掉BOM
+def normalize_text(text):
+    if text.startswith('\ufeff'):
+        text = text[1:]
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+# 解析单个文件，返回 (规整后的 UTF-8 字节, 标题索引, 统计信息)
+def _parse_file(data):
+    text = normalize_text(data.decode('utf-8'))
+    encoded = text.encode('utf-8')
+    headings = HeadingIndex.build(text)
+    stats = {
+        'bytes': len(encoded),
+        'chars': len(text),
+        'lines': text.count('\n'),
+        'headings': len(headings),
+        'questions': headings.question_count(),
+    }
+    return encoded, headings, stats
+
+
+class MdFile:
+    """语料中的单个MD文件，文本按需从整体缓冲区中切出"""
+
+    __slots__ = ('name', 'headings', 'stats', 'blob', 'start', 'end', 'char_start', 'char_end', '_corpus')
+
+    def __init__(self, corpus, name, headings, stats, blob, start, char_start):
+        self._corpus = corpus
+        self.name = name
+        self.headings = headings
+        self.stats = stats
+        self.blob = blob
+        self.start = start
+        self.end = start + stats['bytes']
+        self.char_start = char_start
+        self.char_end = char_start + stats['chars']
+
+    @property
+    def text(self):
+        return self._corpus.text[self.char_start:self.char_end]
+
+    def view(self):
+        """文件内容的 memoryview（UTF-8），不拷贝"""
+        return self._corpus.view[self.start:self.end]
+
+
+class Corpus(Mapping):
+    """
+    整体语料：一块连续缓冲区 + 每个文件的字节/字符偏移。
+    按 {文件名: MdFile} 的方式访问，text 为拼接后的全文（解码一次后复用），
+    folded 为规整并按同义词表改写后的全文及其到 text 的位置映射（第一次访问时计算）。
+    """
+
+    def __init__(self, buffer, entries):
+        self.buffer = buffer
+        self.view = memoryview(buffer)
+        self.files = {}
+        self.byte_starts = array('Q')
+        self.char_starts = array('Q')
+        self._text = None
+        self._folded = None
+
+        byte_pos = 0
+        char_pos = 0
+        for name, headings, stats, blob in entries:
+            md_file = MdFile(self, name, headings, stats, blob, byte_pos, char_pos)
+            self.files[name] = md_file
+            self.byte_starts.append(byte_pos)
+            self.char_starts.append(char_pos)
+            byte_pos = md_file.end + len(SEPARATOR)
+            char_pos = md_file.char_end + len(SEPARATOR)
+        self._order = list(self.files.values())
+
+    def __getitem__(self, name):
+        return self.files[name]
+
+    def __iter__(self):
+        return iter(self.files)
+
+    def __len__(self):
+        return len(self.files)
+
+    @property
+    def text(self):
+        """拼接后的全文，等同于 '\\n'.join(各文件文本)"""
+        if self._text is None:
+            with PROFILER.phase('read_decode'):
+                self._text = str(self.view, 'utf-8')
+        return self._text
+
+    @property
+    def folded(self):
+        """规整并改写别名后的全文（textnorm.FoldedText），匹配在它上面进行，命中位置用 to_original 换回 text 中的位置"""
+        if self._folded is None:
+            with PROFILER.phase('normalize'):
+                self._folded = FoldedText(self.text, default_synonyms())
+        return self._folded
+
+    def find(self, sub, name=None, start=0):
+        """在全文（或指定文件）中查找，返回全文中的字符偏移，找不到为 -1"""
+        if name is None:
+            return self.text.find(sub, start)
+        md_file = self.files[name]
+        return self.text.find(sub, max(start, md_file.char_start), md_file.char_end)
+
+    def contains(self, name, sub):
+        return self.find(sub, name) != -1
+
+    def locate(self, char_offset):
+        """把全文中的字符偏移映射到 (MdFile, 所在章节)；落在文件间分隔符上时章节为 None"""
+        i = bisect_right(self.char_starts, char_offset) - 1
+        if i < 0:
+            return None, None
+        md_file = self._order[i]
+        if char_offset >= md_file.char_end:
+            return md_file, None
+        return md_file, md_file.headings.section_at(char_offset - md_file.char_start)
+
+    def locate_byte(self, byte_offset):
+        """把缓冲区中的字节偏移映射到 (MdFile, 文件内字节偏移)"""
+        i = bisect_right(self.byte_starts, byte_offset) - 1
+        if i < 0:
+            return None, None
+        md_file = self._order[i]
+        return md_file, byte_offset - md_file.start
+
+
+def _cache_paths(directory, exclude, walked=False):
+    key = '\0'.join(sorted(exclude)) + ('\0walk' if walked else '')
+    signature = hashlib.sha1(key.encode('utf-8')).hexdigest()[:10]
+    base = os.path.join(directory, CACHE_DIR, f'corpus-{signature}')
+    return base + '.pickle', base + '.buf'
+
+
+def _load_cache(meta_path, buf_path):
+    try:
+        with open(meta_path, 'rb') as f:
+            cache = pickle.load(f)
+        if cache.get('version') != CACHE_VERSION:
+            return {}, b''
+        with open(buf_path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if cache['length'] else b''
+    except (OSError, ValueError, EOFError, KeyError, pickle.UnpicklingError, AttributeError, ImportError):
+        return {}, b''
+    if len(buffer) != cache['length']:
+        return {}, b''
+    return cache['files'], buffer
+
+
+def _write_atomic(path, write):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def _save_cache(meta_path, buf_path, files, buffer):
+    try:
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        # 先写缓冲区再写元数据，元数据里的长度对不上时整个缓存作废
+        _write_atomic(buf_path, lambda f: f.write(buffer))
+        cache = {'version': CACHE_VERSION, 'length': len(buffer), 'files': files}
+        _write_atomic(meta_path, lambda f: pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        # 缓存写不进去（如只读目录）不影响检查结果
+        pass
+
+
+# 加载语料
+def load_corpus(directory='.', exclude=EXCLUDE, use_cache=True, names=None):
+    """
+    加载目录下的MD文件，返回 Corpus；未变化的文件直接从缓存取出。
+    names 为 discovery.discover 得到的相对路径列表时，加载这些文件（可跨子目录）。
+    """
+    walked = names is not None
+    with PROFILER.phase('list_files'):
+        if names is None:
+            names = list_md_files(directory, exclude)
+    with PROFILER.phase('read_decode'):
+        return _load_corpus(directory, exclude, use_cache, names, walked)
+
+
+# 加载整个仓库（或 root 下）发现的全部MD文件
+def load_repo_corpus(root=None, config=None, include=None, exclude=None, use_cache=True):
+    from discovery import discover, find_repo_root
+
+    root = root or find_repo_root()
+    with PROFILER.phase('list_files'):
+        names = discover(root, config, include, exclude)
+    return load_corpus(root, use_cache=use_cache, names=names)
+
+
+def _load_corpus(directory, exclude, use_cache, names, walked):
+    meta_path, buf_path = _cache_paths(directory, exclude, walked)
+    cached, old_buffer = _load_cache(meta_path, buf_path) if use_cache else ({}, b'')
+
+    files = {}
+    entries = []
+    dirty = list(cached) != names
+
+    for name in names:
+        path = os.path.join(directory, name)
+        st = os.stat(path)
+        entry = cached.get(name)
+
+        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            files[name] = entry
+        else:
+            with open(path, 'rb') as f:
+                data = f.read()
+            blob = git_blob_sha(data)
+            if entry and entry['blob'] == blob:
+                entry = dict(entry, size=st.st_size, mtime_ns=st.st_mtime_ns)
+            else:
+                encoded, headings, stats = _parse_file(data)
+                entry = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'blob': blob,
+                         'headings': headings, 'stats': stats, 'data': encoded}
+            files[name] = entry
+            dirty = True
+        entries.append((name, entry['headings'], entry['stats'], entry['blob']))
+
+    if not dirty:
+        # 没有任何变化：直接使用 mmap 的缓冲区
+        return Corpus(old_buffer, entries)
+
+    # 有变化：未变的文件从旧缓冲区切出，和新解析的文件重新拼成一块
+    parts = []
+    offset = 0
+    for name in names:
+        entry = files[name]
+        data = entry.pop('data', None)
+        if data is None:
+            data = old_buffer[entry['offset']:entry['offset'] + entry['stats']['bytes']]
+        entry['offset'] = offset
+        offset += len(data) + len(SEPARATOR)
+        parts.append(data)
+    buffer = SEPARATOR.encode('utf-8').join(parts)
+
+    if use_cache:
+        _save_cache(meta_path, buf_path, files, buffer)
+    return Corpus(buffer, entries)
+
+
+# 读取所有MD文件内容：{文件名: 文本}
+def read_md_files(directory='.', exclude=EXCLUDE):
+    corpus = load_corpus(directory, exclude)
+    return {name: md_file.text for name, md_file in corpus.items()}
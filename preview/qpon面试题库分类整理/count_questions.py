@@ -1,14 +1,11 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import re
+from classification import find_classification_doc, iter_records
 
 # 读取分类整理文档并准确统计问题数
-def count_questions_accurately():
-    with open('分类整理文档', 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    total_lines = len(lines)
+def count_questions_accurately(path=None):
+    total_lines = 0
     question_lines = []
     category_lines = []
     empty_lines = []
@@ -18,54 +15,27 @@ def count_questions_accurately():
     print("=" * 90)
     print()
 
-    for i, line in enumerate(lines, 1):
-        line = line.strip()
-
-        if not line:
-            empty_lines.append(i)
-            continue
-
-        # 提取行号和内容
-        match = re.match(r'^(\d+)→(.+)', line)
-        if match:
-            line_num = match.group(1)
-            content = match.group(2)
-
-            # 判断是分类标题还是问题
-            # 分类标题的特征：
-            # 1. 不包含问号
-            # 2. 相对较短或包含说明性括号
-            # 3. 通常是名词性短语
+    with open(path or find_classification_doc(), 'r', encoding='utf-8') as f:
+        # 统计行数和空行，同时把同一个行迭代器交给解析器
+        def numbered_lines():
+            nonlocal total_lines
+            for i, line in enumerate(f, 1):
+                total_lines = i
+                if not line.strip():
+                    empty_lines.append(i)
+                yield line
 
-            has_question_mark = '?' in content or '？' in content
-            has_parenthesis = '(' in content or '（' in content
-            is_short = len(content) < 20
+        for record in iter_records(numbered_lines()):
+            i, line_num, content = record.lineno, record.number, record.text
 
-            # 如果有问号，肯定是问题
-            if has_question_mark:
+            if record.kind == 'question':
                 question_lines.append((i, line_num, content))
                 print(f"问题 {len(question_lines):3d} | 行{i:3d} | {content[:60]}")
-            # 如果很短且没问号，可能是分类
-            elif is_short and not has_parenthesis:
+            else:
                 category_lines.append((i, line_num, content))
                 print(f"\n{'='*90}")
                 print(f"🏷️  分类 | 行{i:3d} | {content}")
                 print(f"{'='*90}")
-            # 如果有括号说明，也可能是分类
-            elif has_parenthesis and not has_question_mark:
-                # 需要判断是问题中的解释还是分类说明
-                if len(content) > 50:  # 较长的带括号内容，可能是问题
-                    question_lines.append((i, line_num, content))
-                    print(f"问题 {len(question_lines):3d} | 行{i:3d} | {content[:60]}")
-                else:  # 较短的带括号内容，是分类
-                    category_lines.append((i, line_num, content))
-                    print(f"\n{'='*90}")
-                    print(f"🏷️  分类 | 行{i:3d} | {content}")
-                    print(f"{'='*90}")
-            # 其他情况，判断为问题
-            else:
-                question_lines.append((i, line_num, content))
-                print(f"问题 {len(question_lines):3d} | 行{i:3d} | {content[:60]}")
 
     print()
     print("=" * 90)
@@ -82,7 +52,7 @@ def count_questions_accurately():
     print("=" * 90)
     print("🏷️  所有分类")
     print("=" * 90)
-    for i, (line_no, num, content) in enumerate(category_lines, 1):
+    for i, (_, _, content) in enumerate(category_lines, 1):
         print(f"{i:2d}. {content}")
     print()
 
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+题库MD文件的发现
+
+从指定根目录（默认是仓库根目录）向下遍历，用线程池并行读取各个目录：
+  - 遵守每一层的 .gitignore（支持 !、/ 开头、/ 结尾、* ? [] 和 **）
+  - 跳过 .git、node_modules 等目录（代码项目目录照常遍历，其中只有MD文件会被选中）
+  - 按扩展名筛选，支持 include / exclude 通配符；exclude_names 只排除章节目录
+    （本脚本所在目录）中的这些文件，其他目录里的 README.md 等照常参与
+返回相对于根目录的路径（用 / 分隔），按路径排序。
+
+以上规则的默认值在 DEFAULT_CONFIG 中，脚本目录下的 qbank.json 只写需要改变的项；
+同义词表（synonyms）是数据而不是规则，只放在 qbank.json 中。
+
+用法: python3 discovery.py [根目录] [--include GLOB] [--exclude GLOB]
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+
+# 章节目录：脚本、qbank.json 和各章节MD文件所在的目录
+CHAPTER_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.path.join(CHAPTER_DIR, 'qbank.json')
+
+DEFAULT_CONFIG = {
+    # 章节目录中不参与覆盖检查的文件名
+    'exclude_names': ['README.md', '图片问题完整清单.md', '质量检查报告.md'],
+    'extensions': ['.md'],
+    # 直接跳过的目录名
+    'skip_dirs': ['.git', 'node_modules', 'dist', 'build', 'coverage', 'vendor', 'third_party',
+                  '__pycache__', '.qbank_cache', '.venv', 'venv'],
+    # 相对于根目录的通配符，规则与 .gitignore 相同；include 为空表示全部
+    'include': [],
+    'exclude': [],
+    'respect_gitignore': True,
+    'workers': 8,
+    # 技术术语的同义词：{规范写法: [别名, ...]}，匹配前别名都改写成规范写法（synonyms.py），
+    # 表本身在 qbank.json 中
+    'synonyms': {},
+}
+
+
+# 读取配置：qbank.json 中的项覆盖默认值
+def load_config(path=CONFIG_FILE):
+    config = dict(DEFAULT_CONFIG)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    return config
+
+
+# 仓库根目录：向上查找 .git，找不到时用 git 命令，再找不到就是 start 本身
+def find_repo_root(start='.'):
+    path = os.path.abspath(start)
+    while True:
+        if os.path.exists(os.path.join(path, '.git')):
+            return path
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    import subprocess
+
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--show-toplevel'], cwd=start,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        return out or os.path.abspath(start)
+    except (OSError, subprocess.CalledProcessError):
+        return os.path.abspath(start)
+
+
+# 把 .gitignore 风格的通配符转成正则（匹配用 / 分隔的相对路径）
+def glob_to_regex(pattern):
+    out = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            out.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            out.append('[^/]')
+            i += 1
+        elif pattern[i] == '[':
+            j = pattern.find(']', i + 2)
+            if j == -1:
+                out.append(re.escape('['))
+                i += 1
+            else:
+                body = pattern[i + 1:j]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                out.append('[' + body.replace('\\', '\\\\') + ']')
+                i = j + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(out)
+
+
+class IgnoreRules:
+    """一个 .gitignore 文件（或一组通配符）中的规则，base 为其所在目录的相对路径"""
+
+    def __init__(self, base, lines):
+        self.base = base
+        self.rules = []     # [(正则, 是否为 ! 规则, 是否只匹配目录)]
+        for line in lines:
+            line = line.rstrip('\n').rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            if line.startswith('\\'):
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+            # 含有 / 的规则相对于所在目录，否则匹配任意层级
+            if '/' in line:
+                regex = glob_to_regex(line.lstrip('/'))
+            else:
+                regex = '(?:.*/)?' + glob_to_regex(line)
+            self.rules.append((re.compile(regex + '$'), negate, dir_only))
+
+    @classmethod
+    def from_file(cls, base, path):
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                return cls(base, f.readlines())
+        except OSError:
+            return None
+
+    def match(self, rel_path, is_dir):
+        """None 表示没有规则匹配，否则返回是否忽略（最后一条匹配的规则生效）"""
+        if self.base:
+            if not rel_path.startswith(self.base + '/'):
+                return None
+            rel_path = rel_path[len(self.base) + 1:]
+        result = None
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negate
+        return result
+
+
+def is_ignored(rule_sets, rel_path, is_dir):
+    ignored = False
+    for rules in rule_sets:
+        result = rules.match(rel_path, is_dir)
+        if result is not None:
+            ignored = result
+    return ignored
+
+
+def _glob_rules(patterns):
+    return IgnoreRules('', patterns) if patterns else None
+
+
+# 章节目录相对于 root 的路径（用 / 分隔），不在 root 下时为 None
+def chapter_rel(root):
+    rel = os.path.relpath(CHAPTER_DIR, root)
+    if rel == os.curdir:
+        return ''
+    if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+        return None
+    return rel.replace(os.sep, '/')
+
+
+def _scan_dir(root, rel, rule_sets, config, include, exclude, chapter=None):
+    """读取一个目录，返回 (匹配的文件, [(子目录, 子目录使用的规则)])"""
+    path = os.path.join(root, rel) if rel else root
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return [], []
+
+    names = {entry.name for entry in entries}
+    if config['respect_gitignore'] and '.gitignore' in names:
+        rules = IgnoreRules.from_file(rel, os.path.join(path, '.gitignore'))
+        if rules is not None:
+            rule_sets = rule_sets + (rules,)
+
+    extensions = tuple(config['extensions'])
+    skip_dirs = set(config['skip_dirs'])
+    exclude_names = set(config['exclude_names']) if rel == chapter else set()
+    files = []
+    subdirs = []
+    for entry in entries:
+        child = f'{rel}/{entry.name}' if rel else entry.name
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            continue
+        if is_dir:
+            if entry.name in skip_dirs or is_ignored(rule_sets, child, True):
+                continue
+            subdirs.append((child, rule_sets))
+        elif entry.name.endswith(extensions) and entry.name not in exclude_names:
+            if is_ignored(rule_sets, child, False):
+                continue
+            if include is not None and not include.match(child, False):
+                continue
+            if exclude is not None and exclude.match(child, False):
+                continue
+            files.append(child)
+    return files, subdirs
+
+
+def discover(root=None, config=None, include=None, exclude=None):
+    """并行遍历 root，返回参与检查的文件（相对路径，按路径排序）"""
+    # 线程池只在遍历时用到，不拖慢只读取配置的导入
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    config = config or load_config()
+    root = os.path.abspath(root or find_repo_root())
+    include = _glob_rules(list(config['include']) + list(include or []))
+    exclude = _glob_rules(list(config['exclude']) + list(exclude or []))
+
+    chapter = chapter_rel(root)
+    found = []
+    with ThreadPoolExecutor(max_workers=max(config['workers'], 1)) as pool:
+        pending = {pool.submit(_scan_dir, root, '', (), config, include, exclude, chapter)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                found.extend(files)
+                for rel, rule_sets in subdirs:
+                    pending.add(pool.submit(_scan_dir, root, rel, rule_sets, config, include, exclude, chapter))
+    return sorted(found)
+
+
+def main(root=None, include=None, exclude=None):
+    started = time.perf_counter()
+    root = os.path.abspath(root or find_repo_root())
+    files = discover(root, include=include, exclude=exclude)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    print("=" * 80)
+    print(f"📂 {root}")
+    print("=" * 80)
+    by_dir = {}
+    for path in files:
+        by_dir.setdefault(os.path.dirname(path) or '.', []).append(path)
+    for directory, paths in by_dir.items():
+        print(f"  {directory:<50} {len(paths):>4} 个文件")
+    print("-" * 80)
+    print(f"  共 {len(files)} 个文件，{len(by_dir)} 个目录，耗时 {elapsed:.0f} ms")
+    print("=" * 80)
+    return files
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='列出仓库中参与检查的MD文件')
+    parser.add_argument('root', nargs='?', help='根目录（默认为仓库根目录）')
+    parser.add_argument('--include', action='append', default=[], help='只包含匹配的路径（可重复）')
+    parser.add_argument('--exclude', action='append', default=[], help='排除匹配的路径（可重复）')
+    args = parser.parse_args()
+    main(args.root, args.include, args.exclude)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+题库中近似重复章节的检测（MinHash + LSH）
+
+各目录通过 load_corpus 加载，按标题索引中的二级标题切节（与覆盖检查相同的
+切分方式，没有二级标题的文件整体作为一节）。每节规整后取字符 5-gram 作为
+shingle，计算 MinHash 签名：每个 shingle 只哈希一次，按哈希值分到 NUM_PERM
+个桶里各取最小值（one permutation hashing），空桶从右侧最近的非空桶借值
+（densification），整体耗时与语料长度成线性关系。
+
+签名按 BANDS 段分组放入 LSH 桶，同一桶里的节成为候选对，再用 shingle 集合
+算出准确的 Jaccard 相似度，超过阈值的用并查集合并成重复簇。
+
+用法: python3 dups.py [目录 ...] [--threshold 0.3] [--repo]
+默认检查当前目录和 ../qpon前端面试题库外部；--repo 检查整个仓库中发现的MD文件
+"""
+
+import argparse
+import os
+import zlib
+from collections import defaultdict, namedtuple
+
+from corpus import load_corpus, load_repo_corpus
+from discovery import find_repo_root
+from headings import QUESTION_LEVEL
+from ngram_index import normalize
+
+DEFAULT_DIRECTORIES = ['.', os.path.join('..', 'qpon前端面试题库外部')]
+
+SHINGLE_SIZE = 5
+NUM_PERM = 256
+BANDS = 85                  # 每段 3 行：相似度 0.3 的两节约 90% 落入同一个桶，0.4 时超过 99%
+# 改写过的重复内容（同一题的两份答案）5-gram Jaccard 多在 0.3~0.4
+DEFAULT_THRESHOLD = 0.3
+MIN_SHINGLES = 20           # 太短的节不参与比较
+
+MASK64 = (1 << 64) - 1
+GOLDEN = 0x9E3779B97F4A7C15
+BIN_BITS = NUM_PERM.bit_length() - 1
+VALUE_MASK = (1 << (64 - BIN_BITS)) - 1
+
+SectionText = namedtuple('SectionText', ['directory', 'name', 'title', 'lineno', 'text'])
+Cluster = namedtuple('Cluster', ['sections', 'similarity'])   # similarity: 簇内最高的两两相似度
+
+
+# 按二级标题切节
+def iter_sections(corpus, directory='.', level=QUESTION_LEVEL):
+    for md_file in corpus.values():
+        text = md_file.text
+        sections = md_file.headings.sections(level)
+        if not sections:
+            yield SectionText(directory, md_file.name, None, 1, text)
+            continue
+        for section in sections:
+            yield SectionText(directory, md_file.name, section.title, section.lineno,
+                              text[section.char_start:section.char_end])
+
+
+# 规整后的字符 shingle，映射为 64 位整数
+def shingles(text, k=SHINGLE_SIZE):
+    s = normalize(text)
+    return {(zlib.crc32(s[i:i + k].encode('utf-8')) * GOLDEN) & MASK64 for i in range(len(s) - k + 1)}
+
+
+def minhash(hashes, num_perm=NUM_PERM):
+    """one permutation hashing：高位决定桶，低位取最小值；空桶向右借值"""
+    signature = [None] * num_perm
+    for h in hashes:
+        b = h >> (64 - BIN_BITS)
+        v = h & VALUE_MASK
+        if signature[b] is None or v < signature[b]:
+            signature[b] = v
+    if all(v is None for v in signature):
+        return signature
+    for b in range(num_perm):
+        if signature[b] is None:
+            step = 1
+            while signature[(b + step) % num_perm] is None:
+                step += 1
+            # 借来的值加上偏移，避免不同的空桶总是取到同一个值
+            signature[b] = signature[(b + step) % num_perm] + step * (VALUE_MASK + 1)
+    return signature
+
+
+def lsh_candidates(signatures, bands=BANDS):
+    """同一段签名相同的节互为候选，返回候选对 {(i, j), ...}"""
+    rows = len(signatures[0]) // bands if signatures else 0
+    pairs = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        for i, signature in enumerate(signatures):
+            buckets[tuple(signature[band * rows:(band + 1) * rows])].append(i)
+        for members in buckets.values():
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    pairs.add((members[x], members[y]))
+    return pairs
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def find_duplicates(sections, threshold=DEFAULT_THRESHOLD):
+    """返回重复簇列表，按簇内最高相似度从高到低排列"""
+    sets = []
+    kept = []
+    for section in sections:
+        s = shingles(section.text)
+        if len(s) >= MIN_SHINGLES:
+            kept.append(section)
+            sets.append(s)
+    signatures = [minhash(s) for s in sets]
+
+    parent = list(range(len(kept)))
+    best = {}
+    for i, j in lsh_candidates(signatures):
+        similarity = jaccard(sets[i], sets[j])
+        if similarity >= threshold:
+            ri, rj = _find(parent, i), _find(parent, j)
+            if ri != rj:
+                parent[rj] = ri
+            best[i] = max(best.get(i, 0), similarity)
+            best[j] = max(best.get(j, 0), similarity)
+
+    groups = defaultdict(list)
+    for i in best:
+        groups[_find(parent, i)].append(i)
+    clusters = [Cluster([kept[i] for i in sorted(members)], max(best[i] for i in members))
+                for members in groups.values()]
+    clusters.sort(key=lambda c: (-c.similarity, c.sections[0].directory, c.sections[0].name, c.sections[0].lineno))
+    return clusters
+
+
+def main(directories=None, threshold=DEFAULT_THRESHOLD, repo=False, corpora=None):
+    directories = directories or [d for d in DEFAULT_DIRECTORIES if os.path.isdir(d)]
+
+    print("=" * 100)
+    print(" " * 35 + "🧬 近似重复章节检测")
+    print("=" * 100)
+
+    if repo:
+        root = find_repo_root()
+        corpora = [(os.path.relpath(root), load_repo_corpus(root))]
+    else:
+        # corpora: {目录: 已加载的语料}，没有的目录现场加载
+        loaded = corpora or {}
+        corpora = [(directory, loaded[directory] if directory in loaded else load_corpus(directory)) for directory in directories]
+
+    sections = []
+    for directory, corpus in corpora:
+        found = list(iter_sections(corpus, directory))
+        print(f"  📁 {directory}: {len(corpus)} 个文件, {len(found)} 节")
+        sections.extend(found)
+
+    clusters = find_duplicates(sections, threshold)
+
+    print()
+    print("=" * 100)
+    print(f"🔁 重复簇（Jaccard >= {threshold}）: {len(clusters)} 个")
+    print("=" * 100)
+    for i, cluster in enumerate(clusters, 1):
+        print(f"\n{i}. 相似度 {cluster.similarity:.2f}，共 {len(cluster.sections)} 节")
+        for section in cluster.sections:
+            path = os.path.normpath(os.path.join(section.directory, section.name))
+            title = section.title or '（整个文件）'
+            print(f"   - {path}:{section.lineno}  {title}")
+
+    print()
+    print("=" * 100)
+    print(f"  检查节数: {len(sections)}")
+    print(f"  涉及重复的节: {sum(len(c.sections) for c in clusters)}")
+    print("=" * 100)
+    return clusters
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='检测题库中的近似重复章节')
+    parser.add_argument('directories', nargs='*', help='要检查的目录（默认当前目录和外部题库目录）')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='Jaccard 相似度阈值')
+    parser.add_argument('--repo', action='store_true', help='检查整个仓库（按 qbank.json 的规则发现MD文件）')
+    args = parser.parse_args()
+    main(args.directories, args.threshold, args.repo)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+位并行（Myers 1999）编辑距离，用于匹配OCR识别出错的清单题目
+
+模式串每个字符对应整数中的一位，扫描文本时每个字符只做常数次位运算就能更新
+动态规划表的一整列（Python 的整数不限位数，长模式串同样适用）：
+  myers_search    模式串与文本任意子串的最小编辑距离（近似查找）
+  myers_distance  两个字符串的编辑距离
+两者都带上限 max_dist，超过上限返回 None，整体距离的计算可以提前结束。
+
+approximate_match 先用字符 n-gram 索引挑出少量候选标题，再逐个计算距离，
+不用和每个标题都比较。
+"""
+
+from ngram_index import NgramIndex, normalize
+
+# 允许的编辑距离占题目长度的比例（约三分之一：6个字的题目允许错2个字）
+DEFAULT_MAX_RATIO = 0.34
+# n-gram 预筛选：候选数和最低重合比例（OCR错字会破坏相邻的 gram，门槛放低）
+CANDIDATES = 20
+PREFILTER_MIN_SCORE = 0.2
+
+
+def _peq(pattern):
+    peq = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    return peq
+
+
+def _columns(pattern, text, global_match):
+    """逐个文本字符产出 (下标, 当前列最后一行的值)"""
+    m = len(pattern)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    peq = _peq(pattern)
+    pv = full
+    mv = 0
+    score = m
+    carry = 1 if global_match else 0
+    for j, ch in enumerate(text):
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & full) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & full
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | carry) & full
+        mh = (mh << 1) & full
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv
+        yield j, score
+
+
+def myers_search(pattern, text, max_dist=None):
+    """pattern 与 text 中任意子串的最小编辑距离，返回 (距离, 子串结束位置)；超过 max_dist 返回 None"""
+    if not pattern:
+        return 0, 0
+    if max_dist is None:
+        max_dist = len(pattern)
+    best = (len(pattern), 0) if len(pattern) <= max_dist else None
+    for j, score in _columns(pattern, text, False):
+        if score <= max_dist and (best is None or score < best[0]):
+            best = (score, j + 1)
+            if score == 0:
+                break
+    return best
+
+
+def myers_distance(a, b, max_dist=None):
+    """a 与 b 的编辑距离；超过 max_dist 返回 None"""
+    if not a or not b:
+        dist = len(a) + len(b)
+        return dist if max_dist is None or dist <= max_dist else None
+    if max_dist is not None and abs(len(a) - len(b)) > max_dist:
+        return None
+    score = len(a)
+    remaining = len(b)
+    for _, score in _columns(a, b, True):
+        remaining -= 1
+        # 之后每个字符最多让距离减 1
+        if max_dist is not None and score - remaining > max_dist:
+            return None
+    return score if max_dist is None or score <= max_dist else None
+
+
+def build_heading_index(corpus):
+    """只包含标题的 n-gram 索引"""
+    return NgramIndex.from_corpus(corpus, paragraphs=False)
+
+
+def approximate_match(title, index, max_ratio=DEFAULT_MAX_RATIO):
+    """
+    在标题索引中近似查找题目，返回 (距离, Passage)，找不到返回 None。
+    题目需在标题中近似出现（标题可以带编号等额外内容），距离不超过 题目长度 * max_ratio。
+    """
+    pattern = normalize(title)
+    if not pattern:
+        return None
+    max_dist = int(len(pattern) * max_ratio)
+    best = None
+    for _, passage in index.query(title, CANDIDATES, PREFILTER_MIN_SCORE):
+        found = myers_search(pattern, normalize(passage.text), max_dist)
+        if found and (best is None or found[0] < best[0]):
+            best = (found[0], passage)
+            max_dist = found[0]
+            if max_dist == 0:
+                break
+    return best
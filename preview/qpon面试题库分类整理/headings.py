@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+章节文件的标题索引
+
+每个MD文件解析一次，得到标题树：级别、标题、所在行，以及该节在文件中的
+起止位置（UTF-8 字节偏移和字符偏移各一份）。一节从标题行开始，到下一个
+同级或更高级标题（或文件末尾）结束。数值都放在 array 里，缓存体积小。
+"""
+
+import re
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+
+# 结尾的一串 # 只有前面是空白时才是闭合序列（`## C#` 的标题仍是 C#）
+HEADING_RE = re.compile(r'^(#{1,6})\s+(.+?)(?:\s+#+)?\s*$')
+FENCE_RE = re.compile(r'^\s*(`{3,}|~{3,})')
+
+# 题目所在的标题级别（`## 1. React diff原理`）
+QUESTION_LEVEL = 2
+
+
+def next_fence(fence, line):
+    """处理一行后的代码块状态：返回 (新的起始围栏或 None, 这一行是否是围栏行)"""
+    match = FENCE_RE.match(line)
+    if not match:
+        return fence, False
+    marker = match.group(1)
+    if fence is None:
+        return marker, True
+    # 同一种字符、不短于起始围栏才算闭合
+    if marker[0] == fence[0] and len(marker) >= len(fence):
+        return None, True
+    return fence, True
+
+
+Section = namedtuple('Section', ['index', 'level', 'title', 'lineno', 'start', 'end', 'char_start', 'char_end'])
+
+
+class HeadingIndex:
+    """单个文件的标题索引"""
+
+    def __init__(self):
+        self.titles = []
+        self.levels = array('B')
+        self.linenos = array('I')
+        self.starts = array('Q')        # 字节偏移
+        self.ends = array('Q')
+        self.char_starts = array('Q')   # 字符偏移
+        self.char_ends = array('Q')
+
+    @classmethod
+    def build(cls, text):
+        """解析标题（跳过代码块中的 # 行），计算每一节的起止位置"""
+        index = cls()
+        fence = None         # 当前代码块的起始围栏（``` 或 ~~~）
+        byte_pos = 0
+        char_pos = 0
+        open_sections = []   # 尚未结束的节：[(级别, 下标)]
+
+        for lineno, line in enumerate(text.split('\n'), 1):
+            line_chars = len(line) + 1
+            line_bytes = len(line.encode('utf-8')) + 1
+
+            fence, is_fence = next_fence(fence, line)
+            if not is_fence and fence is None and line.startswith('#'):
+                match = HEADING_RE.match(line)
+                if match:
+                    level = len(match.group(1))
+                    while open_sections and open_sections[-1][0] >= level:
+                        _, i = open_sections.pop()
+                        index.ends[i] = byte_pos
+                        index.char_ends[i] = char_pos
+                    open_sections.append((level, len(index.titles)))
+                    index.titles.append(match.group(2))
+                    index.levels.append(level)
+                    index.linenos.append(lineno)
+                    index.starts.append(byte_pos)
+                    index.ends.append(0)
+                    index.char_starts.append(char_pos)
+                    index.char_ends.append(0)
+
+            byte_pos += line_bytes
+            char_pos += line_chars
+
+        # 最后一行没有换行符
+        byte_end = max(byte_pos - 1, 0)
+        char_end = len(text)
+        for _, i in open_sections:
+            index.ends[i] = byte_end
+            index.char_ends[i] = char_end
+        return index
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __getitem__(self, i):
+        return Section(i, self.levels[i], self.titles[i], self.linenos[i],
+                       self.starts[i], self.ends[i], self.char_starts[i], self.char_ends[i])
+
+    def __iter__(self):
+        for i in range(len(self.titles)):
+            yield self[i]
+
+    def sections(self, level=None):
+        """按级别筛选各节"""
+        return [s for s in self if level is None or s.level == level]
+
+    def question_count(self):
+        """文件中的题目数（二级标题数）"""
+        return self.levels.count(QUESTION_LEVEL)
+
+    def section_at(self, char_offset, level=None):
+        """返回包含该字符偏移的最深一节（指定 level 时返回该级别的节），没有则为 None"""
+        i = bisect_right(self.char_starts, char_offset) - 1
+        while i >= 0:
+            if self.char_starts[i] <= char_offset < self.char_ends[i] and (level is None or self.levels[i] == level):
+                return self[i]
+            i -= 1
+        return None
+
+    def path(self, i):
+        """从顶层到第 i 节的标题路径"""
+        titles = [self.titles[i]]
+        level = self.levels[i]
+        for j in range(i - 1, -1, -1):
+            if self.levels[j] < level:
+                titles.append(self.titles[j])
+                level = self.levels[j]
+        return list(reversed(titles))
+
+    def text_of(self, text, i):
+        """从文件文本中切出第 i 节（含标题行）"""
+        return text[self.char_starts[i]:self.char_ends[i]]
+
+    def bytes_of(self, data, i):
+        """从文件的 UTF-8 字节中切出第 i 节"""
+        return data[self.starts[i]:self.ends[i]]
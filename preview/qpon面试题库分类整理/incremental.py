@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+增量覆盖检查
+
+把 关键串 -> {文件名: 文件内首次出现位置} 的命中表保存在 .qbank_cache/ 下，
+关键串和扫描的语料都是规整后的文本（synonyms.canonical / Corpus.folded），位置换回原文中的
+位置保存；同义词表变化时命中表整个作废。
+下次运行时按 git blob SHA 找出变化的文件（大小+mtime 未变的文件由语料缓存
+直接给出 SHA，不用重新读取），只重新扫描：
+  - 变化/新增的文件 × 全部关键串
+  - 未变化的文件 × 新出现的关键串（问题新增或改写）
+已删除的文件和不再使用的关键串从命中表中移除。
+需要扫描的文件各自解码、规整（不经过整个语料的 Corpus.folded），没有变化的文件
+和关键串时不解码也不规整任何文本。
+"""
+
+import os
+import pickle
+
+from corpus import CACHE_DIR
+from matcher import AhoCorasick
+from synonyms import default_synonyms
+from textnorm import FoldedText
+
+STATE_VERSION = 2
+
+
+def _state_path(directory, name):
+    return os.path.join(directory, CACHE_DIR, f'coverage-{name}.pickle')
+
+
+def _load_state(path):
+    try:
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    if state.get('version') != STATE_VERSION or state.get('synonyms') != default_synonyms().signature:
+        return None
+    return state
+
+
+def _save_state(path, state):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+# 扫描一个文件（单独解码、规整），把每个关键串在文件中的首次出现位置（原文）写入 hits
+def _scan(md_file, automaton, hits, synonyms):
+    keys = automaton.patterns
+    if not keys:
+        return
+    folded = FoldedText(str(md_file.view(), 'utf-8'), synonyms)
+    for pos, pid in automaton.iter(folded.text):
+        hits[keys[pid]].setdefault(md_file.name, folded.to_original(pos))
+    # 空关键串在任何文件中都出现（与 `'' in content` 一致）
+    if '' in keys:
+        hits[''].setdefault(md_file.name, 0)
+
+
+class IncrementalCoverage:
+    """增量维护的关键串命中表"""
+
+    def __init__(self, corpus, name, directory='.'):
+        self.corpus = corpus
+        self.path = _state_path(directory, name)
+        self.changed_files = []
+        self.new_keys = []
+        # 长时间运行（如 watch 模式）时命中表和自动机常驻内存
+        self._state = None
+        self._automaton_keys = None
+        self._automaton = None
+
+    def _automaton_for(self, keys):
+        keys = tuple(keys)
+        if keys == self._automaton_keys:
+            return self._automaton
+        return AhoCorasick(keys)
+
+    def update(self, keys, corpus=None):
+        """按当前语料和关键串更新命中表，返回 {关键串: {文件名: 文件内位置}}"""
+        if corpus is not None:
+            self.corpus = corpus
+        keys = list(dict.fromkeys(keys))
+        if tuple(keys) != self._automaton_keys:
+            self._automaton_keys = tuple(keys)
+            self._automaton = AhoCorasick(keys)
+        state = self._state or _load_state(self.path) or {'version': STATE_VERSION, 'files': {}, 'hits': {}}
+        old_files = state['files']
+        current = {name: md_file.blob for name, md_file in self.corpus.items()}
+
+        self.changed_files = [name for name, blob in current.items() if old_files.get(name) != blob]
+        stale = set(self.changed_files) | (old_files.keys() - current.keys())
+
+        hits = {}
+        for key in keys:
+            if key in state['hits']:
+                hits[key] = {name: pos for name, pos in state['hits'][key].items() if name not in stale}
+        self.new_keys = [key for key in keys if key not in hits]
+        for key in self.new_keys:
+            hits[key] = {}
+
+        # 变化的文件 × 全部关键串；未变化的文件 × 新关键串
+        changed = set(self.changed_files)
+        new_keys = self._automaton_for(self.new_keys)
+        synonyms = default_synonyms()
+        for md_file in self.corpus.values():
+            automaton = self._automaton if md_file.name in changed else new_keys
+            _scan(md_file, automaton, hits, synonyms)
+
+        self._state = {'version': STATE_VERSION, 'synonyms': default_synonyms().signature,
+                       'files': current, 'hits': hits}
+        if self.changed_files or self.new_keys or len(current) != len(old_files):
+            _save_state(self.path, self._state)
+        return hits
+
+    def sections(self, file_hits):
+        """把 {文件名: 文件内位置} 解析为 [(文件名, 章节标题)]"""
+        result = []
+        for name, pos in file_hits.items():
+            section = self.corpus[name].headings.section_at(pos)
+            result.append((name, section.title if section else None))
+        return result
+
+
+# 增量版的 match_corpus
+def incremental_match_questions(questions, corpus, key_func, name, directory='.', engine=None):
+    """
+    与 matcher.match_corpus 的返回形式一致：每个问题一项 {关键串: 全文（原文）中的首次出现位置}，
+    只重新扫描变化的文件和新关键串，返回 (结果, IncrementalCoverage)。
+    传入上一次返回的 engine 时复用常驻内存的命中表和自动机。
+    """
+    if engine is None:
+        engine = IncrementalCoverage(corpus, name, directory)
+    question_keys = [key_func(q) for q in questions]
+    hits = engine.update((key for keys in question_keys for key in keys), corpus)
+
+    results = []
+    for keys in question_keys:
+        matched = {}
+        for key in keys:
+            file_hits = hits[key]
+            if file_hits:
+                # 按语料中的文件顺序取第一个命中的文件
+                first = min(file_hits, key=lambda n: corpus[n].char_start)
+                matched[key] = corpus[first].char_start + file_hits[first]
+        results.append(matched)
+    return results, engine
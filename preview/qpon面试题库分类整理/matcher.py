@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+多模式串匹配（Aho-Corasick），供各检查脚本共用
+
+把所有问题的候选关键串编译进同一个自动机，只遍历一次语料，
+代替逐个问题、逐个关键串的 `key in all_md_content` 全文扫描。
+"""
+
+
+class AhoCorasick:
+    """Aho-Corasick 自动机，模式串按加入顺序编号"""
+
+    def __init__(self, patterns=()):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [None]        # 以该节点结尾的模式串编号
+        self._dict_link = [0]     # 沿失败链最近的有输出节点
+        self._ids = {}
+        self._alphabet = frozenset()
+        self.patterns = []
+        self._built = False
+        for pattern in patterns:
+            self.add(pattern)
+
+    def add(self, pattern):
+        """加入一个模式串，返回其编号（重复的模式串复用同一编号）"""
+        if pattern in self._ids:
+            return self._ids[pattern]
+
+        pid = len(self.patterns)
+        self._ids[pattern] = pid
+        self.patterns.append(pattern)
+        self._built = False
+
+        if not pattern:
+            return pid
+
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(None)
+                self._dict_link.append(0)
+            node = nxt
+        self._out[node] = pid
+        return pid
+
+    def build(self):
+        """按层（BFS）计算失败指针和输出链"""
+        goto, fail, out, dict_link = self._goto, self._fail, self._out, self._dict_link
+        queue = []
+        for child in goto[0].values():
+            fail[child] = 0
+            dict_link[child] = 0
+            queue.append(child)
+
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(ch, 0)
+                fail[child] = target if target != child else 0
+                dict_link[child] = fail[child] if out[fail[child]] is not None else dict_link[fail[child]]
+
+        self._alphabet = frozenset(ch for edges in goto for ch in edges)
+        self._built = True
+        return self
+
+    def iter(self, text):
+        """遍历文本，依次产出 (起始位置, 模式串编号)"""
+        if not self._built:
+            self.build()
+
+        goto, fail, out, dict_link = self._goto, self._fail, self._out, self._dict_link
+        patterns = self.patterns
+        alphabet = self._alphabet
+        node = 0
+        for pos, ch in enumerate(text):
+            if ch not in alphabet:
+                node = 0
+                continue
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+
+            hit = node if out[node] is not None else dict_link[node]
+            while hit:
+                pid = out[hit]
+                yield pos - len(patterns[pid]) + 1, pid
+                hit = dict_link[hit]
+
+    def first_positions(self, text):
+        """返回 {模式串编号: 首次出现位置}；空模式串视为出现在位置0"""
+        found = {}
+        empty = self._ids.get('')
+        if empty is not None:
+            found[empty] = 0
+
+        remaining = len(self.patterns) - len(found)
+        if not remaining:
+            return found
+        for start, pid in self.iter(text):
+            if pid not in found:
+                found[pid] = start
+                remaining -= 1
+                if not remaining:
+                    break
+        return found
+
+
+# 一次遍历，得到每个问题的命中位置
+def match_questions(questions, text, key_func):
+    """
+    对每个问题用 key_func 生成候选关键串，全部编译进一个自动机后只扫描一遍 text。
+    返回与 questions 等长的列表，每项为 {关键串: 首次出现位置}，为空表示未命中。
+    """
+    automaton = AhoCorasick()
+    question_keys = []
+    for question in questions:
+        question_keys.append([automaton.add(key) for key in key_func(question)])
+
+    found = automaton.first_positions(text)
+
+    results = []
+    for pids in question_keys:
+        results.append({automaton.patterns[pid]: found[pid] for pid in pids if pid in found})
+    return results
+
+
+# 在规整后的语料中匹配（key_func 生成的关键串也应是规整后的），命中位置为原文 corpus.text 中的位置
+def match_corpus(questions, corpus, key_func):
+    folded = corpus.folded
+    return folded.restore(match_questions(questions, folded.text, key_func))
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+字符 n-gram 倒排索引，用于问题的模糊查找
+
+文本先规整（synonyms.canonical，只保留汉字、字母和数字），再切成 2-gram 和 3-gram。
+每个检索单元（标题或段落）记录自己的 gram 集合，倒排表记录 gram -> 单元编号。
+
+查询时按文档频率从低到高排列问题的 gram：单元与问题的重合 gram 数要达到
+ceil(min_score * 问题gram数)，就必然包含最稀有的前 (问题gram数 - 该下限 + 1)
+个 gram 之一（前缀过滤），因此只需从这几个 gram 的倒排表取候选，再逐个精确
+计算得分，常见 gram（如 "实现"、"什么"）不会拖慢查询。
+
+得分：
+  overlap  重合 gram 数 / 问题 gram 数（问题被单元覆盖的比例，默认）
+  jaccard  重合 gram 数 / 两者 gram 并集大小
+"""
+
+import heapq
+import math
+import re
+from collections import namedtuple
+
+from headings import next_fence
+from synonyms import canonical
+
+GRAM_SIZES = (2, 3)
+DEFAULT_MIN_SCORE = 0.5
+
+NON_WORD_RE = re.compile(r'[\W_]+')
+
+# 检索单元：kind 为 'heading' 或 'paragraph'，title 为所在章节标题
+Passage = namedtuple('Passage', ['kind', 'name', 'title', 'char_start', 'text'])
+
+
+# 规整文本：NFKC + casefold，别名改写成规范写法，去掉标点和空白
+def normalize(text):
+    return NON_WORD_RE.sub('', canonical(text))
+
+
+# 切分 gram；规整后比最小 gram 还短的文本整体作为一个 gram
+def char_ngrams(text, sizes=GRAM_SIZES):
+    s = normalize(text)
+    grams = set()
+    for n in sizes:
+        for i in range(len(s) - n + 1):
+            grams.add(s[i:i + n])
+    if not grams and s:
+        grams.add(s)
+    return grams
+
+
+class NgramIndex:
+    """字符 n-gram 倒排索引，单元的内容可以是任意对象（payload）"""
+
+    def __init__(self, sizes=GRAM_SIZES):
+        self.sizes = sizes
+        self.payloads = []
+        self.unit_grams = []
+        self.postings = {}
+
+    def __len__(self):
+        return len(self.payloads)
+
+    def add(self, text, payload=None):
+        """加入一个检索单元，返回单元编号；没有可索引字符的文本返回 None"""
+        grams = char_ngrams(text, self.sizes)
+        if not grams:
+            return None
+        uid = len(self.payloads)
+        self.payloads.append(text if payload is None else payload)
+        self.unit_grams.append(frozenset(grams))
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                self.postings[gram] = [uid]
+            else:
+                posting.append(uid)
+        return uid
+
+    def query(self, text, k=5, min_score=DEFAULT_MIN_SCORE, metric='overlap'):
+        """返回得分最高的 k 个单元：[(得分, payload), ...]，按得分从高到低"""
+        all_grams = char_ngrams(text, self.sizes)
+        grams = [g for g in all_grams if g in self.postings]
+        total = len(all_grams)
+        if not grams or not total:
+            return []
+        needed = max(math.ceil(min_score * total - 1e-9), 1)
+        if len(grams) < needed:
+            return []
+
+        # 前缀过滤：只取最稀有的若干个 gram 的倒排表作为候选
+        grams.sort(key=lambda g: len(self.postings[g]))
+        candidates = set()
+        for gram in grams[:len(grams) - needed + 1]:
+            candidates.update(self.postings[gram])
+
+        query_grams = frozenset(grams)
+        scored = []
+        for uid in candidates:
+            common = len(query_grams & self.unit_grams[uid])
+            if common < needed:
+                continue
+            if metric == 'jaccard':
+                score = common / (total + len(self.unit_grams[uid]) - common)
+            else:
+                score = common / total
+            if score >= min_score:
+                scored.append((score, -uid))
+        return [(score, self.payloads[-neg]) for score, neg in heapq.nlargest(k, scored)]
+
+    def best(self, text, min_score=DEFAULT_MIN_SCORE, metric='overlap'):
+        """得分最高的单元 (得分, payload)，没有达到 min_score 的返回 None"""
+        top = self.query(text, 1, min_score, metric)
+        return top[0] if top else None
+
+    @classmethod
+    def from_corpus(cls, corpus, sizes=GRAM_SIZES, paragraphs=True):
+        """一遍扫描语料，把每个标题和每个段落（空行分隔，跳过代码块）作为检索单元；paragraphs=False 时只索引标题"""
+        index = cls(sizes)
+        for md_file in corpus.values():
+            text = md_file.text
+            headings = md_file.headings
+            heading_titles = dict(zip(headings.char_starts, headings.titles))
+            fence = None
+            para_lines = []
+            para_start = 0
+            pos = 0
+
+            def flush():
+                if para_lines:
+                    section = headings.section_at(para_start)
+                    index.add(' '.join(para_lines), Passage(
+                        'paragraph', md_file.name, section.title if section else None,
+                        md_file.char_start + para_start, '\n'.join(para_lines)))
+                    para_lines.clear()
+
+            for line in text.split('\n'):
+                stripped = line.strip()
+                fence, is_fence = next_fence(fence, line)
+                if is_fence:
+                    flush()
+                elif fence is not None:
+                    pass
+                elif not stripped:
+                    flush()
+                elif pos in heading_titles:
+                    flush()
+                    title = heading_titles[pos]
+                    index.add(title, Passage('heading', md_file.name, title, md_file.char_start + pos, title))
+                elif paragraphs:
+                    if not para_lines:
+                        para_start = pos
+                    para_lines.append(stripped)
+                pos += len(line) + 1
+            flush()
+        return index
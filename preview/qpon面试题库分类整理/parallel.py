@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+多进程并行匹配
+
+只读的数据（语料全文、编译好的自动机、CompletedIndex 等）在创建进程池之前
+放进模块变量，子进程通过 fork 直接继承，不经过 pickle；任务本身只传下标范围，
+子进程只回传命中位置。结果按任务顺序合并，输出与单进程完全一致。
+--profile 打开时子进程同时交回命中计数和分项耗时，由主进程合并。
+不支持 fork 的平台（Windows 等）或 jobs <= 1 时退回单进程执行。
+"""
+
+import multiprocessing
+import os
+
+from matcher import AhoCorasick
+from profiling import PROFILER
+
+# fork 之前设置为 (func, shared)，子进程直接继承
+_SHARED = None
+
+
+def fork_available():
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+# --jobs 0 表示使用全部CPU核心
+def resolve_jobs(jobs):
+    if not jobs:
+        return os.cpu_count() or 1
+    return max(jobs, 1)
+
+
+def _call(task):
+    func, shared = _SHARED
+    if not PROFILER.enabled:
+        return func(shared, task), None
+    # fork 时继承了主进程已有的计数，先清空，只交回这个任务的部分
+    PROFILER.take_counts()
+    result = func(shared, task)
+    return result, PROFILER.take_counts()
+
+
+def run_forked(func, tasks, shared, jobs=None):
+    """在 fork 出的进程池中对每个任务调用 func(shared, task)，按任务顺序返回结果"""
+    global _SHARED
+    tasks = list(tasks)
+    jobs = min(resolve_jobs(jobs), len(tasks))
+    if jobs <= 1 or not fork_available():
+        return [func(shared, task) for task in tasks]
+
+    _SHARED = (func, shared)
+    try:
+        with multiprocessing.get_context('fork').Pool(jobs) as pool:
+            outputs = pool.map(_call, tasks, chunksize=1)
+    finally:
+        _SHARED = None
+    results = []
+    for result, counts in outputs:
+        if counts is not None:
+            PROFILER.merge_counts(counts)
+        results.append(result)
+    return results
+
+
+# 按文件边界把全文切成大致等长的若干段：[(起始字符偏移, 结束字符偏移), ...]
+def split_ranges(corpus, parts):
+    files = list(corpus.values())
+    if not files:
+        return []
+    total = files[-1].char_end
+    ranges = []
+    start = 0
+    for md_file in files:
+        target = total * (len(ranges) + 1) / parts
+        if md_file.char_end >= target and md_file.char_end > start:
+            ranges.append((start, md_file.char_end))
+            start = md_file.char_end
+    if start < total or not ranges:
+        ranges.append((start, total))
+    return ranges
+
+
+# 扫描全文的一段；段尾多扫 overlap 个字符，使跨段的命中也能找到
+def _scan_range(shared, task):
+    automaton, text, overlap = shared
+    start, end = task
+    found = automaton.first_positions(text[start:end + overlap])
+    return {pid: start + pos for pid, pos in found.items() if pos < end - start}
+
+
+# 并行版的 match_corpus：按文件切分规整后的语料，每个进程用同一个自动机扫描自己的一段
+def parallel_match_questions(questions, corpus, key_func, jobs=None):
+    """返回形式与 matcher.match_corpus(questions, corpus, key_func) 相同（位置为原文中的位置）"""
+    automaton = AhoCorasick()
+    question_keys = []
+    for question in questions:
+        question_keys.append([automaton.add(key) for key in key_func(question)])
+    automaton.build()
+
+    folded = corpus.folded
+    text = folded.text
+    overlap = max((len(p) for p in automaton.patterns), default=1) - 1
+    ranges = [(folded.to_folded(start), folded.to_folded(end))
+              for start, end in split_ranges(corpus, resolve_jobs(jobs))] or [(0, len(text))]
+    shard_hits = run_forked(_scan_range, ranges, (automaton, text, overlap), jobs)
+
+    # 各段按顺序合并，靠前的段中的位置优先，即全文中的首次出现位置
+    found = {}
+    for hits in shard_hits:
+        for pid, pos in hits.items():
+            found.setdefault(pid, pos)
+
+    results = []
+    for pids in question_keys:
+        results.append({automaton.patterns[pid]: found[pid] for pid in pids if pid in found})
+    return folded.restore(results)
+
+
+# 把列表切成 parts 段连续的 (起始, 结束) 下标范围
+def chunk_ranges(count, parts):
+    parts = max(min(parts, count), 1)
+    size, extra = divmod(count, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+# 按问题切分，每个进程对自己那一段问题调用 match(问题)
+def parallel_map(match, items, jobs=None):
+    """返回 [match(item) for item in items]，match 及其依赖的数据通过 fork 继承"""
+    items = list(items)
+    ranges = chunk_ranges(len(items), resolve_jobs(jobs))
+    chunks = run_forked(_map_range, ranges, (match, items), jobs)
+    return [result for chunk in chunks for result in chunk]
+
+
+def _map_range(shared, task):
+    match, items = shared
+    start, end = task
+    return [match(item) for item in items[start:end]]
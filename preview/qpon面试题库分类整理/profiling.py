@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+检查脚本的分阶段性能记录
+
+各脚本和共用模块用 PROFILER.phase('阶段名') 包住一段代码，--profile 打开后
+记录每个阶段的墙钟时间、CPU 时间和峰值内存（tracemalloc），以及命中计数和
+按分类统计的耗时，最后以 JSON 输出。没有打开时 phase() 不做任何事。
+
+阶段可以嵌套（如 'match' 中第一次访问 corpus.folded 时的 'normalize'）：
+wall_ms / cpu_ms 是扣除子阶段之后的自身时间，各阶段相加即总耗时；
+total_wall_ms 包含子阶段。--jobs 子进程中的命中计数和分项耗时由 parallel.run_forked
+带回主进程合并；子进程里的阶段不单独记录，算在主进程包住进程池的阶段中。
+
+常用阶段名：list_files / read_decode / normalize / parse_categories / match /
+report_render / report_write
+"""
+
+import contextlib
+import json
+import sys
+import time
+import tracemalloc
+
+
+class Profiler:
+    """阶段计时器，同名阶段多次进入时累加"""
+
+    def __init__(self):
+        self.enabled = False
+        self.script = None
+        self.phases = {}
+        self.counters = {}
+        self.timings = {}
+        self._stack = []    # 进行中的阶段
+
+    def enable(self, script):
+        self.enabled = True
+        self.script = script
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        # 进入子阶段前把到目前为止的峰值记到外层阶段，再为子阶段重新计峰值
+        if self._stack:
+            outer = self._stack[-1]
+            outer['peak'] = max(outer['peak'], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        frame = {'name': name, 'child_wall': 0.0, 'child_cpu': 0.0, 'peak': 0}
+        self._stack.append(frame)
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            self._stack.pop()
+            peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            record = self.phases.setdefault(name, {'calls': 0, 'wall_ms': 0.0, 'cpu_ms': 0.0, 'total_wall_ms': 0.0,
+                                                   'peak_kb': 0.0})
+            record['calls'] += 1
+            record['wall_ms'] += (wall - frame['child_wall']) * 1000
+            record['cpu_ms'] += (cpu - frame['child_cpu']) * 1000
+            # 同名阶段嵌套时（load_corpus 中的 read_decode）含子阶段的时间只算最外层一次
+            if all(f['name'] != name for f in self._stack):
+                record['total_wall_ms'] += wall * 1000
+            record['peak_kb'] = max(record['peak_kb'], peak / 1024)
+            if self._stack:
+                outer = self._stack[-1]
+                outer['child_wall'] += wall
+                outer['child_cpu'] += cpu
+                outer['peak'] = max(outer['peak'], peak)
+
+    def count(self, group, key, n=1):
+        """累加计数，如 每种匹配方式的命中次数"""
+        if self.enabled:
+            counters = self.counters.setdefault(group, {})
+            counters[key] = counters.get(key, 0) + n
+
+    @contextlib.contextmanager
+    def timed(self, group, key):
+        """记录某一项（如 某个分类）的耗时，不影响阶段统计"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings = self.timings.setdefault(group, {})
+            timings[key] = timings.get(key, 0.0) + (time.perf_counter() - started) * 1000
+
+    def take_counts(self):
+        """取出并清空命中计数和分项耗时（子进程交回主进程）"""
+        counts = (self.counters, self.timings)
+        self.counters = {}
+        self.timings = {}
+        return counts
+
+    def merge_counts(self, counts):
+        """合并 take_counts() 的结果"""
+        counters, timings = counts
+        for group, items in counters.items():
+            for key, n in items.items():
+                self.count(group, key, n)
+        for group, items in timings.items():
+            merged = self.timings.setdefault(group, {})
+            for key, ms in items.items():
+                merged[key] = merged.get(key, 0.0) + ms
+
+    def to_dict(self):
+        return {
+            'script': self.script,
+            'phases': {name: {k: round(v, 3) if isinstance(v, float) else v for k, v in record.items()}
+                       for name, record in self.phases.items()},
+            'counters': self.counters,
+            'timings_ms': {group: {k: round(v, 3) for k, v in items.items()}
+                           for group, items in self.timings.items()},
+        }
+
+    def dump(self, path=None):
+        """输出 JSON：path 为 None 或 '-' 时写到标准错误，不和正常输出混在一起"""
+        if not self.enabled:
+            return
+        data = json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+        if path in (None, '-'):
+            print(data, file=sys.stderr)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(data + '\n')
+
+
+PROFILER = Profiler()
+
+
+# 给各脚本的命令行加上 --profile 参数
+def add_profile_argument(parser):
+    parser.add_argument('--profile', nargs='?', const='-', metavar='JSON',
+                        help='记录各阶段耗时和峰值内存，输出 JSON（默认写到标准错误）')
+
+
+# 统计每种匹配方式的命中数：labelled_keys(question) 返回 [(匹配方式, 关键串), ...]
+def count_matcher_hits(questions, results, labelled_keys):
+    if not PROFILER.enabled:
+        return
+    for question, hits in zip(questions, results):
+        for label, key in labelled_keys(question):
+            if key in hits:
+                PROFILER.count('matcher_hits', label)
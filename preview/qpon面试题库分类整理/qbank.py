@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+题库检查的统一入口
+
+子命令：
+  count      统计分类整理文档中的分类和问题数
+  coverage   各分类的覆盖检查（accurate_check.py）
+  compare    与质量检查报告对比，生成缺失问题报告（compare_questions.py）
+  checklist  图片问题清单的覆盖检查（check_coverage.py）
+  dups       近似重复章节检测（dups.py）
+  search     在整理文件中模糊查找问题
+
+各子命令需要的模块（包括参数的默认值所在的模块）在执行时才导入，
+qbank count 不会加载语料和匹配器。
+一次调用可以依次执行多个子命令，它们共用同一份已加载的语料：
+
+  python3 qbank.py coverage -j 2 checklist --approx dups
+  python3 qbank.py search 事件循环 --top 10
+
+search 会把之后的所有参数当作它自己的参数，因此只能放在最后。
+coverage / compare / checklist 支持 --format jsonl|csv，逐条输出检查记录（见 records.py）。
+"""
+
+import argparse
+import os
+import sys
+
+from profiling import PROFILER, add_profile_argument
+
+
+class Session:
+    """一次调用中共用的状态：按目录缓存已加载的语料"""
+
+    def __init__(self):
+        self.corpora = {}
+
+    def corpus(self, directory='.'):
+        if directory not in self.corpora:
+            from corpus import load_corpus
+            self.corpora[directory] = load_corpus(directory)
+        return self.corpora[directory]
+
+
+def run_count(args, session):
+    from classification import find_classification_doc, load_categories
+
+    if args.lines:
+        from count_questions import count_questions_accurately
+        return count_questions_accurately()
+
+    categories = load_categories()
+    print("=" * 60)
+    print(f"📋 {find_classification_doc()}")
+    print("=" * 60)
+    for category, questions in categories.items():
+        print(f"  {category:<30} {len(questions):>5}")
+    print("-" * 60)
+    print(f"  分类数: {len(categories)}")
+    print(f"  问题数: {sum(len(qs) for qs in categories.values())}")
+    print("=" * 60)
+    return categories
+
+
+def run_coverage(args, session):
+    import accurate_check
+    if args.format != 'text':
+        from records import write_records
+        records = accurate_check.iter_records(args.jobs, session.corpus(), args.incremental, args.suffix_array)
+        return write_records(records, args.format, args.output)
+    return accurate_check.main(incremental=args.incremental, jobs=args.jobs, corpus=session.corpus(),
+                               suffix_array=args.suffix_array)
+
+
+def run_compare(args, session):
+    import compare_questions
+    from ngram_index import DEFAULT_MIN_SCORE
+
+    # 只写 --fuzzy 不带得分时用默认的最低得分
+    fuzzy = DEFAULT_MIN_SCORE if args.fuzzy is True else args.fuzzy
+    if args.format != 'text':
+        from records import write_records
+        return write_records(compare_questions.iter_records(args.jobs, fuzzy), args.format, args.output)
+    return compare_questions.main(jobs=args.jobs, fuzzy=fuzzy)
+
+
+def run_checklist(args, session):
+    import check_coverage
+    from edit_distance import DEFAULT_MAX_RATIO
+
+    approx = DEFAULT_MAX_RATIO if args.approx is True else args.approx
+    if args.format != 'text':
+        from records import write_records
+        return write_records(check_coverage.iter_records(approx, session.corpus()), args.format, args.output)
+    return check_coverage.main(approx=approx, corpus=session.corpus())
+
+
+def run_dups(args, session):
+    import dups
+
+    threshold = dups.DEFAULT_THRESHOLD if args.threshold is None else args.threshold
+    if args.repo:
+        return dups.main(threshold=threshold, repo=True)
+    directories = args.directories or [d for d in dups.DEFAULT_DIRECTORIES if os.path.isdir(d)]
+    corpora = {d: session.corpus(d) for d in directories}
+    return dups.main(directories, threshold, corpora=corpora)
+
+
+def run_search(args, session):
+    from ngram_index import DEFAULT_MIN_SCORE, NgramIndex
+
+    query = ' '.join(args.query)
+    min_score = DEFAULT_MIN_SCORE if args.min_score is None else args.min_score
+    index = NgramIndex.from_corpus(session.corpus())
+    results = index.query(query, args.top, min_score, args.metric)
+
+    print(f"🔍 {query}")
+    print("-" * 80)
+    if not results:
+        print(f"  ❌ 没有得分 >= {min_score} 的结果")
+    for score, passage in results:
+        title = passage.title or '（无标题）'
+        text = ' '.join(passage.text.split())
+        snippet = text if len(text) <= 60 else text[:60] + "..."
+        print(f"  {score:.2f}  {passage.name} / {title}")
+        if passage.kind == 'paragraph':
+            print(f"        {snippet}")
+    return results
+
+
+def build_parsers():
+    """各子命令的参数解析器：{名称: (解析器, 处理函数)}"""
+    # 不导入各子命令的模块：可选值参数只写 --fuzzy / --approx 时为 True，
+    # 默认的得分、阈值在执行时再取
+    from records import add_format_arguments
+
+    parsers = {}
+
+    def add(name, handler, description):
+        parser = argparse.ArgumentParser(prog=f'qbank {name}', description=description)
+        parsers[name] = (parser, handler)
+        return parser
+
+    parser = add('count', run_count, '统计分类整理文档中的分类和问题数')
+    parser.add_argument('--lines', action='store_true', help='逐行列出分类和问题（count_questions.py）')
+
+    parser = add('coverage', run_coverage, '各分类的覆盖检查')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--incremental', action='store_true', help='只重新检查变化的文件和新增的问题')
+    mode.add_argument('--jobs', '-j', type=int, default=1, help='并行进程数，0 表示使用全部CPU核心')
+    mode.add_argument('--suffix-array', action='store_true', help='用持久化的后缀数组查找关键串，代替扫描全文')
+    add_format_arguments(parser)
+
+    parser = add('compare', run_compare, '与质量检查报告对比，生成缺失问题报告')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='并行进程数，0 表示使用全部CPU核心')
+    parser.add_argument('--fuzzy', nargs='?', type=float, const=True, metavar='MIN_SCORE',
+                        help='完全匹配失败时用字符 n-gram 模糊匹配')
+    add_format_arguments(parser)
+
+    parser = add('checklist', run_checklist, '图片问题清单的覆盖检查')
+    parser.add_argument('--approx', nargs='?', type=float, const=True, metavar='MAX_RATIO',
+                        help='未覆盖的题目再用编辑距离近似匹配标题')
+    add_format_arguments(parser)
+
+    parser = add('dups', run_dups, '检测题库中的近似重复章节')
+    parser.add_argument('directories', nargs='*', help='要检查的目录（默认当前目录和外部题库目录）')
+    parser.add_argument('--threshold', type=float, help='Jaccard 相似度阈值（默认 0.3）')
+    parser.add_argument('--repo', action='store_true', help='检查整个仓库中发现的MD文件')
+
+    parser = add('search', run_search, '在整理文件中模糊查找问题')
+    parser.add_argument('query', nargs='+', help='要查找的问题')
+    parser.add_argument('--top', type=int, default=5, help='列出的结果数')
+    parser.add_argument('--min-score', type=float, help='最低得分（默认同 ngram_index.DEFAULT_MIN_SCORE）')
+    parser.add_argument('--metric', choices=['overlap', 'jaccard'], default='overlap', help='得分方式')
+
+    return parsers
+
+
+# 按子命令名切分参数：[(名称, 该子命令的参数), ...]
+def split_commands(argv, names):
+    commands = []
+    for arg in argv:
+        if arg in names and not (commands and commands[-1][0] == 'search'):
+            commands.append((arg, []))
+        elif commands:
+            commands[-1][1].append(arg)
+        else:
+            return None
+    return commands
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    names = ['count', 'coverage', 'compare', 'checklist', 'dups', 'search']
+
+    parser = argparse.ArgumentParser(prog='qbank', description='题库检查的统一入口',
+                                     usage='qbank [--profile [JSON]] 子命令 [参数] [子命令 [参数] ...]',
+                                     epilog='子命令: ' + ', '.join(names) + '（qbank 子命令 -h 查看各自的参数）')
+    add_profile_argument(parser)
+    # 全局参数只能写在第一个子命令之前
+    first = next((i for i, arg in enumerate(argv) if arg in names), len(argv))
+    args = parser.parse_args(argv[:first])
+    commands = split_commands(argv[first:], names)
+    if not commands:
+        parser.error('缺少子命令')
+
+    parsers = build_parsers()
+    parsed = []
+    for name, command_argv in commands:
+        sub_parser, handler = parsers[name]
+        parsed.append((handler, sub_parser.parse_args(command_argv)))
+
+    if args.profile:
+        PROFILER.enable('qbank')
+    session = Session()
+    for i, (handler, command_args) in enumerate(parsed):
+        if i:
+            print()
+        handler(command_args, session)
+    PROFILER.dump(args.profile)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
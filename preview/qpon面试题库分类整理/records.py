@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+覆盖检查结果的机器可读输出（JSON Lines / CSV）
+
+各检查脚本的 iter_records() 逐个问题产出记录，write_records 边产出边写出，
+不需要先拼出整份报告。每条记录的字段见 FIELDS：
+  checker      产生记录的脚本
+  question_id  问题编号（分类整理文档中按出现顺序从 1 开始；图片清单为清单编号）
+  category     问题所属分类
+  question     问题原文
+  covered      是否已覆盖
+  file         命中的文件
+  section      命中位置所在的章节标题
+  offset       命中位置在文件内的字符偏移
+  score        匹配得分：精确匹配为 1.0，模糊/近似匹配为相似度
+  matcher      命中的匹配方式（如 完整、前15字、模糊）
+未覆盖的问题只有前五项，其余为空。
+"""
+
+import csv
+import json
+import os
+import sys
+from contextlib import contextmanager
+
+FIELDS = ['checker', 'question_id', 'category', 'question', 'covered',
+          'file', 'section', 'offset', 'score', 'matcher']
+FORMATS = ['text', 'jsonl', 'csv']
+
+
+# 给各脚本的命令行加上 --format / --output 参数
+def add_format_arguments(parser):
+    parser.add_argument('--format', choices=FORMATS, default='text',
+                        help='输出格式：text 为原来的报告，jsonl / csv 逐条输出检查记录')
+    parser.add_argument('--output', '-o', metavar='PATH', help='记录写入的文件（默认标准输出）')
+
+
+def coverage_record(checker, question_id, category, question, covered=False,
+                    file=None, section=None, offset=None, score=None, matcher=None):
+    return {'checker': checker, 'question_id': question_id, 'category': category,
+            'question': question, 'covered': covered, 'file': file, 'section': section,
+            'offset': offset, 'score': score, 'matcher': matcher}
+
+
+# 精确匹配的结果转成记录：hits 为 {关键串: 全文中的位置}，取 labelled 中第一个命中的关键串
+def hit_record(checker, question_id, category, question, hits, labelled, corpus):
+    for label, key in labelled:
+        if key in hits:
+            return position_record(checker, question_id, category, question, corpus, hits[key], 1.0, label)
+    return coverage_record(checker, question_id, category, question)
+
+
+# 全文中的字符位置转成记录（文件名、章节和文件内偏移）
+def position_record(checker, question_id, category, question, corpus, position, score, matcher):
+    md_file, section = corpus.locate(position)
+    return coverage_record(checker, question_id, category, question, True, md_file.name,
+                           section.title if section else None, position - md_file.char_start,
+                           round(score, 4), matcher)
+
+
+class RecordWriter:
+    """逐条写出记录，jsonl 每行一个 JSON 对象，csv 第一行为表头"""
+
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self.fmt = fmt
+        self.count = 0
+        if fmt == 'csv':
+            self._csv = csv.DictWriter(stream, FIELDS, lineterminator='\n')
+            self._csv.writeheader()
+        elif fmt != 'jsonl':
+            raise ValueError(f'不支持的记录格式: {fmt}')
+
+    def write(self, record):
+        if self.fmt == 'csv':
+            self._csv.writerow({k: ('' if v is None else v) for k, v in record.items()})
+        else:
+            self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.count += 1
+
+
+@contextmanager
+def open_records(fmt, path=None):
+    if path in (None, '-'):
+        try:
+            yield RecordWriter(sys.stdout, fmt)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # 下游（如 head）提前关闭管道：不再输出，退出时也不再报错
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    else:
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            yield RecordWriter(f, fmt)
+
+
+def write_records(records, fmt, path=None):
+    """把 records（可以是生成器）逐条写出，返回写出的条数"""
+    with open_records(fmt, path) as writer:
+        for record in records:
+            writer.write(record)
+    return writer.count
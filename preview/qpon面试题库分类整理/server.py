@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+题库的本地检索服务（只用标准库，可离线运行）
+
+启动时加载当前目录（章节文件和分类整理文档）和外部题库目录，每个标题到下一个
+标题之间的正文作为一个检索单元（文件第一个标题之前的正文也单独作为一个单元），
+按规整后的字符 2-gram 建立倒排索引，常驻内存；单字也建倒排表，只用于一个字的查询。
+查询按 BM25 排序，返回单元所在的文件、标题路径和按偏移切出的摘录。倒排表里直接
+存 BM25 的词频部分，平均长度取首次加载完成时的值，查询时只需累加 idf × 权重。
+
+目录中的MD文件有变化时（inotify，或轮询），只重新加载该目录的语料（走语料缓存），
+对比 blob 后只重建变化文件的倒排表。
+
+接口（GET，返回 JSON）：
+  /search?q=事件循环&k=10&category=Vue   关键词检索；category 按文件名或顶层标题筛选，可以不带 q
+  /categories                           分类整理文档中的分类和问题数（启动和重新加载时解析）
+  /stats                                索引规模和最近一次重新加载的情况
+  /reload                               立即检查所有目录
+
+用法: python3 server.py [--host 127.0.0.1] [--port 8765] [--polling] [目录 ...]
+"""
+
+import argparse
+import heapq
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter, namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from classification import find_classification_doc, load_categories
+from corpus import load_corpus
+from ngram_index import normalize
+from synonyms import canonical, default_synonyms
+from textnorm import FoldedText
+from watch import create_watcher
+
+DEFAULT_DIRECTORIES = ['.', os.path.join('..', 'qpon前端面试题库外部')]
+DEFAULT_PORT = 8765
+
+GRAM_SIZE = 2
+K1 = 1.2
+B = 0.75
+EXCERPT_BEFORE = 40
+EXCERPT_AFTER = 120
+
+# 检索单元：一个标题和它下面到下一个标题之前的正文，偏移为文件内字符偏移
+Unit = namedtuple('Unit', ['directory', 'name', 'title', 'path', 'lineno', 'char_start', 'char_end'])
+
+
+def grams(text, n=GRAM_SIZE):
+    s = normalize(text)
+    if len(s) < n:
+        return Counter([s]) if s else Counter()
+    return Counter(s[i:i + n] for i in range(len(s) - n + 1))
+
+
+# 检索单元的词：2-gram 加上单字（单字的键只有一个字符，与 2-gram 不会冲突），以及用于 BM25 的长度（gram 数）
+def unit_terms(text, n=GRAM_SIZE):
+    s = normalize(text)
+    if len(s) < n:
+        return (Counter([s]) if s else Counter()), len(s)
+    counts = Counter(s[i:i + n] for i in range(len(s) - n + 1))
+    length = len(s) - n + 1
+    counts.update(s)
+    return counts, length
+
+
+class SearchIndex:
+    """按文件增删的 BM25 倒排索引"""
+
+    def __init__(self):
+        self.units = {}             # 单元编号 -> Unit
+        self.lengths = {}           # 单元编号 -> gram 数
+        self.postings = {}          # gram 或单字 -> {单元编号: 词频部分的权重}（finalize 之前为词频）
+        self.files = {}             # (目录, 文件名) -> (blob, 文本, [单元编号])
+        self.next_uid = 0
+        self.total_length = 0
+        self.avg_length = None
+
+    def __len__(self):
+        return len(self.units)
+
+    def _weight(self, tf, length):
+        return tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / self.avg_length))
+
+    def finalize(self):
+        """首次加载完成后确定平均长度，把词频换成权重；之后加入的文件直接计算权重"""
+        self.avg_length = self.total_length / len(self.units) if self.units else 1
+        lengths = self.lengths
+        for posting in self.postings.values():
+            for uid, tf in posting.items():
+                posting[uid] = self._weight(tf, lengths[uid])
+
+    def _units(self, directory, md_file):
+        """文件切成的检索单元：第一个标题之前的正文（标题记为文件名），然后每个标题到下一个标题之前"""
+        text = md_file.text
+        headings = md_file.headings
+        first = headings.char_starts[0] if len(headings) else len(text)
+        if first:
+            yield Unit(directory, md_file.name, md_file.name, md_file.name, 1, 0, first)
+        for section in headings:
+            i = section.index
+            end = headings.char_starts[i + 1] if i + 1 < len(headings) else len(text)
+            yield Unit(directory, md_file.name, section.title, ' / '.join(headings.path(i)),
+                       section.lineno, section.char_start, end)
+
+    def add_file(self, directory, md_file):
+        text = md_file.text
+        uids = []
+        for unit in self._units(directory, md_file):
+            counts, length = unit_terms(text[unit.char_start:unit.char_end])
+            if not counts:
+                continue
+            uid = self.next_uid
+            self.next_uid += 1
+            self.units[uid] = unit
+            self.lengths[uid] = length
+            self.total_length += length
+            for gram, tf in counts.items():
+                value = tf if self.avg_length is None else self._weight(tf, length)
+                posting = self.postings.get(gram)
+                if posting is None:
+                    self.postings[gram] = {uid: value}
+                else:
+                    posting[uid] = value
+            uids.append(uid)
+        self.files[directory, md_file.name] = (md_file.blob, text, uids)
+
+    def remove_file(self, directory, name):
+        _, text, uids = self.files.pop((directory, name))
+        for uid in uids:
+            start, end = self.units[uid].char_start, self.units[uid].char_end
+            for gram in unit_terms(text[start:end])[0]:
+                posting = self.postings[gram]
+                del posting[uid]
+                if not posting:
+                    del self.postings[gram]
+            self.total_length -= self.lengths.pop(uid)
+            del self.units[uid]
+
+    def sync(self, directory, corpus):
+        """让索引中该目录的文件与 corpus 一致，返回变化的文件名"""
+        changed = []
+        for (d, name) in [key for key in self.files if key[0] == directory]:
+            if name not in corpus:
+                self.remove_file(d, name)
+                changed.append(name)
+        for name, md_file in corpus.items():
+            indexed = self.files.get((directory, name))
+            if indexed and indexed[0] == md_file.blob:
+                continue
+            if indexed:
+                self.remove_file(directory, name)
+            self.add_file(directory, md_file)
+            changed.append(name)
+        return changed
+
+    def _matches_category(self, unit, category):
+        return category in unit.name or category in unit.path.split(' / ')[0]
+
+    def search(self, query, k=10, category=None):
+        """返回 [(得分, 单元编号), ...]，按得分从高到低；没有 query 时列出分类下的单元"""
+        if not query:
+            uids = [uid for uid, unit in self.units.items() if category and self._matches_category(unit, category)]
+            return [(0.0, uid) for uid in uids[:k]]
+
+        n = len(self.units)
+        scores = {}
+        get = scores.get
+        for gram in grams(query):
+            posting = self.postings.get(gram)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for uid, weight in posting.items():
+                scores[uid] = get(uid, 0.0) + idf * weight
+        if category:
+            scores = {uid: s for uid, s in scores.items() if self._matches_category(self.units[uid], category)}
+        return heapq.nlargest(k, ((s, uid) for uid, s in scores.items()), key=lambda item: (item[0], -item[1]))
+
+    def excerpt(self, uid, query=''):
+        """从文件文本中按偏移切出摘录：以查询词（规整后比较）第一次出现的位置为中心，找不到时取开头"""
+        unit = self.units[uid]
+        text = self.files[unit.directory, unit.name][1]
+        body = text[unit.char_start:unit.char_end]
+        folded = FoldedText(body, default_synonyms())
+        pos = folded.text.find(canonical(query)) if query else -1
+        pos = folded.to_original(pos) if pos != -1 else 0
+        start = max(pos - EXCERPT_BEFORE, 0)
+        end = min(pos + EXCERPT_AFTER, len(body))
+        return unit.char_start + start, ' '.join(body[start:end].split())
+
+
+class BankServer:
+    """持有各目录的语料和检索索引，负责重新加载"""
+
+    def __init__(self, directories, polling=False):
+        self.directories = directories
+        self.polling = polling
+        self.index = SearchIndex()
+        self.lock = threading.Lock()
+        self.last_reload = None
+        self.categories = []
+        self.stopped = threading.Event()
+        for directory in directories:
+            self.reload(directory)
+        self.index.finalize()
+        self.load_categories()
+
+    def load_categories(self):
+        """解析分类整理文档（/categories 直接返回解析结果，不在每次请求时解析）"""
+        path = find_classification_doc()
+        try:
+            categories = [{'category': name, 'questions': len(questions)}
+                          for name, questions in load_categories(path).items()]
+        except OSError:
+            categories = []
+        with self.lock:
+            self.categories = categories
+
+    def reload(self, directory):
+        started = time.perf_counter()
+        corpus = load_corpus(directory)
+        with self.lock:
+            changed = self.index.sync(directory, corpus)
+        # 首次加载时由 __init__ 统一解析；之后目录有变化时重新解析
+        if changed and self.index.avg_length is not None:
+            self.load_categories()
+        self.last_reload = {'directory': directory, 'changed': changed,
+                            'ms': round((time.perf_counter() - started) * 1000, 3)}
+        return changed
+
+    def reload_all(self):
+        return {directory: self.reload(directory) for directory in self.directories}
+
+    def watch(self):
+        """每个目录一个后台线程监听变化"""
+        for directory in self.directories:
+            threading.Thread(target=self._watch_directory, args=(directory,), daemon=True).start()
+
+    def _watch_directory(self, directory):
+        watcher = create_watcher(directory, self.polling)
+        try:
+            while not self.stopped.is_set():
+                if watcher.wait(timeout=1.0):
+                    changed = self.reload(directory)
+                    if changed:
+                        print(f"🔄 {directory}: {', '.join(changed)}（{self.last_reload['ms']} ms）", flush=True)
+        finally:
+            watcher.close()
+
+    def search(self, query, k=10, category=None):
+        started = time.perf_counter()
+        with self.lock:
+            hits = self.index.search(query, k, category)
+            results = []
+            for score, uid in hits:
+                unit = self.index.units[uid]
+                offset, excerpt = self.index.excerpt(uid, query)
+                results.append({'score': round(score, 4), 'directory': unit.directory, 'file': unit.name,
+                                'title': unit.title, 'path': unit.path, 'lineno': unit.lineno,
+                                'offset': offset, 'excerpt': excerpt})
+        return {'query': query, 'category': category, 'took_ms': round((time.perf_counter() - started) * 1000, 3),
+                'results': results}
+
+    def stats(self):
+        with self.lock:
+            return {'directories': self.directories, 'files': len(self.index.files), 'units': len(self.index),
+                    'grams': len(self.index.postings), 'last_reload': self.last_reload}
+
+
+def make_handler(bank):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path
+            try:
+                # 没有百分号编码的中文按 UTF-8 还原（请求行按 latin-1 解码）
+                path = path.encode('latin-1').decode('utf-8')
+            except UnicodeError:
+                pass
+            url = urlparse(path)
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            try:
+                if url.path == '/search':
+                    body = bank.search(params.get('q', ''), int(params.get('k', 10)), params.get('category'))
+                elif url.path == '/categories':
+                    body = bank.categories
+                elif url.path == '/stats':
+                    body = bank.stats()
+                elif url.path == '/reload':
+                    body = bank.reload_all()
+                else:
+                    return self._send(404, {'error': f'未知的路径: {url.path}'})
+            except ValueError as e:
+                return self._send(400, {'error': str(e)})
+            self._send(200, body)
+
+        def _send(self, status, body):
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main(host='127.0.0.1', port=DEFAULT_PORT, directories=None, polling=False):
+    directories = directories or [d for d in DEFAULT_DIRECTORIES if os.path.isdir(d)]
+    started = time.perf_counter()
+    bank = BankServer(directories, polling)
+    stats = bank.stats()
+    print("=" * 80)
+    print(f"🔎 题库检索服务: http://{host}:{port}/search?q=...")
+    print("=" * 80)
+    print(f"  目录: {', '.join(directories)}")
+    print(f"  {stats['files']} 个文件, {stats['units']} 个检索单元, {stats['grams']} 个 gram，"
+          f"加载耗时 {(time.perf_counter() - started) * 1000:.0f} ms")
+    print("=" * 80, flush=True)
+
+    bank.watch()
+    server = ThreadingHTTPServer((host, port), make_handler(bank))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        bank.stopped.set()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='题库的本地检索服务')
+    parser.add_argument('directories', nargs='*', help='要加载的目录（默认当前目录和外部题库目录）')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='监听端口')
+    parser.add_argument('--polling', action='store_true', help='使用轮询代替 inotify 监听文件变化')
+    args = parser.parse_args()
+    main(args.host, args.port, args.directories, args.polling)
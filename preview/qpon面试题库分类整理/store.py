@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+题库的 SQLite 存储（可选）
+
+索引器把分类整理文档、图片问题清单、整理文件的标题树和覆盖检查结果写进
+.qbank_cache/qbank.sqlite：
+  categories / questions  分类和问题（source 为 doc 或 checklist）
+  files                   整理文件的统计信息
+  sections                各级标题：文件、标题路径、行号、字符起止位置
+  coverage                问题 -> 命中位置（来自各检查脚本的 iter_records）
+  sections_fts            各节正文（到下一个标题为止）的 FTS5 全文索引，trigram 分词
+数据库和它的输入都在章节目录下，与当前目录无关。meta 表里记着两份摘要：
+输入文件（整理文件、两份问题来源、决定检查结果的代码和 qbank.json）的 大小+mtime，
+以及它们的内容。打开时只 stat 这些文件，没有变化就直接查询；有变化时再比较
+内容摘要，内容也变了才重新索引（只是 mtime 变了时只更新 meta）。
+
+报告直接查询数据库，不再解析MD文件：
+  python3 store.py index [--rebuild]     建立/更新索引
+  python3 store.py report                各分类覆盖情况
+  python3 store.py missing [--source]    未覆盖的问题
+  python3 store.py files                 各文件统计
+  python3 store.py search 事件循环        全文检索各节
+  python3 store.py sql "SELECT ..."      任意查询
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from classification import CHECKLIST_FILE, find_classification_doc
+from corpus import CACHE_DIR, list_md_files, load_corpus
+from discovery import CHAPTER_DIR, CONFIG_FILE
+from synonyms import default_synonyms
+
+STORE_FILE = os.path.join(CHAPTER_DIR, CACHE_DIR, 'qbank.sqlite')
+STORE_VERSION = 3
+
+# 决定索引内容和检查结果的代码（两个检查脚本及其依赖）：内容变化时重新索引
+LOGIC_FILES = ['accurate_check.py', 'check_coverage.py', 'classification.py', 'corpus.py', 'edit_distance.py',
+               'headings.py', 'matcher.py', 'ngram_index.py', 'records.py', 'synonyms.py', 'textnorm.py',
+               'tokenizer.py', CONFIG_FILE]
+
+# 写入 coverage 表的检查：(检查脚本, 问题来源)
+COVERAGE_CHECKERS = [('accurate_check', 'doc'), ('check_coverage', 'checklist')]
+CHECKLIST_CATEGORY = '图片问题清单'
+
+SCHEMA = '''
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE categories (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE questions (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    number INTEGER NOT NULL,            -- 分类整理文档中的顺序号 / 清单编号
+    category_id INTEGER NOT NULL REFERENCES categories(id),
+    text TEXT NOT NULL,
+    UNIQUE (source, number)
+);
+CREATE TABLE files (
+    name TEXT PRIMARY KEY,
+    blob TEXT NOT NULL,
+    bytes INTEGER, chars INTEGER, lines INTEGER, headings INTEGER, questions INTEGER
+);
+CREATE TABLE sections (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL REFERENCES files(name),
+    level INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    path TEXT NOT NULL,                 -- 从顶层到本节的标题，用 " / " 连接
+    lineno INTEGER NOT NULL,
+    char_start INTEGER NOT NULL,        -- 文件内字符偏移，含子节
+    char_end INTEGER NOT NULL
+);
+CREATE INDEX sections_file ON sections (file, char_start);
+CREATE TABLE coverage (
+    question_id INTEGER NOT NULL REFERENCES questions(id),
+    checker TEXT NOT NULL,
+    covered INTEGER NOT NULL,
+    file TEXT,
+    section_id INTEGER REFERENCES sections(id),
+    offset INTEGER,
+    score REAL,
+    matcher TEXT,
+    PRIMARY KEY (question_id, checker)
+);
+'''
+
+
+def _digest(*parts):
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(part.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+@contextmanager
+def _in_chapter_dir():
+    """各检查脚本按当前目录读取文件，建立和校验索引时切换到章节目录"""
+    cwd = os.getcwd()
+    os.chdir(CHAPTER_DIR)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+# 索引的输入文件：两份问题来源 + 决定检查结果的代码（整理文件另外按语料计算）
+def _input_files():
+    return [find_classification_doc(), CHECKLIST_FILE] + LOGIC_FILES
+
+
+# 便宜的摘要：整理文件和其他输入文件的 大小+mtime，不读取内容（在章节目录下调用）
+def stat_signature():
+    parts = [str(STORE_VERSION)]
+    for name in list_md_files() + _input_files():
+        try:
+            st = os.stat(name)
+        except OSError:
+            parts.append(f'{name}:-')
+            continue
+        parts.append(f'{name}:{st.st_size}:{st.st_mtime_ns}')
+    return _digest(*parts)
+
+
+# 当前输入的摘要：整理文件的 blob + 其他输入文件的内容（在章节目录下调用）
+def source_signature(corpus):
+    parts = [str(STORE_VERSION), default_synonyms().signature]
+    parts += [f'{name}:{md_file.blob}' for name, md_file in corpus.items()]
+    for path in _input_files():
+        with open(path, 'r', encoding='utf-8') as f:
+            parts.append(f.read())
+    return _digest(*parts)
+
+
+def _create_fts(conn):
+    """trigram 分词对中文可用；SQLite 不支持 FTS5 时退化为普通表，检索用 LIKE"""
+    for sql in ("CREATE VIRTUAL TABLE sections_fts USING fts5(title, body, tokenize='trigram')",
+                "CREATE TABLE sections_fts (title TEXT, body TEXT)"):
+        try:
+            conn.execute(sql)
+            return sql.startswith('CREATE VIRTUAL')
+        except sqlite3.OperationalError:
+            continue
+    return False
+
+
+def _insert_sections(conn, corpus):
+    section_rows = []
+    fts_rows = []
+    for md_file in corpus.values():
+        text = md_file.text
+        headings = md_file.headings
+        for section in headings:
+            i = section.index
+            body_end = headings.char_starts[i + 1] if i + 1 < len(headings) else len(text)
+            section_rows.append((md_file.name, section.level, section.title, ' / '.join(headings.path(i)),
+                                 section.lineno, section.char_start, section.char_end))
+            fts_rows.append((section.title, text[section.char_start:body_end]))
+
+    first = conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM sections').fetchone()[0]
+    conn.executemany('INSERT INTO sections (file, level, title, path, lineno, char_start, char_end) '
+                     'VALUES (?, ?, ?, ?, ?, ?, ?)', section_rows)
+    conn.executemany('INSERT INTO sections_fts (rowid, title, body) VALUES (?, ?, ?)',
+                     [(first + k, title, body) for k, (title, body) in enumerate(fts_rows)])
+
+
+def _insert_questions(conn):
+    from check_coverage import read_checklist
+    from classification import load_categories
+
+    number = 0
+    for category, questions in load_categories().items():
+        category_id = conn.execute('INSERT INTO categories (source, name) VALUES (?, ?)', ('doc', category)).lastrowid
+        for question in questions:
+            number += 1
+            conn.execute('INSERT INTO questions (source, number, category_id, text) VALUES (?, ?, ?, ?)',
+                         ('doc', number, category_id, question))
+
+    category_id = conn.execute('INSERT INTO categories (source, name) VALUES (?, ?)',
+                               ('checklist', CHECKLIST_CATEGORY)).lastrowid
+    conn.executemany('INSERT INTO questions (source, number, category_id, text) VALUES (?, ?, ?, ?)',
+                     [('checklist', num, category_id, title) for num, title in sorted(read_checklist().items())])
+
+
+def _insert_coverage(conn, corpus):
+    import accurate_check
+    import check_coverage
+
+    generators = {
+        'accurate_check': lambda: accurate_check.iter_records(corpus=corpus),
+        'check_coverage': lambda: check_coverage.iter_records(corpus=corpus),
+    }
+    for checker, source in COVERAGE_CHECKERS:
+        # section_id：包含命中位置的最深一节
+        conn.executemany('''
+            INSERT INTO coverage (question_id, checker, covered, file, section_id, offset, score, matcher)
+            SELECT q.id, :checker, :covered, :file,
+                   (SELECT s.id FROM sections s
+                     WHERE s.file = :file AND s.char_start <= :offset AND :offset < s.char_end
+                     ORDER BY s.level DESC LIMIT 1),
+                   :offset, :score, :matcher
+              FROM questions q WHERE q.source = :source AND q.number = :question_id
+        ''', (dict(record, source=source) for record in generators[checker]()))
+
+
+def build_store(path=STORE_FILE, corpus=None):
+    """重新建立整个数据库（写到临时文件，完成后替换；在章节目录下调用）"""
+    corpus = corpus if corpus is not None else load_corpus()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    with conn:
+        conn.executescript(SCHEMA)
+        fts = _create_fts(conn)
+        conn.executemany('INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?)',
+                         [(name, f.blob, f.stats['bytes'], f.stats['chars'], f.stats['lines'],
+                           f.stats['headings'], f.stats['questions']) for name, f in corpus.items()])
+        _insert_sections(conn, corpus)
+        _insert_questions(conn)
+        _insert_coverage(conn, corpus)
+        conn.executemany('INSERT INTO meta VALUES (?, ?)',
+                         [('signature', source_signature(corpus)), ('stat_signature', stat_signature()),
+                          ('fts5', '1' if fts else '0'), ('built_at', time.strftime('%Y-%m-%d %H:%M:%S'))])
+    conn.close()
+    os.replace(tmp_path, path)
+
+
+def _stored_meta(conn):
+    try:
+        return dict(conn.execute('SELECT key, value FROM meta').fetchall())
+    except sqlite3.Error:
+        return {}
+
+
+def open_store(path=STORE_FILE, rebuild=False):
+    """
+    打开数据库，输入有变化（或 rebuild）时先重新索引；返回 (连接, 是否重建)。
+    输入文件的 大小+mtime 没变时不加载语料；变了但内容摘要没变时只更新 meta。
+    """
+    path = os.path.abspath(path)
+    with _in_chapter_dir():
+        conn = sqlite3.connect(path) if os.path.exists(path) and not rebuild else None
+        meta = _stored_meta(conn) if conn is not None else {}
+        stats = stat_signature()
+        built = False
+        if meta.get('stat_signature') != stats:
+            corpus = load_corpus()
+            if meta.get('signature') != source_signature(corpus):
+                if conn is not None:
+                    conn.close()
+                build_store(path, corpus)
+                conn = sqlite3.connect(path)
+                built = True
+            else:
+                with conn:
+                    conn.execute("INSERT OR REPLACE INTO meta VALUES ('stat_signature', ?)", (stats,))
+    conn.row_factory = sqlite3.Row
+    return conn, built
+
+
+# 各分类覆盖情况
+def category_coverage(conn, checker='accurate_check'):
+    return conn.execute('''
+        SELECT c.name AS category, COUNT(*) AS total, SUM(cv.covered) AS covered
+          FROM questions q
+          JOIN categories c ON c.id = q.category_id
+          JOIN coverage cv ON cv.question_id = q.id AND cv.checker = ?
+         GROUP BY c.id ORDER BY c.id
+    ''', (checker,)).fetchall()
+
+
+# 未覆盖的问题
+def missing_questions(conn, source=None):
+    return conn.execute('''
+        SELECT q.source, q.number, c.name AS category, q.text, cv.checker
+          FROM questions q
+          JOIN categories c ON c.id = q.category_id
+          JOIN coverage cv ON cv.question_id = q.id
+         WHERE cv.covered = 0 AND (:source IS NULL OR q.source = :source)
+         ORDER BY q.source, q.number
+    ''', {'source': source}).fetchall()
+
+
+def file_stats(conn):
+    return conn.execute('''
+        SELECT f.name, f.chars, f.lines, f.questions, COUNT(cv.question_id) AS hits
+          FROM files f LEFT JOIN coverage cv ON cv.file = f.name AND cv.covered
+         GROUP BY f.name ORDER BY f.name
+    ''').fetchall()
+
+
+def search_sections(conn, query, limit=10):
+    """全文检索各节：三个字以上用 FTS5 MATCH 按 bm25 排序，更短的查询（trigram 无法索引）用 LIKE"""
+    fts = conn.execute("SELECT value FROM meta WHERE key = 'fts5'").fetchone()[0] == '1'
+    if fts and len(query) >= 3:
+        phrase = '"' + query.replace('"', '""') + '"'
+        sql = '''
+            SELECT s.file, s.path, s.lineno, bm25(sections_fts) AS rank,
+                   snippet(sections_fts, 1, '【', '】', '…', 12) AS snippet
+              FROM sections_fts JOIN sections s ON s.id = sections_fts.rowid
+             WHERE sections_fts MATCH ? ORDER BY rank LIMIT ?
+        '''
+        return conn.execute(sql, (phrase, limit)).fetchall()
+    pattern = '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+    sql = '''
+        SELECT s.file, s.path, s.lineno, 0 AS rank, substr(f.body, 1, 40) AS snippet
+          FROM sections_fts f JOIN sections s ON s.id = f.rowid
+         WHERE f.title LIKE :p ESCAPE '\\' OR f.body LIKE :p ESCAPE '\\'
+         ORDER BY (f.title LIKE :p ESCAPE '\\') DESC, s.id LIMIT :limit
+    '''
+    return conn.execute(sql, {'p': pattern, 'limit': limit}).fetchall()
+
+
+def print_report(conn):
+    rows = category_coverage(conn)
+    print("=" * 100)
+    print(" " * 35 + "📋 QPON面试题库覆盖检查（SQLite）")
+    print("=" * 100)
+    print(f"{'分类':<25} {'问题数':>8} {'已覆盖':>8} {'未覆盖':>8} {'覆盖率':>10} {'状态':>8}")
+    print("-" * 100)
+    total = covered = 0
+    for row in rows:
+        rate = row['covered'] / row['total'] * 100 if row['total'] else 0
+        status = "✅" if rate == 100 else "⚠️" if rate >= 70 else "❌"
+        print(f"{row['category']:<25} {row['total']:>8} {row['covered']:>8} {row['total'] - row['covered']:>8} "
+              f"{rate:>9.1f}% {status:>8}")
+        total += row['total']
+        covered += row['covered']
+    print("-" * 100)
+    rate = covered / total * 100 if total else 0
+    print(f"{'总计':<25} {total:>8} {covered:>8} {total - covered:>8} {rate:>9.1f}%")
+    print("=" * 100)
+
+
+def print_missing(conn, source=None):
+    rows = missing_questions(conn, source)
+    print("=" * 100)
+    print(f"❌ 未覆盖的问题: {len(rows)} 个")
+    print("=" * 100)
+    current = None
+    for row in rows:
+        if row['category'] != current:
+            current = row['category']
+            print(f"\n【{current}】")
+        print(f"  {row['number']}. {row['text']}")
+
+
+def print_files(conn):
+    print("=" * 100)
+    print(f"{'文件':<40} {'字符':>8} {'行数':>6} {'题目':>6} {'命中':>6}")
+    print("-" * 100)
+    for row in file_stats(conn):
+        print(f"{row['name']:<40} {row['chars']:>8} {row['lines']:>6} {row['questions']:>6} {row['hits']:>6}")
+    print("=" * 100)
+
+
+def print_search(conn, query, limit=10):
+    rows = search_sections(conn, query, limit)
+    print(f"🔍 {query}")
+    print("-" * 100)
+    if not rows:
+        print("  ❌ 没有结果")
+    for row in rows:
+        print(f"  {row['file']}:{row['lineno']}  {row['path']}")
+        snippet = ' '.join(row['snippet'].split())
+        if snippet:
+            print(f"      {snippet}")
+
+
+def print_sql(conn, sql):
+    cursor = conn.execute(sql)
+    if cursor.description is None:
+        return
+    print('\t'.join(d[0] for d in cursor.description))
+    for row in cursor:
+        print('\t'.join('' if v is None else str(v) for v in row))
+
+
+def main(command='report', rebuild=False, source=None, query=None, limit=10, path=STORE_FILE):
+    started = time.perf_counter()
+    conn, built = open_store(path, rebuild)
+    if command == 'index':
+        count = conn.execute('SELECT COUNT(*) FROM sections').fetchone()[0]
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{'🔨 已重新索引' if built else '✓ 索引已是最新'}: {path}（{count} 节，{elapsed:.0f} ms）")
+    elif command == 'report':
+        print_report(conn)
+    elif command == 'missing':
+        print_missing(conn, source)
+    elif command == 'files':
+        print_files(conn)
+    elif command == 'search':
+        print_search(conn, query, limit)
+    elif command == 'sql':
+        print_sql(conn, query)
+    conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='题库的 SQLite 存储')
+    parser.add_argument('command', nargs='?', default='report',
+                        choices=['index', 'report', 'missing', 'files', 'search', 'sql'])
+    parser.add_argument('query', nargs='?', help='search 的检索词，或 sql 的查询语句')
+    parser.add_argument('--rebuild', action='store_true', help='忽略摘要，重新建立索引')
+    parser.add_argument('--source', choices=['doc', 'checklist'], help='missing 只列出某个来源的问题')
+    parser.add_argument('--limit', type=int, default=10, help='search 的结果数')
+    args = parser.parse_args()
+    if args.command in ('search', 'sql') and not args.query:
+        parser.error(f'{args.command} 需要参数')
+    main(args.command, args.rebuild, args.source, args.query, args.limit)
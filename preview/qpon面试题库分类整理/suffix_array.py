@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+整体语料的后缀数组，用于任意子串的查找
+
+对规整后的全文 Corpus.folded.text（各文件用分隔符拼接，与覆盖检查扫描的文本相同）的所有
+后缀排序，得到后缀起点的数组。包含某个子串的后缀在数组中连续排列，两次二分
+查找（每次比较最多 len(pattern) 个字符）就能得到出现次数，即 O(m log n)：
+  contains / count / first
+first 要取区间中最小的后缀起点：后缀数组按 RMQ_BLOCK 分块，记下每块的最小值，
+块最小值上再建稀疏表（第一次调用时构建，约 n / RMQ_BLOCK × log n 个整数），区间
+最小值只需看两端不满一块的部分和稀疏表中的两项，与出现次数无关。
+locate 返回全部出现位置，还要排序，代价是 O(m log n + occ log occ)；最近
+LOCATE_CACHE_SIZE 个查询的结果会缓存。
+查找的字符串应是规整后的文本（synonyms.canonical）。命中位置换回原文中的位置后，
+可以用 corpus.locate 映射回文件和章节（hits）。
+
+构建用前缀倍增：先按字符排名，每轮按 (前 k 个字符的排名, 后 k 个字符的排名)
+重新排序，直到所有排名都不同。装了 numpy 时用 numpy 排序，否则用纯 Python
+（慢一些，只在语料变化后执行一次）。结果按语料内容的摘要保存在 .qbank_cache/
+下，之后直接读取。
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+from corpus import CACHE_DIR, load_corpus
+from synonyms import canonical, default_synonyms
+
+SA_VERSION = 2
+MAGIC = b'QSA1'
+RMQ_BLOCK = 64
+LOCATE_CACHE_SIZE = 256
+
+
+def _build_numpy(text, np):
+    n = len(text)
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    _, rank = np.unique(codes, return_inverse=True)
+    rank = rank.astype(np.int64)
+    sa = np.argsort(rank, kind='stable')
+    k = 1
+    while k < n:
+        # 两个排名合成一个整数键（排名小于 n，不会溢出）
+        keys = rank * (n + 1)
+        keys[:n - k] += rank[k:] + 1
+        sa = np.argsort(keys, kind='stable')
+        sorted_keys = keys[sa]
+        changed = np.empty(n, dtype=np.int64)
+        changed[0] = 0
+        changed[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        rank = np.empty(n, dtype=np.int64)
+        rank[sa] = np.cumsum(changed)
+        if rank[sa[-1]] == n - 1:
+            break
+        k *= 2
+    return array('i', sa.astype(np.int32).tobytes())
+
+
+def _build_python(text):
+    n = len(text)
+    alphabet = {ch: i for i, ch in enumerate(sorted(set(text)))}
+    rank = [alphabet[ch] for ch in text]
+    sa = sorted(range(n), key=rank.__getitem__)
+    k = 1
+    while k < n:
+        width = n + 1
+        keys = [r * width + (rank[i + k] + 1 if i + k < n else 0) for i, r in enumerate(rank)]
+        sa = sorted(range(n), key=keys.__getitem__)
+        new_rank = [0] * n
+        current = 0
+        for j in range(1, n):
+            if keys[sa[j]] != keys[sa[j - 1]]:
+                current += 1
+            new_rank[sa[j]] = current
+        rank = new_rank
+        if current == n - 1:
+            break
+        k *= 2
+    return array('i', sa)
+
+
+# 构建后缀数组：有 numpy 时用 numpy，否则用纯 Python
+def build_suffix_array(text):
+    if not text:
+        return array('i')
+    try:
+        import numpy
+    except ImportError:
+        return _build_python(text)
+    return _build_numpy(text, numpy)
+
+
+class SuffixArray:
+    """text 的后缀数组；支持 `pattern in sa`，可以代替 `pattern in text`"""
+
+    def __init__(self, text, sa, corpus=None):
+        self.text = text
+        self.sa = sa
+        self.corpus = corpus
+        self._table = None      # 稀疏表：_table[j][b] 为第 b 块起连续 2^j 块中的最小值
+        self._locate = lru_cache(maxsize=LOCATE_CACHE_SIZE)(self._locate_sorted)
+
+    def __len__(self):
+        return len(self.sa)
+
+    def range(self, pattern):
+        """以 pattern 开头的后缀在数组中的区间 [lo, hi)"""
+        text = self.text
+        m = len(pattern)
+        key = lambda i: text[i:i + m]
+        lo = bisect_left(self.sa, pattern, key=key)
+        hi = bisect_right(self.sa, pattern, lo=lo, key=key)
+        return lo, hi
+
+    def count(self, pattern):
+        if not pattern:
+            return len(self.text) + 1
+        lo, hi = self.range(pattern)
+        return hi - lo
+
+    def __contains__(self, pattern):
+        return self.count(pattern) > 0
+
+    def _locate_sorted(self, pattern):
+        lo, hi = self.range(pattern)
+        return tuple(sorted(self.sa[lo:hi]))
+
+    def locate(self, pattern):
+        """所有出现位置（全文中的字符偏移），从小到大"""
+        if not pattern:
+            return list(range(len(self.text) + 1))
+        return list(self._locate(pattern))
+
+    def _build_table(self):
+        sa = self.sa
+        level = [min(sa[i:i + RMQ_BLOCK]) for i in range(0, len(sa), RMQ_BLOCK)]
+        table = [level]
+        width = 1
+        while 2 * width <= len(level):
+            prev = table[-1]
+            table.append([min(prev[b], prev[b + width]) for b in range(len(prev) - width)])
+            width *= 2
+        self._table = table
+
+    def range_min(self, lo, hi):
+        """sa[lo:hi] 中的最小值（hi > lo）"""
+        sa = self.sa
+        first_block = -(-lo // RMQ_BLOCK)
+        last_block = hi // RMQ_BLOCK
+        if first_block >= last_block:
+            return min(sa[lo:hi])
+        if self._table is None:
+            self._build_table()
+        j = (last_block - first_block).bit_length() - 1
+        level = self._table[j]
+        best = min(level[first_block], level[last_block - (1 << j)])
+        if lo < first_block * RMQ_BLOCK:
+            best = min(best, min(sa[lo:first_block * RMQ_BLOCK]))
+        if hi > last_block * RMQ_BLOCK:
+            best = min(best, min(sa[last_block * RMQ_BLOCK:hi]))
+        return best
+
+    def first(self, pattern):
+        """第一次出现的位置，没有为 -1（与 str.find 相同）"""
+        if not pattern:
+            return 0
+        lo, hi = self.range(pattern)
+        return self.range_min(lo, hi) if hi > lo else -1
+
+    def hits(self, pattern):
+        """pattern 规整后的所有出现位置映射到 [(文件名, 章节标题, 文件内偏移), ...]；需要 corpus"""
+        result = []
+        folded = self.corpus.folded
+        for pos in self.locate(canonical(pattern)):
+            pos = folded.to_original(pos)
+            md_file, section = self.corpus.locate(pos)
+            result.append((md_file.name, section.title if section else None, pos - md_file.char_start))
+        return result
+
+
+def _signature(corpus):
+    h = hashlib.sha1(f'{SA_VERSION}:{default_synonyms().signature}'.encode('utf-8'))
+    for name, md_file in corpus.items():
+        h.update(f'\0{name}:{md_file.blob}'.encode('utf-8'))
+    return h.digest()
+
+
+def _cache_path(directory):
+    return os.path.join(directory, CACHE_DIR, 'suffix.sa')
+
+
+def load_suffix_array(corpus, directory='.', use_cache=True):
+    """规整后语料的后缀数组：缓存中的摘要与当前语料一致时直接读取，否则重新构建并保存"""
+    path = _cache_path(directory)
+    signature = _signature(corpus)
+    text = corpus.folded.text
+    if use_cache:
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(len(MAGIC) + len(signature))
+                if header == MAGIC + signature:
+                    sa = array('i')
+                    sa.frombytes(f.read())
+                    if len(sa) == len(text):
+                        return SuffixArray(text, sa, corpus)
+        except OSError:
+            pass
+
+    sa = build_suffix_array(text)
+    if use_cache:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(MAGIC + signature)
+                sa.tofile(f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+    return SuffixArray(text, sa, corpus)
+
+
+# 与 matcher.match_corpus 相同的返回形式：每个问题一项 {关键串: 原文中的首次出现位置}
+def match_questions(questions, suffix_array, key_func):
+    results = []
+    first_positions = {}
+    for question in questions:
+        found = {}
+        for key in key_func(question):
+            if key not in first_positions:
+                first_positions[key] = suffix_array.first(key)
+            if first_positions[key] != -1:
+                found[key] = first_positions[key]
+        results.append(found)
+    return suffix_array.corpus.folded.restore(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='在语料的后缀数组中查找子串')
+    parser.add_argument('patterns', nargs='+', help='要查找的字符串')
+    parser.add_argument('--directory', default='.', help='语料目录')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    corpus = load_corpus(args.directory)
+    suffix_array = load_suffix_array(corpus, args.directory)
+    print(f"📚 {len(corpus)} 个文件, {len(suffix_array)} 个后缀, 加载耗时 {(time.perf_counter() - started) * 1000:.0f} ms")
+    for pattern in args.patterns:
+        started = time.perf_counter()
+        hits = suffix_array.hits(pattern)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"\n🔍 {pattern}: {len(hits)} 处（{elapsed:.3f} ms）")
+        for name, title, offset in hits[:10]:
+            print(f"   {name}:{offset}  {title or ''}")
+        if len(hits) > 10:
+            print(f"   ... 还有 {len(hits) - 10} 处")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+技术术语的同义词 / 别名规整
+
+qbank.json 中的 synonyms 配置为 {规范写法: [别名, ...]}，例如
+  "事件委托": ["事件代理", "event delegation"]，"热更新": ["hmr", "hot module replacement"]
+所有写法规整（textnorm.fold）后编译进一棵字符 trie。改写时从左到右扫描一遍：
+先用所有写法组成的正则（在 C 层扫描）跳到可能的起点，再沿 trie 取最长的写法，把别名
+替换成规范写法（即规范 ID），然后从它后面继续。规范写法本身也在 trie 中，因此
+"数组扁平化" 不会被其中的别名 "扁平化" 再改写一次。以字母或数字开头（结尾）的写法
+要求前（后）一个字符不是字母或数字，hmr 不会匹配 shmr 中的一段。
+
+问题和语料都经过同一步改写（canonical / Corpus.folded），匹配和索引都基于规范写法，
+"事件代理" 的问题可以命中只写了 "事件委托" 的答案，不需要多扫描一遍。
+
+用法: python3 synonyms.py 文本 ...    查看改写结果
+"""
+
+import argparse
+import hashlib
+import json
+import re
+
+from discovery import load_config
+from textnorm import fold
+
+_END = ''           # trie 节点中记录规范写法的键（不会与单个字符冲突）
+
+
+def _is_word(ch):
+    return ch.isascii() and ch.isalnum()
+
+
+class SynonymTrie:
+    """别名 -> 规范写法的字符 trie，按最左最长的方式改写文本"""
+
+    def __init__(self, synonyms):
+        self.root = {}
+        self.canonical = {}     # 规整后的写法 -> 规范写法
+        for name, aliases in synonyms.items():
+            target = fold(name)
+            for term in (name, *aliases):
+                self._insert(fold(term), target)
+        terms = sorted(self.canonical, key=len, reverse=True)
+        self._starts = re.compile('|'.join(map(re.escape, terms))) if terms else None
+        self.signature = hashlib.sha1(json.dumps(sorted(self.canonical.items()), ensure_ascii=False)
+                                      .encode('utf-8')).hexdigest()
+
+    def _insert(self, term, canonical):
+        if not term:
+            return
+        node = self.root
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[_END] = canonical
+        self.canonical[term] = canonical
+
+    def __len__(self):
+        return len(self.canonical)
+
+    def spans(self, text):
+        """产出 (起点, 终点, 规范写法)：text 中需要改写的别名，互不重叠，从左到右"""
+        if self._starts is None:
+            return
+        n = len(text)
+        search = self._starts.search
+        root = self.root
+        pos = 0
+        while True:
+            match = search(text, pos)
+            if match is None:
+                return
+            i = match.start()
+            bounded = not (i and _is_word(text[i]) and _is_word(text[i - 1]))
+            best = None
+            node = root
+            j = i
+            while bounded and j < n:
+                node = node.get(text[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node and not (j < n and _is_word(text[j - 1]) and _is_word(text[j])):
+                    best = j, node[_END]
+            if best is None:
+                pos = i + 1
+                continue
+            end, canonical = best
+            if text[i:end] != canonical:
+                yield i, end, canonical
+            pos = end
+
+    def rewrite(self, text):
+        """把 text（应已 fold）中的别名都换成规范写法"""
+        pieces = []
+        pos = 0
+        for start, end, canonical in self.spans(text):
+            pieces.append(text[pos:start])
+            pieces.append(canonical)
+            pos = end
+        if not pieces:
+            return text
+        pieces.append(text[pos:])
+        return ''.join(pieces)
+
+
+_DEFAULT = None
+
+
+# qbank.json 中配置的同义词表（第一次使用时编译）
+def default_synonyms():
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = SynonymTrie(load_config().get('synonyms', {}))
+    return _DEFAULT
+
+
+# 规整并改写为规范写法：问题和关键词在匹配前都经过这一步
+def canonical(text, synonyms=None):
+    return (synonyms if synonyms is not None else default_synonyms()).rewrite(fold(text))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='查看文本按同义词表改写后的结果')
+    parser.add_argument('texts', nargs='+', help='要改写的文本')
+    args = parser.parse_args()
+    synonyms = default_synonyms()
+    print(f"📖 {len(synonyms)} 个写法")
+    for text in args.texts:
+        print(f"  {text}  ->  {canonical(text, synonyms)}")
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from classification import iter_classification, iter_records, load_categories
+
+from conftest import ROOT
+
+DOC = os.path.join(ROOT, '分类整理文档.md')
+
+# 分类整理文档.md 中每个分类最深一层带编号标题的个数（每道题下面正好一条“考察要点”）
+# 附录里的“问题统计”是手写的（总计 155），与正文不一致，不以它为准
+EXPECTED_COUNTS = {
+    '数据结构和算法': 5,
+    'JS事件循环和异步': 6,
+    '开发语言基础': 29,
+    'Vue框架': 16,
+    'React框架': 16,
+    '前端框架架构': 2,
+    'Webpack构建工具': 9,
+    '性能优化': 8,
+    'HTTP和网络': 6,
+    'Node.js和工程化': 9,
+    'Web安全': 8,
+    '前端框架细节': 4,
+    '浏览器原理': 3,
+    'Debug能力': 7,
+    '前端监控': 13,
+    '跨端经验': 6,
+}
+
+
+def test_real_document_counts():
+    categories = load_categories(DOC)
+    assert {name: len(questions) for name, questions in categories.items()} == EXPECTED_COUNTS
+    with open(DOC, encoding='utf-8') as f:
+        assert sum(EXPECTED_COUNTS.values()) == sum('考察要点' in line for line in f)
+
+
+def test_real_document_groups_are_not_questions():
+    questions = [r.text for r in iter_classification(DOC) if r.kind == 'question']
+    assert '说一下闭包' in questions
+    assert '快速排序' in questions             # 没有子标题的 ### 本身就是问题
+    assert 'JavaScript进阶' not in questions    # ### 3.5 是分组
+    assert '问题统计' not in questions          # 附录不是分类
+
+
+def test_deepest_numbered_heading_is_question():
+    lines = [
+        '## 01. 分类一（说明）',
+        '### 1.1 单独的问题',
+        '### 1.2 分组',
+        '#### 1.2.1 问题甲',
+        '##### 1.2.1.1 更深的问题',
+        '#### 1.2.2 问题乙',
+        '- 正文',
+        '## 目录',
+        '### 1.3 不在分类中',
+        '## 02. 分类二',
+        '#### 2.1.1 问题丙',
+    ]
+    records = list(iter_records(lines))
+    assert [(r.kind, r.category, r.text, r.number) for r in records] == [
+        ('category', '分类一', '分类一（说明）', '01'),
+        ('question', '分类一', '单独的问题', '1.1'),
+        ('question', '分类一', '更深的问题', '1.2.1.1'),
+        ('question', '分类一', '问题乙', '1.2.2'),
+        ('category', '分类二', '分类二', '02'),
+        ('question', '分类二', '问题丙', '2.1.1'),
+    ]
+    assert [r.lineno for r in records] == [1, 2, 5, 6, 10, 11]
+
+
+def test_arrow_format():
+    lines = ['1→数据结构和算法', '2→快速排序', '3→', '4→开发语言（基础）', '5→闭包是什么？']
+    assert load_categories_from(lines) == {'数据结构和算法': ['快速排序'], '开发语言': ['闭包是什么？']}
+
+
+def load_categories_from(lines):
+    categories = {}
+    for record in iter_records(lines):
+        if record.kind == 'category':
+            categories.setdefault(record.category, [])
+        else:
+            categories[record.category].append(record.text)
+    return categories
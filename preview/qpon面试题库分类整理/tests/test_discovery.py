@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+
+from discovery import (CHAPTER_DIR, CONFIG_FILE, DEFAULT_CONFIG, chapter_rel, discover, find_repo_root,
+                       load_config)
+
+
+def write(path, text=''):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_code_project_directories_are_walked(tmp_path):
+    root = str(tmp_path)
+    write(os.path.join(root, 'README.md'))
+    write(os.path.join(root, 'webpack', 'package.json'), '{}')
+    write(os.path.join(root, 'webpack', 'docs', 'why.md'))
+    write(os.path.join(root, 'webpack', 'node_modules', 'dep', 'README.md'))
+    write(os.path.join(root, 'webpack', 'src', 'index.js'))
+    write(os.path.join(root, 'notes', '.gitignore'), 'draft*.md\n')
+    write(os.path.join(root, 'notes', 'draft-1.md'))
+    write(os.path.join(root, 'notes', 'final.md'))
+    assert discover(root, load_config()) == ['README.md', 'notes/final.md', 'webpack/docs/why.md']
+
+
+def test_exclude_names_only_apply_to_chapter_directory():
+    root = find_repo_root(CHAPTER_DIR)
+    chapter = chapter_rel(root)
+    files = set(discover(root, load_config(), include=[chapter + '/*.md', 'webpack/**', '**/README.md']))
+    assert chapter + '/README.md' not in files
+    assert chapter + '/图片问题完整清单.md' not in files
+    assert chapter + '/01-数据结构和算法.md' in files
+    assert 'webpack/pluginSystem/docs/webpack-comparison.md' in files
+    assert 'webpack/pluginSystem/docs/why-apply-method.md' in files
+    assert 'preview/qpon前端面试题库外部/README.md' in files
+    assert not any('/node_modules/' in path for path in files)
+
+
+def test_config_file_only_overrides_defaults():
+    with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+        overrides = json.load(f)
+    # qbank.json 不重复代码中的默认值，两份拷贝不会各自变化
+    assert not [key for key, value in overrides.items() if DEFAULT_CONFIG.get(key) == value]
+    assert load_config()['synonyms'] == overrides['synonyms']
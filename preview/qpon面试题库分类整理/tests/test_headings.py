@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+
+from headings import HeadingIndex
+
+
+def titles(text):
+    return [s.title for s in HeadingIndex.build(text)]
+
+
+def test_closing_hashes_need_leading_space():
+    text = '## C#\n\n## F# 和 C# 的区别 ##\n\n## 标题#\n'
+    assert titles(text) == ['C#', 'F# 和 C# 的区别', '标题#']
+
+
+def test_tilde_and_backtick_fences():
+    text = ('# 一\n\n~~~bash\n# 注释\n```\n# 仍在代码块中\n~~~\n\n'
+            '## 二\n\n````md\n```\n# 嵌套\n```\n````\n\n## 三\n')
+    assert titles(text) == ['一', '二', '三']
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from corpus import load_corpus
+from incremental import incremental_match_questions
+from matcher import match_corpus
+from synonyms import canonical
+
+
+def write(tmp_path, name, text):
+    with open(os.path.join(tmp_path, name), 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def keys(question):
+    return [canonical(question)]
+
+
+def test_same_shape_as_match_corpus(tmp_path):
+    write(tmp_path, 'a.md', '# 闭包\n\nﬁrst 闭包的作用\n')
+    write(tmp_path, 'b.md', '# VUE\n\nvue 的响应式原理\n')
+    questions = ['闭包的作用', 'Vue', '响应式原理', '没有的问题']
+
+    corpus = load_corpus(str(tmp_path), use_cache=False)
+    results, engine = incremental_match_questions(questions, corpus, keys, 'test', str(tmp_path))
+    assert results == match_corpus(questions, corpus, keys)
+
+    # 只有 b.md 变化：未变化的文件不重新扫描，结果仍与全量一致
+    write(tmp_path, 'b.md', '# 说明\n\n响应式原理\n')
+    corpus = load_corpus(str(tmp_path), use_cache=False)
+    results, engine = incremental_match_questions(questions, corpus, keys, 'test', str(tmp_path), engine)
+    assert engine.changed_files == ['b.md'] and engine.new_keys == []
+    # 只规整了需要扫描的文件，没有经过整个语料的 folded
+    assert corpus._folded is None
+    assert results == match_corpus(questions, corpus, keys)
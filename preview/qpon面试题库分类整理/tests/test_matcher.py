@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+import random
+
+from matcher import AhoCorasick, match_questions
+
+
+def all_occurrences(text, patterns):
+    found = set()
+    for pid, pattern in enumerate(patterns):
+        start = text.find(pattern)
+        while start != -1:
+            found.add((start, pid))
+            start = text.find(pattern, start + 1)
+    return found
+
+
+def test_iter_matches_str_find():
+    rng = random.Random(7)
+    alphabet = 'ab中文c'
+    for _ in range(200):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        patterns = list(dict.fromkeys(''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+                                      for _ in range(rng.randint(1, 8))))
+        automaton = AhoCorasick(patterns)
+        hits = list(automaton.iter(text))
+        assert len(hits) == len(set(hits))
+        assert set(hits) == all_occurrences(text, patterns)
+        first = automaton.first_positions(text)
+        assert first == {pid: text.find(p) for pid, p in enumerate(patterns) if p in text}
+
+
+def test_overlapping_and_nested_patterns():
+    automaton = AhoCorasick(['he', 'she', 'his', 'hers'])
+    assert sorted(automaton.iter('ushers')) == [(1, 1), (2, 0), (2, 3)]
+
+
+def test_duplicate_and_empty_patterns():
+    automaton = AhoCorasick()
+    assert automaton.add('vue') == automaton.add('vue') == 0
+    empty = automaton.add('')
+    assert automaton.first_positions('react') == {empty: 0}
+
+
+def test_match_questions():
+    text = '闭包是什么? 事件循环'
+    results = match_questions(['闭包', '事件循环', '原型链'], text, lambda q: [q, q[:1]])
+    assert results == [{'闭包': 0, '闭': 0}, {'事件循环': 7, '事': 7}, {}]
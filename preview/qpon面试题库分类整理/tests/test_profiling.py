@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+import time
+import tracemalloc
+
+from parallel import run_forked
+from profiling import Profiler, PROFILER
+
+
+def test_nested_phases_record_self_time():
+    profiler = Profiler()
+    profiler.enable('test')
+    try:
+        with profiler.phase('match'):
+            time.sleep(0.01)
+            with profiler.phase('normalize'):
+                time.sleep(0.02)
+    finally:
+        tracemalloc.stop()
+    match, normalize = profiler.phases['match'], profiler.phases['normalize']
+    assert normalize['wall_ms'] >= 20
+    assert 10 <= match['wall_ms'] < 20
+    assert match['total_wall_ms'] >= match['wall_ms'] + normalize['wall_ms']
+
+
+def _count_items(shared, task):
+    for _ in range(task):
+        PROFILER.count('hits', shared)
+    return task
+
+
+def test_worker_counts_are_merged(monkeypatch):
+    monkeypatch.setattr(PROFILER, 'enabled', True)
+    monkeypatch.setattr(PROFILER, 'counters', {'hits': {'a': 1}})
+    assert run_forked(_count_items, [2, 3], 'a', jobs=2) == [2, 3]
+    assert PROFILER.counters == {'hits': {'a': 6}}
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+
+def test_parsers_do_not_import_subcommand_modules():
+    code = ('import sys, qbank; parsers = qbank.build_parsers(); '
+            "print(sorted(m for m in ('edit_distance', 'ngram_index', 'synonyms', 'corpus') if m in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == '[]'
+
+
+def test_coverage_accepts_one_matching_mode():
+    import qbank
+
+    parser, _ = qbank.build_parsers()['coverage']
+    args = parser.parse_args(['--incremental'])
+    assert args.incremental and not args.suffix_array and args.jobs == 1
+    assert parser.parse_args(['--suffix-array']).suffix_array
+    with pytest.raises(SystemExit):
+        parser.parse_args(['--incremental', '-j', '2'])
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from corpus import load_corpus
+from server import SearchIndex
+
+
+def build_index(tmp_path, files):
+    for name, text in files.items():
+        with open(os.path.join(tmp_path, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+    index = SearchIndex()
+    index.sync(str(tmp_path), load_corpus(str(tmp_path), use_cache=False))
+    index.finalize()
+    return index
+
+
+def test_single_character_query(tmp_path):
+    index = build_index(tmp_path, {'a.md': '# 作用域\n\n块级作用域和函数作用域\n\n# 闭包\n\n函数和变量\n'})
+    titles = [index.units[uid].title for _, uid in index.search('域')]
+    assert titles == ['作用域']
+    assert {index.units[uid].title for _, uid in index.search('函')} == {'作用域', '闭包'}
+    assert index.search('x') == []
+
+
+def test_text_before_first_heading_is_a_unit(tmp_path):
+    index = build_index(tmp_path, {'a.md': '开头的说明文字\n\n# 标题\n\n正文\n', 'b.md': '没有标题的文件\n'})
+    hits = [index.units[uid] for _, uid in index.search('说明')]
+    assert [(u.name, u.title, u.lineno, u.char_start) for u in hits] == [('a.md', 'a.md', 1, 0)]
+    assert index.units[index.search('没有标题')[0][1]].name == 'b.md'
+
+
+def test_remove_file_drops_all_postings(tmp_path):
+    index = build_index(tmp_path, {'a.md': '前言\n# 标题\n正文a\n'})
+    index.remove_file(str(tmp_path), 'a.md')
+    assert index.postings == {} and index.units == {}
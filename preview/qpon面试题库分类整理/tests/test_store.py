@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import store
+
+
+def test_open_store_reuses_index_from_any_directory(tmp_path, monkeypatch):
+    path = str(tmp_path / 'qbank.sqlite')
+    conn, built = store.open_store(path)
+    conn.close()
+    assert built
+
+    # 输入没有变化：只比较 大小+mtime，不重新索引，也不依赖当前目录
+    monkeypatch.chdir(tmp_path)
+    conn, built = store.open_store(path)
+    assert not built
+    assert conn.execute("SELECT COUNT(*) FROM questions WHERE source = 'checklist'").fetchone()[0] == 138
+    conn.close()
+    assert os.listdir(tmp_path) == ['qbank.sqlite']
+
+
+def test_open_store_rebuilds_when_logic_changes(tmp_path, monkeypatch):
+    path = str(tmp_path / 'qbank.sqlite')
+    store.open_store(path)[0].close()
+    monkeypatch.setattr(store, 'STORE_VERSION', store.STORE_VERSION + 1)
+    conn, built = store.open_store(path)
+    conn.close()
+    assert built
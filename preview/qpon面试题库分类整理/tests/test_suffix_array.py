@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+import random
+
+from suffix_array import RMQ_BLOCK, SuffixArray, build_suffix_array
+
+
+def occurrences(text, pattern):
+    return [i for i in range(len(text)) if text.startswith(pattern, i)]
+
+
+def test_queries_match_str_find():
+    rng = random.Random(3)
+    for _ in range(40):
+        text = ''.join(rng.choice('ab中') for _ in range(rng.randint(1, 6 * RMQ_BLOCK)))
+        sa = SuffixArray(text, build_suffix_array(text))
+        assert sorted(sa.sa) == list(range(len(text)))
+        for _ in range(20):
+            pattern = ''.join(rng.choice('ab中') for _ in range(rng.randint(1, 4)))
+            assert sa.first(pattern) == text.find(pattern)
+            assert sa.locate(pattern) == occurrences(text, pattern)
+            assert sa.count(pattern) == len(occurrences(text, pattern))
+            assert (pattern in sa) == (pattern in text)
+
+
+def test_range_min_across_blocks():
+    rng = random.Random(5)
+    text = ''.join(rng.choice('abcd') for _ in range(10 * RMQ_BLOCK + 7))
+    sa = SuffixArray(text, build_suffix_array(text))
+    for _ in range(500):
+        lo = rng.randrange(len(text))
+        hi = rng.randint(lo + 1, len(text))
+        assert sa.range_min(lo, hi) == min(sa.sa[lo:hi])
+
+
+def test_locate_returns_fresh_list():
+    sa = SuffixArray('abab', build_suffix_array('abab'))
+    sa.locate('ab').append(99)
+    assert sa.locate('ab') == [0, 2]
+    assert sa.first('') == 0 and sa.first('x') == -1
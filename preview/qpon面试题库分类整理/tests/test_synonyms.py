@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+from synonyms import SynonymTrie, canonical
+
+SYNONYMS = SynonymTrie({
+    '热更新': ['HMR', 'hot module replacement'],
+    '数组扁平化': ['扁平化', 'flat'],
+    'React Native': ['rn'],
+})
+
+
+def spans(text):
+    return list(SYNONYMS.spans(text))
+
+
+def test_ascii_aliases_need_word_boundaries():
+    assert spans('shmr hmrs hmr2 2hmr') == []
+    assert spans('hmr') == [(0, 3, '热更新')]
+    assert spans('用hmr做热替换') == [(1, 4, '热更新')]
+    assert spans('(hmr)') == [(1, 4, '热更新')]
+    assert spans('flatten flat') == [(8, 12, '数组扁平化')]
+    assert spans('rn,turn') == [(0, 2, 'react native')]
+
+
+def test_longest_alias_wins():
+    assert spans('hot module replacement') == [(0, 22, '热更新')]
+    assert spans('hot module') == []
+
+
+def test_canonical_term_is_not_rewritten_again():
+    assert spans('数组扁平化') == []
+    assert SYNONYMS.rewrite('扁平化和数组扁平化') == '数组扁平化和数组扁平化'
+
+
+def test_canonical_folds_first():
+    assert canonical('Webpack 的 HMR？', SYNONYMS) == 'webpack 的 热更新?'
+    assert canonical('React Native和RN', SYNONYMS) == 'react native和react native'
+    assert len(SYNONYMS) == 8
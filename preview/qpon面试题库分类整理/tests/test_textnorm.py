@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import random
+
+from synonyms import SynonymTrie
+from textnorm import FoldedText, fold
+
+SYNONYMS = SynonymTrie({'事件委托': ['事件代理', 'event delegation'], '热更新': ['hmr']})
+
+
+def test_fold():
+    assert fold('ＶＵＥ？（Ａ１）') == 'vue?(a1)'
+    assert fold('《你不知道的JS》、“闭包”。') == '<你不知道的js>,"闭包".'
+    assert fold('等等…ß') == '等等...ss'
+    assert fold('第一行\n第二行') == '第一行\n第二行'
+
+
+def test_identity_when_length_unchanged():
+    folded = FoldedText('Vue？React（Hooks）')
+    assert folded.identity
+    assert folded.text == 'vue?react(hooks)'
+    assert folded.to_original(5) == folded.to_folded(5) == 5
+
+
+def test_expanding_characters_round_trip():
+    original = 'a…b①ßc'
+    folded = FoldedText(original)
+    assert folded.text == 'a...b1ssc'
+    for i, ch in enumerate(original):
+        j = folded.to_folded(i)
+        assert folded.text.startswith(fold(ch), j)
+        assert folded.to_original(j) == i
+    # 展开后的每个字符都映射回原文中的那个字符
+    assert [folded.to_original(j) for j in range(len(folded.text))] == [0, 1, 1, 1, 2, 3, 4, 4, 5]
+    assert folded.to_folded(len(original)) == len(folded.text)
+
+
+def test_alias_rewrite_positions():
+    original = '用Event Delegation…以及事件代理和HMR'
+    folded = FoldedText(original, SYNONYMS)
+    assert folded.text == '用事件委托...以及事件委托和热更新'
+    first = folded.text.index('事件委托')
+    second = folded.text.index('事件委托', first + 1)
+    assert folded.to_original(first) == original.index('Event')
+    assert folded.to_original(second) == original.index('事件代理')
+    assert folded.to_original(folded.text.index('热更新')) == original.index('HMR')
+    assert folded.to_original(folded.text.index('以及')) == original.index('以及')
+    assert folded.to_folded(original.index('和')) == folded.text.index('和')
+    assert folded.restore([{'事件委托': second}]) == [{'事件委托': original.index('事件代理')}]
+
+
+def test_random_round_trip():
+    rng = random.Random(11)
+    pieces = ['a', 'b', ' ', '…', '①', 'ß', '？', '中', 'hmr', 'HMR', '事件代理', 'event delegation', '热更新']
+    for _ in range(300):
+        original = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+        folded = FoldedText(original, SYNONYMS)
+        assert folded.text == SYNONYMS.rewrite(fold(original))
+        positions = [folded.to_original(j) for j in range(len(folded.text))]
+        assert positions == sorted(positions)
+        assert all(0 <= pos < len(original) for pos in positions)
+        for i in range(len(original) + 1):
+            j = folded.to_folded(i)
+            assert 0 <= j <= len(folded.text)
+            if j < len(folded.text):
+                assert folded.to_original(j) <= i
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+
+from check_coverage import CHECKLIST_FILE, check_checklist, read_checklist
+from corpus import load_corpus
+from tokenizer import Tokenizer, load_tokenizer
+
+from conftest import ROOT
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    return load_corpus(ROOT)
+
+
+@pytest.fixture(scope='module')
+def tokenizer(corpus):
+    return load_tokenizer(corpus, ROOT)
+
+
+# 改用分词之前（整个标题的 \w+ 串作关键词）未覆盖的 23 道题；其余 115 道必须仍然算覆盖
+BASELINE_NOT_COVERED = {11, 16, 17, 18, 19, 33, 36, 53, 64, 80, 82, 92, 94, 102, 106, 112, 113, 114,
+                        133, 134, 135, 153, 156}
+
+
+@pytest.fixture(scope='module')
+def checklist():
+    return read_checklist(os.path.join(ROOT, CHECKLIST_FILE))
+
+
+@pytest.fixture(scope='module')
+def coverage(checklist, corpus, tokenizer):
+    covered, not_covered = check_checklist(checklist, corpus, tokenizer)
+    return {num: files for num, _, files in covered}, {num for num, _ in not_covered}
+
+
+def test_bidirectional_max_matching():
+    tokenizer = Tokenizer(['响应式', '响应式数据', '数据', '原理', '生命周期', '周期'])
+    assert tokenizer.tokenize('Vue2.x响应式数据的原理') == ['vue2.x', '响应式数据', '的', '原理']
+    assert tokenizer.tokenize('React的生命周期') == ['react', '的', '生命周期']
+
+
+def test_merge_unknown_characters():
+    tokenizer = Tokenizer([])
+    # 词典外的连续单字合成一个词，两端的虚字不参与合并，连接词处断开
+    assert tokenizer.tokenize('JS里块级') == ['js', '里', '块级']
+    assert tokenizer.tokenize('块级的作用') == ['块级', '的', '作用']
+    # 夹在两个单字中间的虚字不断开
+    assert tokenizer.tokenize('两个对象') == ['两个对象']
+    assert tokenizer.tokenize('写一个') == ['写', '一', '个']
+
+
+def test_operators_are_tokens():
+    tokenizer = Tokenizer([])
+    assert tokenizer.keywords('=== 和 ==的区别') == ['===', '==']
+    assert tokenizer.tokenize('a?.b ?? c') == ['a', '?.', 'b', '??', 'c']
+
+
+def test_keywords(tokenizer):
+    assert tokenizer.keywords('JS里块级作用域') == ['js', '块级作用域']
+    assert tokenizer.keywords('如何设计登录过？') == ['设计', '登录']
+    assert tokenizer.keywords('写一个例子') == ['例子']
+    assert tokenizer.keywords('两个对象如何比较') == ['对象', '比较']
+    assert tokenizer.keywords('304状态码的意思，怎么配置？') == ['304', '状态码', '意思', '配置']
+    assert tokenizer.keywords('dev-server是怎么启动来') == ['dev-server', '启动']
+
+
+def test_baseline_titles_stay_covered(checklist, coverage):
+    covered, not_covered = coverage
+    assert len(covered) + len(not_covered) == len(checklist) == 138
+    assert set(checklist) - BASELINE_NOT_COVERED <= covered.keys()
+
+
+def test_checklist_titles(coverage):
+    covered, not_covered = coverage
+    assert {28, 30, 131, 140, 143} <= covered.keys()   # === 和 == / 两个对象 / dev-server / option / 304
+    assert '09-HTTP和网络.md' in covered[143]
+    assert {17, 134} <= not_covered                    # 只有 OCR 错字，分不出可用的词
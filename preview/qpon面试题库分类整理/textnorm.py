@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+文本规整：NFKC + casefold + 中文标点折叠，供各检查脚本共用
+
+问题和语料在加载时各规整一次，之后的匹配直接比较规整后的文本，不再在每次比较时
+做 replace('？', '?')、lower() 之类的处理：
+  - NFKC：全角字母数字和标点（？（），：Ａ１）变成半角，兼容字符（① ㎏ …）展开
+  - casefold：大小写不敏感（Vue / vue / VUE 视为相同）
+  - NFKC 之后仍保留的中文标点（、。“”《》【】等）折叠成对应的 ASCII 标点
+规整逐字符进行（每个字符只计算一次，之后查表），换行符不变。绝大多数字符规整后
+仍是一个字符，此时规整前后位置相同；少数字符会展开成多个字符（… -> ...，ß -> ss），
+FoldedText 只在这些位置记录断点，把规整后文本中的位置映射回原文，命中位置、
+文件内偏移和摘录仍然按原文计算。传入同义词表（synonyms.SynonymTrie）时，规整后
+再把别名改写成规范写法，改写的位置同样记入映射。
+"""
+
+import re
+import unicodedata
+from bisect import bisect_right
+
+# NFKC 之后仍保留的中文标点 -> ASCII 标点
+PUNCTUATION = {
+    '、': ',', '。': '.', '“': '"', '”': '"', '‘': "'", '’': "'",
+    '「': '"', '」': '"', '『': '"', '』': '"', '【': '[', '】': ']',
+    '《': '<', '》': '>', '〈': '<', '〉': '>', '〔': '(', '〕': ')',
+    '—': '-', '–': '-', '―': '-', '〜': '~',
+}
+
+# 字符编码 -> 规整结果，按需补充
+_TABLE = {}
+
+
+def _fold_char(ch):
+    folded = unicodedata.normalize('NFKC', ch).casefold()
+    return ''.join(PUNCTUATION.get(c, c) for c in folded)
+
+
+def _table_for(text):
+    for ch in set(text):
+        if ord(ch) not in _TABLE:
+            _TABLE[ord(ch)] = _fold_char(ch)
+    return _TABLE
+
+
+# 规整文本（不需要位置映射时使用）
+def fold(text):
+    return text.translate(_table_for(text))
+
+
+class FoldedText:
+    """
+    original 规整后（可选再按同义词表改写）的文本 text，以及两者之间的位置映射。
+    没有长度变化时映射为恒等（identity 为 True）；否则按断点分段，
+    被替换的一段（展开的字符、改写的别名）对应的位置都映射回这段在原文中的起点。
+    """
+
+    __slots__ = ('original', 'text', '_fold_starts', '_orig_starts', '_shifted')
+
+    def __init__(self, original, synonyms=None):
+        table = _table_for(original)
+        self.original = original
+        self.text = original.translate(table)
+        # 被替换的段：[(原文起点, 原文终点, 替换后长度), ...]
+        replacements = []
+        if len(self.text) != len(original):
+            expanding = ''.join(chr(code) for code, value in table.items() if len(value) != 1)
+            replacements = [(m.start(), m.end(), len(table[ord(m.group())]))
+                            for m in re.finditer(f'[{re.escape(expanding)}]', original)]
+        self._build(replacements)
+        if synonyms is not None:
+            spans = list(synonyms.spans(self.text))
+            if spans:
+                self._rewrite(spans, replacements)
+
+    def _build(self, replacements):
+        self._fold_starts = None
+        if not replacements:
+            return
+        fold_starts = [0]
+        orig_starts = [0]
+        shifted = [True]
+        shift = 0
+        for start, end, width in replacements:
+            # 替换后的 width 个字符都对应原文位置 start，之后的文本整体平移
+            fold_starts.append(start + shift)
+            orig_starts.append(start)
+            shifted.append(False)
+            shift += width - (end - start)
+            fold_starts.append(end + shift)
+            orig_starts.append(end)
+            shifted.append(True)
+        self._fold_starts = fold_starts
+        self._orig_starts = orig_starts
+        self._shifted = shifted
+
+    def _rewrite(self, spans, replacements):
+        """把规整后文本中的别名 spans（[(起点, 终点, 规范写法)]）换掉，并与字符展开合并成一份映射"""
+        text = self.text
+        pieces = []
+        pos = 0
+        for start, end, canonical in spans:
+            pieces.append(text[pos:start])
+            pieces.append(canonical)
+            pos = end
+        pieces.append(text[pos:])
+
+        # 规整后文本上的区间 [起点, 终点, 长度变化, 原文起点, 原文终点]，重叠的合并成一段
+        intervals = sorted([[self.to_folded(s), self.to_folded(s) + w, 0, s, e] for s, e, w in replacements] +
+                           [[start, end, len(canonical) - (end - start),
+                             self.to_original(start), self.to_original(end - 1) + 1]
+                            for start, end, canonical in spans])
+        merged = []
+        for interval in intervals:
+            last = merged[-1] if merged else None
+            if last and interval[0] < last[1]:
+                last[1] = max(last[1], interval[1])
+                last[2] += interval[2]
+                last[3] = min(last[3], interval[3])
+                last[4] = max(last[4], interval[4])
+            else:
+                merged.append(interval)
+        combined = [(o_start, o_end, end - start + delta) for start, end, delta, o_start, o_end in merged]
+
+        self.text = ''.join(pieces)
+        self._build(combined)
+
+    @property
+    def identity(self):
+        return self._fold_starts is None
+
+    def to_original(self, pos):
+        """规整后文本中的位置 -> 原文中的位置"""
+        if self._fold_starts is None:
+            return pos
+        i = bisect_right(self._fold_starts, pos) - 1
+        if self._shifted[i]:
+            return self._orig_starts[i] + pos - self._fold_starts[i]
+        return self._orig_starts[i]
+
+    def to_folded(self, pos):
+        """原文中的位置 -> 规整后文本中的位置"""
+        if self._fold_starts is None:
+            return pos
+        i = bisect_right(self._orig_starts, pos) - 1
+        if self._shifted[i]:
+            return self._fold_starts[i] + pos - self._orig_starts[i]
+        return self._fold_starts[i]
+
+    def restore(self, results):
+        """把 match_questions 的结果（{关键串: 规整后的位置}）中的位置换回原文位置"""
+        if self._fold_starts is None:
+            return results
+        to_original = self.to_original
+        return [{key: to_original(pos) for key, pos in found.items()} for found in results]
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+问题 → 章节的 TF-IDF 相似度批量分配
+
+把所有问题（分类整理文档 + 图片问题清单）和章节文件中按二级标题切分的各节，
+都表示成字符 2/3-gram 的 TF-IDF 稀疏向量（次线性 TF、平滑 IDF、L2 归一化），
+用稀疏矩阵乘法一次得到完整的 问题×章节 余弦相似度矩阵，再为每个问题取得分
+最高的若干节。得到的是相关度分数，而不只是“有/没有”。
+
+正文很长的节和短问题的余弦值普遍偏低，因此节标题单独作为一个字段：
+得分 = TITLE_WEIGHT × 与标题的相似度 + (1 - TITLE_WEIGHT) × 与整节的相似度。
+
+--tokens 时再加入分词（tokenizer.py）得到的词作为特征，与字符 gram 放在同一个向量里，
+"响应式数据" 这样的整词命中比只共享几个字符 gram 得分更高。
+
+依赖 numpy 和 scipy（只在这里用到，按需导入）：pip install numpy scipy
+
+用法: python3 tfidf.py [--source all|doc|checklist] [--top 3] [--min-score 0.2] [--tokens]
+"""
+
+import argparse
+import math
+import re
+from collections import Counter, namedtuple
+
+from check_coverage import read_checklist
+from classification import load_categories
+from corpus import load_corpus
+from headings import QUESTION_LEVEL
+from ngram_index import GRAM_SIZES, normalize
+from tokenizer import STOP_WORDS, load_tokenizer
+
+# 章节文件：以编号开头的MD文件（01-数据结构和算法.md 等）
+CHAPTER_RE = re.compile(r'^\d+-.+\.md$')
+
+DEFAULT_TOP = 3
+DEFAULT_MIN_SCORE = 0.2
+TITLE_WEIGHT = 0.5
+WORD_PREFIX = '\0'     # 词特征的前缀，避免与同样字符的 gram 混在一起
+
+Question = namedtuple('Question', ['source', 'category', 'text'])
+SectionRef = namedtuple('SectionRef', ['name', 'title', 'char_start'])
+Assignment = namedtuple('Assignment', ['question', 'matches'])   # matches: [(得分, SectionRef), ...]
+
+
+def _require_scipy():
+    try:
+        import numpy
+        from scipy import sparse
+    except ImportError as e:
+        raise ImportError('TF-IDF 模式需要 numpy 和 scipy：pip install numpy scipy') from e
+    return numpy, sparse
+
+
+# 文本的 gram 计数（给出分词器时再加上词的计数）
+def gram_counts(text, sizes=GRAM_SIZES, tokenizer=None):
+    s = normalize(text)
+    counts = Counter()
+    for n in sizes:
+        for i in range(len(s) - n + 1):
+            counts[s[i:i + n]] += 1
+    if not counts and s:
+        counts[s] = 1
+    if tokenizer is not None:
+        counts.update(WORD_PREFIX + word for word in tokenizer.tokenize(text)
+                      if len(word) > 1 and word not in STOP_WORDS)
+    return counts
+
+
+# 收集问题
+def collect_questions(source='all'):
+    questions = []
+    if source in ('all', 'doc'):
+        for category, items in load_categories().items():
+            questions.extend(Question('doc', category, q) for q in items)
+    if source in ('all', 'checklist'):
+        for num, title in sorted(read_checklist().items()):
+            questions.append(Question('checklist', str(num), title))
+    return questions
+
+
+# 收集章节文件中的各节（二级标题，包含其下的子标题和正文）
+def collect_sections(corpus):
+    sections = []
+    texts = []
+    for md_file in corpus.values():
+        if not CHAPTER_RE.match(md_file.name):
+            continue
+        text = md_file.text
+        for section in md_file.headings.sections(QUESTION_LEVEL):
+            sections.append(SectionRef(md_file.name, section.title, md_file.char_start + section.char_start))
+            texts.append(text[section.char_start:section.char_end])
+    return sections, texts
+
+
+class TfidfModel:
+    """在章节上统计 IDF，问题和章节用同一套词表和权重"""
+
+    def __init__(self, documents, titles=None, sizes=GRAM_SIZES, title_weight=TITLE_WEIGHT, tokenizer=None):
+        self.numpy, self.sparse = _require_scipy()
+        self.sizes = sizes
+        self.tokenizer = tokenizer
+        self.vocabulary = {}
+        counts = [gram_counts(doc, sizes, tokenizer) for doc in documents]
+        df = Counter()
+        for c in counts:
+            df.update(c.keys())
+        for gram in df:
+            self.vocabulary[gram] = len(self.vocabulary)
+        n = len(documents)
+        self.idf = self.numpy.zeros(len(self.vocabulary))
+        for gram, i in self.vocabulary.items():
+            self.idf[i] = math.log((1 + n) / (1 + df[gram])) + 1
+        self.document_matrix = self._matrix(counts)
+        self.title_weight = title_weight if titles is not None else 0
+        self.title_matrix = self.transform(titles) if titles is not None else None
+
+    def _matrix(self, counts):
+        """gram 计数列表 -> 行归一化的 CSR 矩阵；词表外的 gram 忽略"""
+        np = self.numpy
+        indptr = [0]
+        indices = []
+        data = []
+        for c in counts:
+            for gram, tf in c.items():
+                i = self.vocabulary.get(gram)
+                if i is not None:
+                    indices.append(i)
+                    data.append(1 + math.log(tf))
+            indptr.append(len(indices))
+        matrix = self.sparse.csr_matrix(
+            (np.array(data, dtype=np.float64), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+            shape=(len(counts), len(self.vocabulary)))
+        matrix = matrix.multiply(self.idf).tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return self.sparse.diags(1 / norms) @ matrix
+
+    def transform(self, texts):
+        return self._matrix([gram_counts(t, self.sizes, self.tokenizer) for t in texts])
+
+    def similarity(self, texts):
+        """texts × 文档 的相似度（稠密数组），有标题时按 title_weight 加权"""
+        matrix = self.transform(texts)
+        scores = (matrix @ self.document_matrix.T).toarray()
+        if self.title_matrix is not None:
+            scores *= 1 - self.title_weight
+            scores += self.title_weight * (matrix @ self.title_matrix.T).toarray()
+        return scores
+
+
+# 为每个问题分配得分最高的 top 个章节
+def assign(questions, corpus, top=DEFAULT_TOP, min_score=DEFAULT_MIN_SCORE, tokens=False):
+    sections, texts = collect_sections(corpus)
+    if not sections or not questions:
+        return []
+    tokenizer = load_tokenizer(corpus) if tokens else None
+    model = TfidfModel(texts, [s.title for s in sections], tokenizer=tokenizer)
+    np = model.numpy
+    scores = model.similarity([q.text for q in questions])
+
+    top = min(top, len(sections))
+    # argpartition 取前 top 个，再对这几个排序；得分相同时按章节顺序
+    best = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+    assignments = []
+    for row, question in enumerate(questions):
+        picked = sorted(best[row], key=lambda j: (-scores[row, j], j))
+        matches = [(float(scores[row, j]), sections[j]) for j in picked if scores[row, j] >= min_score]
+        assignments.append(Assignment(question, matches))
+    return assignments
+
+
+def main(source='all', top=DEFAULT_TOP, min_score=DEFAULT_MIN_SCORE, tokens=False):
+    print("=" * 100)
+    print(" " * 30 + "📐 问题 → 章节 TF-IDF 相似度分配")
+    print("=" * 100)
+
+    questions = collect_questions(source)
+    corpus = load_corpus()
+    try:
+        assignments = assign(questions, corpus, top, min_score, tokens)
+    except ImportError as e:
+        print(f"❌ {e}")
+        return None
+
+    current = None
+    for a in assignments:
+        group = (a.question.source, a.question.category if a.question.source == 'doc' else None)
+        if group != current:
+            current = group
+            print(f"\n【{a.question.category if a.question.source == 'doc' else '图片问题清单'}】")
+            print("-" * 100)
+        label = f"{a.question.category}." if a.question.source == 'checklist' else "-"
+        display = a.question.text if len(a.question.text) <= 60 else a.question.text[:60] + "..."
+        print(f"  {label} {display}")
+        if a.matches:
+            for score, section in a.matches:
+                print(f"      {score:.3f}  {section.name} / {section.title}")
+        else:
+            print(f"      ❌ 没有得分 >= {min_score} 的章节")
+
+    unmatched = [a for a in assignments if not a.matches]
+    print()
+    print("=" * 100)
+    print("📈 总结:")
+    print("=" * 100)
+    print(f"  问题数: {len(assignments)}")
+    print(f"  有候选章节: {len(assignments) - len(unmatched)}")
+    print(f"  无候选章节: {len(unmatched)}")
+    print("=" * 100)
+    return assignments
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='用 TF-IDF 相似度为问题分配章节')
+    parser.add_argument('--source', choices=['all', 'doc', 'checklist'], default='all', help='问题来源')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help='每个问题列出的章节数')
+    parser.add_argument('--min-score', type=float, default=DEFAULT_MIN_SCORE, help='最低相似度')
+    parser.add_argument('--tokens', action='store_true', help='分词得到的词也作为特征')
+    args = parser.parse_args()
+    main(args.source, args.top, args.min_score, args.tokens)
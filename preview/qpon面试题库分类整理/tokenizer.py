@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+轻量的中英文混合分词（只用标准库）
+
+词典从题库自己的标题中统计：所有标题规整（synonyms.canonical）后，取汉字串中
+2~6 字的片段，出现在至少 MIN_COUNT 个不同标题中的作为候选词；首尾是
+"的、是、和" 这类虚字、含有连接词或疑问词的片段不要，总是作为某个更长候选词的一部分出现的片段
+（如只出现在 "生命周期" 中的 "命周"）也不要。标题里只出现一次的基础术语（"对象"、"状态码"）
+统计不出来，由内置的 BUILTIN_WORDS 补上；同义词表中的中文写法也总是收入词典。
+词典按标题内容的摘要缓存在 .qbank_cache/ 下，标题不变时直接读取。
+
+分词时先规整文本，英文、数字按连续的串切分（vue2.x、v-model、node.js 各是一个词），
+比较、逻辑运算符（===、!=、&&）各是一个词，汉字串用双向最大匹配：正向、逆向各切一遍，
+取词数少的，词数相同时取单字少的，仍相同时取逆向的结果。词典里没有的字先单独成词，
+连续几个单字再合成一个词（词典外的术语，如 "块级"）：连接词处断开，虚字只在两端时去掉，
+夹在两个单字中间的虚字（"两个对象" 中的 "个"、"对"）不断开。
+
+用法: python3 tokenizer.py [文本 ...]    不带参数时统计整个题库的分词耗时
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import re
+import time
+from collections import Counter
+
+from corpus import CACHE_DIR, load_corpus
+from synonyms import canonical, default_synonyms
+
+DICTIONARY_VERSION = 2
+MIN_WORD = 2
+MAX_WORD = 6
+MIN_COUNT = 2
+
+# 词典中的词不以这些字开头或结尾
+EDGE_CHARS = frozenset('的了是和与及或在对中吗呢么个一有这那也都就把被让从到给等何哪怎什里像')
+# 连接词：含有它们的片段是短语而不是词（"数据结构和算法"）
+JOINER_CHARS = frozenset('的和与及或在是')
+
+# 内置的前端、计算机基础术语：在标题中出现不到 MIN_COUNT 次也要整体切出
+BUILTIN_WORDS = frozenset([
+    '对象', '数组', '函数', '字符串', '变量', '类型', '原型', '原型链', '闭包', '作用域', '块级作用域',
+    '继承', '事件循环', '事件冒泡', '事件捕获', '回调', '异步', '同步', '递归', '排序', '算法',
+    '比较', '相等', '深拷贝', '浅拷贝', '垃圾回收', '内存泄漏', '模块', '组件', '渲染', '重绘',
+    '回流', '浏览器', '服务器', '接口', '请求', '状态码', '缓存', '强缓存', '协商缓存', '配置',
+    '启动', '打包', '编译', '构建', '部署', '登录', '权限', '加密', '跨端', '兼容', '上传',
+])
+
+# 疑问词：含有它们的片段不收入词典（"数据如何上报"）
+QUESTION_WORDS = frozenset(['什么', '是什么', '如何', '怎么', '怎样', '为什么', '哪些', '有哪些', '有什么', '多少'])
+
+# 提取关键词时去掉的词：疑问词、虚词和题目里常见的泛用词
+STOP_WORDS = QUESTION_WORDS | frozenset([
+    '的', '了', '和', '与', '及', '或', '是', '吗', '呢', '在', '对', '中', '有', '做', '用', '过',
+    '做过', '用过', '遇到过',
+    '一个', '这种', '那些', '一些', '以及', '还是', '可以', '能否',
+    '区别', '原理', '实现', '了解', '介绍', '使用', '理解', '问题', '方法', '方式', '作用', '能力', '常见',
+    'the', 'and', 'of', 'to', 'in', 'is', 'vs',
+])
+
+CJK_RE = re.compile(r'[㐀-鿿]+')
+TOKEN_RE = re.compile(r'([a-z0-9]+(?:[.\-_][a-z0-9]+)*[+#]*)|([=!]==?|[<>]=|=>|&&|\|\||\?\?|\?\.)|([㐀-鿿]+)')
+
+
+# 从标题统计词典
+def build_dictionary(titles, extra=()):
+    counts = Counter()
+    for title in set(canonical(t) for t in titles):
+        grams = set()
+        for run in CJK_RE.findall(title):
+            for n in range(MIN_WORD, min(MAX_WORD, len(run)) + 1):
+                for i in range(len(run) - n + 1):
+                    grams.add(run[i:i + n])
+        counts.update(grams)
+
+    candidates = {g: k for g, k in counts.items()
+                  if k >= MIN_COUNT and g[0] not in EDGE_CHARS and g[-1] not in EDGE_CHARS
+                  and not JOINER_CHARS.intersection(g)
+                  and not any(g != w and w in g for w in QUESTION_WORDS)}
+    # 总是作为更长候选词的一部分出现的片段不单独成词
+    dominated = set()
+    for word, k in candidates.items():
+        if len(word) > MIN_WORD:
+            for part in (word[1:], word[:-1]):
+                if candidates.get(part) == k:
+                    dominated.add(part)
+    words = set(candidates) - dominated
+    # 停用词本身也是词，切分时整体切出，提取关键词时再去掉
+    words.update(w for w in STOP_WORDS if len(w) >= MIN_WORD and CJK_RE.fullmatch(w))
+    words.update(BUILTIN_WORDS)
+    for term in extra:
+        term = canonical(term)
+        if CJK_RE.fullmatch(term) and len(term) >= MIN_WORD:
+            words.add(term)
+    return sorted(words)
+
+
+class Tokenizer:
+    """按词典做双向最大匹配的分词器"""
+
+    def __init__(self, words):
+        self.words = frozenset(words)
+        self.longest = {}       # 首字 -> 以它开头的最长词长
+        self.longest_end = {}   # 尾字 -> 以它结尾的最长词长
+        for word in self.words:
+            self.longest[word[0]] = max(self.longest.get(word[0], 1), len(word))
+            self.longest_end[word[-1]] = max(self.longest_end.get(word[-1], 1), len(word))
+
+    def __len__(self):
+        return len(self.words)
+
+    def _forward(self, run):
+        words, longest = self.words, self.longest
+        tokens = []
+        i, n = 0, len(run)
+        while i < n:
+            size = 1
+            for length in range(min(longest.get(run[i], 1), n - i), 1, -1):
+                if run[i:i + length] in words:
+                    size = length
+                    break
+            tokens.append(run[i:i + size])
+            i += size
+        return tokens
+
+    def _backward(self, run):
+        words, longest = self.words, self.longest_end
+        tokens = []
+        j = len(run)
+        while j > 0:
+            size = 1
+            for length in range(min(longest.get(run[j - 1], 1), j), 1, -1):
+                if run[j - length:j] in words:
+                    size = length
+                    break
+            tokens.append(run[j - size:j])
+            j -= size
+        tokens.reverse()
+        return tokens
+
+    def cut(self, run):
+        """切分一段汉字"""
+        if len(run) < 2:
+            return [run]
+        forward = self._forward(run)
+        backward = self._backward(run)
+        if forward == backward:
+            return forward
+        key = lambda tokens: (len(tokens), sum(len(t) == 1 for t in tokens))
+        return forward if key(forward) < key(backward) else backward
+
+    def merge_unknown(self, tokens):
+        """词典外的词被切成单字：连续的单字去掉两端的虚字后，剩下两个以上的合成一个词
+        （"块 / 级" -> "块级"，"两 / 个 / 对 / 象" -> "两个对象"），连接词处断开"""
+        merged = []
+        pending = []
+        for token in tokens + ['']:
+            if len(token) == 1 and token not in JOINER_CHARS and CJK_RE.match(token):
+                pending.append(token)
+                continue
+            start, end = 0, len(pending)
+            while start < end and pending[start] in EDGE_CHARS:
+                start += 1
+            while end > start and pending[end - 1] in EDGE_CHARS:
+                end -= 1
+            if end - start > 1:
+                merged.extend(pending[:start])
+                merged.append(''.join(pending[start:end]))
+                merged.extend(pending[end:])
+            else:
+                merged.extend(pending)
+            pending = []
+            if token:
+                merged.append(token)
+        return merged
+
+    def tokenize(self, text):
+        """规整后切分：英文数字串、运算符整体一个词，汉字串按词典切分，其余字符丢弃"""
+        tokens = []
+        for match in TOKEN_RE.finditer(canonical(text)):
+            latin, operator, run = match.groups()
+            if latin or operator:
+                tokens.append(latin or operator)
+            else:
+                tokens.extend(self.merge_unknown(self.cut(run)))
+        return tokens
+
+    def keywords(self, text):
+        """用于关键词检查的词：去掉停用词和单个字符，词典外合成的词同样保留"""
+        result = []
+        for token in self.tokenize(text):
+            if token in STOP_WORDS or len(token) < 2:
+                continue
+            if token not in result:
+                result.append(token)
+        return result
+
+
+def _signature(titles):
+    # 统计参数和同义词表变化时词典也要重新统计
+    params = [DICTIONARY_VERSION, MIN_WORD, MAX_WORD, MIN_COUNT, sorted(BUILTIN_WORDS),
+              sorted(EDGE_CHARS), sorted(JOINER_CHARS), sorted(STOP_WORDS)]
+    h = hashlib.sha1(f'{params}:{default_synonyms().signature}'.encode('utf-8'))
+    for title in titles:
+        h.update(b'\0' + title.encode('utf-8'))
+    return h.hexdigest()
+
+
+def _cache_path(directory):
+    return os.path.join(directory, CACHE_DIR, 'tokenizer.pickle')
+
+
+def load_tokenizer(corpus=None, directory='.', use_cache=True):
+    """由语料中的标题得到分词器：标题没有变化时读取缓存的词典，否则重新统计并保存"""
+    if corpus is None:
+        corpus = load_corpus(directory)
+    titles = [section.title for md_file in corpus.values() for section in md_file.headings]
+    signature = _signature(titles)
+    path = _cache_path(directory)
+    if use_cache:
+        try:
+            with open(path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('signature') == signature:
+                return Tokenizer(cached['words'])
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            pass
+
+    synonyms = default_synonyms()
+    words = build_dictionary(titles, set(synonyms.canonical) | set(synonyms.canonical.values()))
+    if use_cache:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'signature': signature, 'words': words}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+    return Tokenizer(words)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='按题库标题统计的词典分词')
+    parser.add_argument('texts', nargs='*', help='要切分的文本（不带时统计整个题库的分词耗时）')
+    parser.add_argument('--directory', default='.', help='语料目录')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    corpus = load_corpus(args.directory)
+    tokenizer = load_tokenizer(corpus, args.directory)
+    print(f"📖 词典 {len(tokenizer)} 个词，加载耗时 {(time.perf_counter() - started) * 1000:.0f} ms")
+    if args.texts:
+        for text in args.texts:
+            print(f"  {text}")
+            print(f"    分词: {' / '.join(tokenizer.tokenize(text))}")
+            print(f"    关键词: {' / '.join(tokenizer.keywords(text))}")
+    else:
+        started = time.perf_counter()
+        count = len(tokenizer.tokenize(corpus.text))
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"✂️  {len(corpus)} 个文件, {len(corpus.text)} 字符 -> {count} 个词，耗时 {elapsed:.0f} ms")
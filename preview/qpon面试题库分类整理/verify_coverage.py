@@ -1,84 +1,56 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import os
-import re
+import argparse
+
+from classification import load_categories
+from corpus import load_corpus
+from matcher import match_corpus
+from profiling import PROFILER, add_profile_argument, count_matcher_hits
+from records import add_format_arguments, hit_record, write_records
+from suffix_array import load_suffix_array, match_questions as sa_match_questions
+from synonyms import canonical
 
 # 读取分类整理文档
 def read_classification_doc():
-    categories = {}
-    current_category = None
-
-    with open('分类整理文档', 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        # 提取行号和内容
-        match = re.match(r'^\d+→(.+)', line)
-        if match:
-            content = match.group(1)
-
-            # 判断是否是分类标题（没有问号，内容较短，可能包含括号说明）
-            is_category = (
-                '?' not in content and
-                '？' not in content and
-                (len(content) < 30 or '(' in content or '（' in content)
-            )
+    return load_categories()
 
-            if is_category:
-                current_category = content.split('(')[0].split('（')[0].strip()
-                categories[current_category] = []
-            elif current_category:
-                categories[current_category].append(content)
+# 生成问题的候选匹配关键串（规整后的文本）：[(匹配方式, 关键串), ...]
+def labelled_keys(question):
+    # 规整问题文本（全角问号已折叠为半角），移除问号
+    q = canonical(question)
+    clean_q = q.replace('?', '').strip()
 
-    return categories
+    # 检查完整匹配
+    keys = [('去问号', clean_q), ('原文', q)]
 
-# 读取所有MD文件内容
-def read_md_files():
-    md_files = {}
-    files = [f for f in os.listdir('.') if f.endswith('.md') and f not in ['README.md', '图片问题完整清单.md', '质量检查报告.md']]
+    # 检查关键词匹配（如果问题较长）
+    if len(clean_q) > 15:
+        keys.append(('前15字', clean_q[:15]))
 
-    for filename in files:
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-            md_files[filename] = content
+    return keys
 
-    return md_files
+def question_keys(question):
+    return [key for _, key in labelled_keys(question)]
 
 # 检查问题是否在MD文件中
 def check_question_coverage(question, md_content):
-    # 清理问题文本，移除特殊字符
-    clean_q = question.replace('?', '').replace('？', '').strip()
-
-    # 检查完整匹配
-    if clean_q in md_content or question in md_content:
-        return True
-
-    # 检查关键词匹配（如果问题较长）
-    if len(clean_q) > 15:
-        keywords = clean_q[:15]
-        if keywords in md_content:
-            return True
-
-    return False
+    md_content = canonical(md_content)
+    return any(key in md_content for key in question_keys(question))
 
 # 主函数
-def main():
+def main(suffix_array=False):
     print("=" * 80)
     print("📋 QPON面试题库分类覆盖情况检查")
     print("=" * 80)
     print()
 
     # 读取分类文档
-    categories = read_classification_doc()
+    with PROFILER.phase('parse_categories'):
+        categories = read_classification_doc()
 
     # 读取所有MD文件
-    md_files = read_md_files()
-    all_md_content = '\n'.join(md_files.values())
+    md_files = load_corpus()
 
     # 统计数据
     total_questions = sum(len(questions) for questions in categories.values())
@@ -89,64 +61,105 @@ def main():
     print("📊 分类统计:")
     print("-" * 80)
 
-    for category, questions in categories.items():
-        if not questions:
-            continue
+    # 所有问题的关键串一次性编译，只扫描一遍语料
+    with PROFILER.phase('match'):
+        all_questions = [q for questions in categories.values() for q in questions]
+        if suffix_array:
+            # 后缀数组模式：每个关键串两次二分查找，不扫描全文
+            results = sa_match_questions(all_questions, load_suffix_array(md_files), question_keys)
+        else:
+            results = match_corpus(all_questions, md_files, question_keys)
+    hits = dict(zip(all_questions, results))
+    count_matcher_hits(all_questions, results, labelled_keys)
 
-        category_covered = 0
-        category_uncovered = []
+    with PROFILER.phase('report_render'):
+        for category, questions in categories.items():
+            if not questions:
+                continue
 
-        for question in questions:
-            if check_question_coverage(question, all_md_content):
-                category_covered += 1
-                covered_count += 1
-            else:
-                category_uncovered.append(question)
+            with PROFILER.timed('category_ms', category):
+                category_covered = 0
+                category_uncovered = []
 
-        total = len(questions)
-        coverage_rate = (category_covered / total * 100) if total > 0 else 0
+                for question in questions:
+                    if hits[question]:
+                        category_covered += 1
+                        covered_count += 1
+                    else:
+                        category_uncovered.append(question)
 
-        status = "✅" if coverage_rate == 100 else "⚠️" if coverage_rate >= 70 else "❌"
+                total = len(questions)
+                coverage_rate = (category_covered / total * 100) if total > 0 else 0
 
-        print(f"{status} {category}")
-        print(f"   问题数: {total} | 已覆盖: {category_covered} | 未覆盖: {len(category_uncovered)} | 覆盖率: {coverage_rate:.1f}%")
+                status = "✅" if coverage_rate == 100 else "⚠️" if coverage_rate >= 70 else "❌"
 
-        if category_uncovered:
-            uncovered_questions[category] = category_uncovered
+                print(f"{status} {category}")
+                print(f"   问题数: {total} | 已覆盖: {category_covered} | 未覆盖: {len(category_uncovered)} | 覆盖率: {coverage_rate:.1f}%")
 
-        print()
+                if category_uncovered:
+                    uncovered_questions[category] = category_uncovered
 
-    # 总体统计
-    print("=" * 80)
-    print("📈 总体覆盖情况:")
-    print("-" * 80)
-    print(f"总分类数: {len(categories)}")
-    print(f"总问题数: {total_questions}")
-    print(f"已覆盖: {covered_count} ({covered_count/total_questions*100:.1f}%)")
-    print(f"未覆盖: {total_questions - covered_count} ({(total_questions-covered_count)/total_questions*100:.1f}%)")
-    print()
+                print()
 
-    # 详细未覆盖问题列表
-    if uncovered_questions:
+        # 总体统计
         print("=" * 80)
-        print("❌ 未覆盖问题详情:")
+        print("📈 总体覆盖情况:")
         print("-" * 80)
-        for category, questions in uncovered_questions.items():
-            print(f"\n【{category}】 - {len(questions)}个问题")
-            for i, question in enumerate(questions, 1):
-                print(f"  {i}. {question}")
+        print(f"总分类数: {len(categories)}")
+        print(f"总问题数: {total_questions}")
+        print(f"已覆盖: {covered_count} ({covered_count/total_questions*100:.1f}%)")
+        print(f"未覆盖: {total_questions - covered_count} ({(total_questions-covered_count)/total_questions*100:.1f}%)")
+        print()
 
-    # 文件对应关系
-    print()
-    print("=" * 80)
-    print("📁 已生成的MD文件:")
-    print("-" * 80)
-    for filename in sorted(md_files.keys()):
-        size = len(md_files[filename])
-        print(f"  ✓ {filename} ({size} 字符)")
+        # 详细未覆盖问题列表
+        if uncovered_questions:
+            print("=" * 80)
+            print("❌ 未覆盖问题详情:")
+            print("-" * 80)
+            for category, questions in uncovered_questions.items():
+                print(f"\n【{category}】 - {len(questions)}个问题")
+                for i, question in enumerate(questions, 1):
+                    print(f"  {i}. {question}")
+
+        # 文件对应关系
+        print()
+        print("=" * 80)
+        print("📁 已生成的MD文件:")
+        print("-" * 80)
+        for filename in sorted(md_files.keys()):
+            size = md_files[filename].stats['chars']
+            print(f"  ✓ {filename} ({size} 字符)")
 
-    print()
-    print("=" * 80)
+        print()
+        print("=" * 80)
+
+# 逐个问题产出检查记录（--format jsonl/csv）
+def iter_records(corpus=None):
+    with PROFILER.phase('parse_categories'):
+        categories = read_classification_doc()
+    md_files = corpus if corpus is not None else load_corpus()
+
+    with PROFILER.phase('match'):
+        all_questions = [q for questions in categories.values() for q in questions]
+        results = iter(match_corpus(all_questions, md_files, question_keys))
+
+    question_id = 0
+    for category, questions in categories.items():
+        for question in questions:
+            question_id += 1
+            yield hit_record('verify_coverage', question_id, category, question, next(results),
+                             labelled_keys(question), md_files)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--suffix-array', action='store_true', help='用持久化的后缀数组查找关键串，代替扫描全文')
+    add_format_arguments(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    if args.profile:
+        PROFILER.enable('verify_coverage')
+    if args.format != 'text':
+        write_records(iter_records(), args.format, args.output)
+    else:
+        main(suffix_array=args.suffix_array)
+    PROFILER.dump(args.profile)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+监听目录下MD文件的变化
+
+Linux 上通过 ctypes 直接使用 inotify（不依赖第三方库），其他平台或 inotify
+不可用时退回到定时轮询文件的大小和 mtime。一次保存往往触发多个事件，
+收到第一个事件后再等一小段时间，把同一批变化合并成一次回调。
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MODIFY
+
+EVENT_HEADER = struct.Struct('iIII')
+
+# 合并同一次保存产生的多个事件
+DEBOUNCE_SECONDS = 0.05
+POLL_INTERVAL = 0.1
+
+
+def _is_markdown(name):
+    return name.endswith('.md')
+
+
+class InotifyWatcher:
+    """基于 inotify 的目录监听"""
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init()
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init failed')
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), 'inotify_add_watch failed')
+
+    def _read_names(self):
+        data = os.read(self.fd, 64 * 1024)
+        names = set()
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if name:
+                names.add(os.fsdecode(name))
+        return names
+
+    def wait(self, timeout=None):
+        """阻塞到有MD文件变化，返回变化的文件名集合；超时返回空集合"""
+        changed = set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait_for = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if changed:
+                wait_for = DEBOUNCE_SECONDS
+            ready, _, _ = select.select([self.fd], [], [], wait_for)
+            if not ready:
+                if changed or deadline is not None:
+                    return changed
+                continue
+            changed |= {name for name in self._read_names() if _is_markdown(name)}
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """定时比较文件大小和 mtime 的目录监听"""
+
+    def __init__(self, directory, interval=POLL_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self):
+        snapshot = {}
+        for name in os.listdir(self.directory):
+            if _is_markdown(name):
+                try:
+                    st = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue
+                snapshot[name] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval)
+            current = self._snapshot()
+            changed = {name for name in current.keys() | self.snapshot.keys()
+                       if current.get(name) != self.snapshot.get(name)}
+            self.snapshot = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+# 优先使用 inotify，失败时退回轮询
+def create_watcher(directory='.', polling=False):
+    if not polling:
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directory)
+
+
+def watch(on_change, directory='.', polling=False):
+    """每次目录中的MD文件有变化时调用 on_change(变化的文件名集合)，Ctrl+C 退出"""
+    watcher = create_watcher(directory, polling)
+    try:
+        while True:
+            changed = watcher.wait()
+            if changed:
+                on_change(changed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()